@@ -0,0 +1,65 @@
+using System.Collections.Generic;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using ClemBot.Api.Common.Utilities;
+using ClemBot.Api.Data.Contexts;
+using ClemBot.Api.Data.Models;
+using FluentValidation;
+using MediatR;
+using NodaTime;
+
+namespace ClemBot.Api.Core.Features.Commands.Bot;
+
+public class AddInvocations
+{
+    public class Validator : AbstractValidator<Command>
+    {
+        public Validator()
+        {
+            RuleFor(p => p.Invocations).NotNull();
+        }
+    }
+
+    public class InvocationDto
+    {
+        public string CommandName { get; set; } = null!;
+
+        public ulong GuildId { get; set; }
+
+        public ulong ChannelId { get; set; }
+
+        public ulong UserId { get; set; }
+
+        public LocalDateTime Time { get; set; }
+    }
+
+    public class Command : IRequest<QueryResult<IEnumerable<int>>>
+    {
+        public List<InvocationDto> Invocations { get; set; } = null!;
+    }
+
+    public record Handler(ClemBotContext _context)
+        : IRequestHandler<Command, QueryResult<IEnumerable<int>>>
+    {
+        public async Task<QueryResult<IEnumerable<int>>> Handle(Command request, CancellationToken cancellationToken)
+        {
+            var invocationEntities = request.Invocations
+                .Select(i => new CommandInvocation
+                {
+                    CommandName = i.CommandName,
+                    Time = i.Time,
+                    GuildId = i.GuildId,
+                    ChannelId = i.ChannelId,
+                    UserId = i.UserId
+                })
+                .ToList();
+
+            _context.CommandInvocations.AddRange(invocationEntities);
+
+            await _context.SaveChangesAsync();
+
+            return QueryResult<IEnumerable<int>>.Success(invocationEntities.Select(i => i.Id));
+        }
+    }
+}
@@ -30,6 +30,15 @@ public class CommandsController : ControllerBase
             _ => throw new InvalidOperationException()
         };
 
+    [HttpPost("bot/[controller]/batch")]
+    [BotMasterAuthorize]
+    public async Task<IActionResult> AddInvocations(AddInvocations.Command command) =>
+        await _mediator.Send(command) switch
+        {
+            { Status: QueryStatus.Success } result => Ok(result.Value),
+            _ => throw new InvalidOperationException()
+        };
+
     [HttpGet("bot/[controller]/status/{GuildId}/{ChannelId}/{CommandName}")]
     [BotMasterAuthorize]
     public async Task<IActionResult> Status([FromRoute] Status.Query query) =>
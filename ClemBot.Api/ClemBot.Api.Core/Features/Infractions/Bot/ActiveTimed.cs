@@ -0,0 +1,77 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using ClemBot.Api.Common.Enums;
+using ClemBot.Api.Common.Utilities;
+using ClemBot.Api.Data.Contexts;
+using MediatR;
+using Microsoft.EntityFrameworkCore;
+using NodaTime;
+
+namespace ClemBot.Api.Core.Features.Infractions.Bot;
+
+public class ActiveTimed
+{
+    public class Query : IRequest<QueryResult<IEnumerable<Model>>>
+    {
+        // Only return infractions that expire before this time if it is set
+        public DateTime? Before { get; set; }
+    }
+
+    public class Model
+    {
+        public int Id { get; set; }
+
+        public ulong GuildId { get; set; }
+
+        public ulong AuthorId { get; set; }
+
+        public ulong SubjectId { get; set; }
+
+        public InfractionType Type { get; set; }
+
+        public string? Reason { get; set; }
+
+        public LocalDateTime? Duration { get; set; }
+
+        public LocalDateTime Time { get; set; }
+
+        public bool? Active { get; set; }
+    }
+
+    public record QueryHandler(ClemBotContext _context)
+        : IRequestHandler<Query, QueryResult<IEnumerable<Model>>>
+    {
+        public async Task<QueryResult<IEnumerable<Model>>> Handle(Query request,
+            CancellationToken cancellationToken)
+        {
+            var query = _context.Infractions
+                .Where(x => x.IsActive == true && x.Duration != null);
+
+            if (request.Before is { } before)
+            {
+                var beforeTime = LocalDateTime.FromDateTime(before);
+                query = query.Where(x => x.Duration < beforeTime);
+            }
+
+            var infractions = await query
+                .Select(y => new Model
+                {
+                    Id = y.Id,
+                    GuildId = y.GuildId,
+                    AuthorId = y.AuthorId,
+                    SubjectId = y.SubjectId,
+                    Reason = y.Reason,
+                    Duration = y.Duration,
+                    Time = y.Time,
+                    Type = y.Type,
+                    Active = y.IsActive
+                })
+                .ToListAsync();
+
+            return QueryResult<IEnumerable<Model>>.Success(infractions);
+        }
+    }
+}
@@ -39,6 +39,15 @@ public class InfractionsController : ControllerBase
             _ => throw new InvalidOperationException()
         };
 
+    [HttpGet("bot/[controller]/active")]
+    [BotMasterAuthorize]
+    public async Task<IActionResult> ActiveTimed([FromQuery] Bot.ActiveTimed.Query query) =>
+        await _mediator.Send(query) switch
+        {
+            { Status: QueryStatus.Success } result => Ok(result.Value),
+            _ => throw new InvalidOperationException()
+        };
+
     [HttpGet("bot/[controller]/{Id}")]
     [BotMasterAuthorize]
     public async Task<IActionResult> Details([FromRoute] Bot.Details.Query command) =>
@@ -16,7 +16,8 @@ public class Index
 
     public class Query : IRequest<QueryResult<List<ReminderDto>>>
     {
-        // empty
+        // Only return reminders due before this time if it is set
+        public DateTime? Before { get; set; }
     }
 
     public class Handler : IRequestHandler<Query, QueryResult<List<ReminderDto>>>
@@ -31,8 +32,16 @@ public class Index
 
         public async Task<QueryResult<List<ReminderDto>>> Handle(Query request, CancellationToken cancellationToken)
         {
-            var reminders = await _context.Reminders
-                .Where(r => !r.Dispatched)
+            var query = _context.Reminders
+                .Where(r => !r.Dispatched);
+
+            if (request.Before is { } before)
+            {
+                var beforeTime = LocalDateTime.FromDateTime(before);
+                query = query.Where(r => r.Time < beforeTime);
+            }
+
+            var reminders = await query
                 .Select(item => new ReminderDto
                 {
                     Id = item.Id,
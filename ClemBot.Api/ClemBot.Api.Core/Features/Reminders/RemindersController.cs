@@ -19,8 +19,8 @@ public class RemindersController : ControllerBase
 
     [HttpGet("bot/[controller]")]
     [BotMasterAuthorize]
-    public async Task<IActionResult> Index() =>
-        await _mediator.Send(new Index.Query()) switch
+    public async Task<IActionResult> Index([FromQuery] Index.Query query) =>
+        await _mediator.Send(query) switch
         {
             { Status: QueryStatus.Success } result => Ok(result.Value),
             _ => throw new InvalidOperationException()
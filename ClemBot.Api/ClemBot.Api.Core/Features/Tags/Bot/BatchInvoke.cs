@@ -0,0 +1,87 @@
+using System.Collections.Generic;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using ClemBot.Api.Common.Utilities;
+using ClemBot.Api.Data.Contexts;
+using ClemBot.Api.Data.Models;
+using FluentValidation;
+using MediatR;
+using Microsoft.EntityFrameworkCore;
+using NodaTime;
+
+namespace ClemBot.Api.Core.Features.Tags.Bot;
+
+public class BatchInvoke
+{
+    public class Validator : AbstractValidator<Command>
+    {
+        public Validator()
+        {
+            RuleFor(p => p.Uses).NotNull();
+        }
+    }
+
+    public class TagUseDto
+    {
+        public string Name { get; set; } = null!;
+
+        public ulong GuildId { get; set; }
+
+        public ulong ChannelId { get; set; }
+
+        public ulong UserId { get; set; }
+
+        public LocalDateTime Time { get; set; }
+    }
+
+    public class Command : IRequest<QueryResult<IEnumerable<Invoke.Model>>>
+    {
+        public List<TagUseDto> Uses { get; set; } = null!;
+    }
+
+    public record Handler(ClemBotContext _context)
+        : IRequestHandler<Command, QueryResult<IEnumerable<Invoke.Model>>>
+    {
+        public async Task<QueryResult<IEnumerable<Invoke.Model>>> Handle(Command request, CancellationToken cancellationToken)
+        {
+            var guildIds = request.Uses.Select(u => u.GuildId).Distinct().ToList();
+            var names = request.Uses.Select(u => u.Name).Distinct().ToList();
+
+            // Over fetch by guild and name separately then match the exact pairs in memory
+            var tags = (await _context.Tags
+                    .Where(t => guildIds.Contains(t.GuildId) && names.Contains(t.Name))
+                    .ToListAsync())
+                .GroupBy(t => (t.GuildId, t.Name))
+                .ToDictionary(g => g.Key, g => g.First());
+
+            var recorded = new List<Invoke.Model>();
+
+            foreach (var use in request.Uses)
+            {
+                // Tags can be deleted between being used and the use being sent, skip those
+                if (!tags.TryGetValue((use.GuildId, use.Name), out var tag))
+                {
+                    continue;
+                }
+
+                tag.TagUses.Add(new TagUse()
+                {
+                    ChannelId = use.ChannelId,
+                    UserId = use.UserId,
+                    Time = use.Time.InUtc().ToDateTimeUtc()
+                });
+
+                recorded.Add(new Invoke.Model()
+                {
+                    GuildId = tag.GuildId,
+                    Name = tag.Name
+                });
+            }
+
+            await _context.SaveChangesAsync();
+
+            return QueryResult<IEnumerable<Invoke.Model>>.Success(recorded);
+        }
+    }
+}
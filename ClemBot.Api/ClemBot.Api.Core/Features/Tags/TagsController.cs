@@ -70,6 +70,15 @@ public class TagsController : ControllerBase
             _ => throw new InvalidOperationException()
         };
 
+    [HttpPost("bot/[controller]/invoke/batch")]
+    [BotMasterAuthorize]
+    public async Task<IActionResult> AddUses(Bot.BatchInvoke.Command command) =>
+        await _mediator.Send(command) switch
+        {
+            { Status: QueryStatus.Success } result => Ok(result.Value),
+            _ => throw new InvalidOperationException()
+        };
+
     [HttpPost("[controller]/AddCustomTagPrefix")]
     [GuildSandboxAuthorize(BotAuthClaims.custom_tag_prefix_set)]
     public async Task<IActionResult> AddCustomTagPrefix(SetCustomTagPrefix.Command command) =>
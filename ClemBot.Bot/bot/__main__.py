@@ -44,7 +44,7 @@ async def main() -> None:
     messenger = Messenger(name="primary_bot_messenger")
 
     # create the custom prefix handler class
-    custom_prefix = CustomPrefix(default=prefix)
+    custom_prefix = CustomPrefix(default=prefix, messenger=messenger)
 
     # enable privileged member gateway intents
     intents = discord.Intents.default()  # pylint: disable=assigning-non-slot
@@ -1,5 +1,8 @@
 import asyncio
+import dataclasses
 import json
+import logging
+import random
 import typing as t
 from http import HTTPStatus
 from urllib.parse import quote
@@ -7,13 +10,41 @@ from urllib.parse import quote
 import aiohttp
 
 import bot.bot_secrets as bot_secrets
+from bot.api.json_codec import JsonCodec, get_default_codec
 from bot.consts import Urls
-from bot.errors import ApiClientRequestError, BotOnlyRequestError
+from bot.errors import ApiCircuitOpenError, ApiClientRequestError, BotOnlyRequestError
+from bot.utils.circuit_breaker import CircuitBreaker
 from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
 
+# Reconnect attempts back off exponentially from RECONNECT_TIMEOUT up to RECONNECT_MAX_TIMEOUT seconds
 RECONNECT_TIMEOUT = 10
+RECONNECT_MAX_TIMEOUT = 120
+
+# Retry defaults for idempotent requests that fail from a transient error
+API_RETRY_ATTEMPTS = 3
+API_RETRY_BASE_DELAY = 0.25
+API_RETRY_MAX_DELAY = 2
+
+# Connection pool defaults, every route shares a single pool of connections to ClemBot.Api
+API_POOL_SIZE = 100
+API_KEEPALIVE_TIMEOUT = 30
+API_DNS_CACHE_TTL = 300
+API_MAX_CONCURRENT_REQUESTS = 50
+
+# Request timeout defaults in seconds, these stop a hung request from blocking its caller forever.
+# The total isn't bounded by default so long bulk uploads aren't cut off while they are
+# still making progress, the connect and read timeouts still catch a hung connection
+API_REQUEST_TIMEOUT: float | None = None
+API_CONNECT_TIMEOUT = 5
+API_READ_TIMEOUT = 20
+
+# Request payload logging defaults, the bulk endpoints send megabytes per request
+# so payloads are only formatted when their log level is enabled and the request is sampled
+API_PAYLOAD_LOG_LEVEL = logging.DEBUG
+API_PAYLOAD_LOG_MAX_CHARS = 2000
+API_PAYLOAD_LOG_SAMPLE_RATE = 1.0
 
 connect_lock = asyncio.Lock()
 
@@ -27,6 +58,68 @@ class Result:
         return f"Result Status: {self.status}\nValue:\n{json.dumps(self.value, indent=2)}"
 
 
+@dataclasses.dataclass
+class ConnectionPoolSettings:
+    """Tuning knobs for the ApiClients connection pool and request timeouts"""
+
+    # The max number of open connections to ClemBot.Api, 0 means unlimited
+    pool_size: int = API_POOL_SIZE
+
+    # How long in seconds an idle connection is kept open to be reused
+    keepalive_timeout: float = API_KEEPALIVE_TIMEOUT
+
+    # How long in seconds resolved DNS entries are reused, None caches them forever
+    dns_cache_ttl: int | None = API_DNS_CACHE_TTL
+
+    # The max number of requests that can be in flight at once,
+    # requests past this wait for a slot instead of queueing for a connection
+    max_concurrent_requests: int = API_MAX_CONCURRENT_REQUESTS
+
+    total_timeout: float | None = API_REQUEST_TIMEOUT
+    connect_timeout: float | None = API_CONNECT_TIMEOUT
+    read_timeout: float | None = API_READ_TIMEOUT
+
+
+@dataclasses.dataclass
+class RetrySettings:
+    """Controls how idempotent requests are retried after a transient failure"""
+
+    # The total number of times a request is attempted, 1 disables retries
+    max_attempts: int = API_RETRY_ATTEMPTS
+
+    # Retry delays grow exponentially from base_delay up to max_delay seconds
+    base_delay: float = API_RETRY_BASE_DELAY
+    max_delay: float = API_RETRY_MAX_DELAY
+
+
+@dataclasses.dataclass
+class RequestLogSettings:
+    """Controls how much of each requests payload the ApiClient logs"""
+
+    # The level request bodies and response data are logged at
+    payload_level: int = API_PAYLOAD_LOG_LEVEL
+
+    # Logged payloads longer than this are truncated
+    max_payload_chars: int = API_PAYLOAD_LOG_MAX_CHARS
+
+    # The fraction of requests between 0 and 1 that have their payloads logged
+    sample_rate: float = API_PAYLOAD_LOG_SAMPLE_RATE
+
+
+@dataclasses.dataclass
+class PoolStats:
+    """Point in time utilization of the ApiClients connection pool"""
+
+    pool_size: int
+    max_concurrent_requests: int
+    in_flight: int
+    peak_in_flight: int
+    waiting: int
+    total_requests: int
+    timed_out_requests: int
+    deduplicated_requests: int
+
+
 class HttpRequestType:
     get = "GET"
     put = "PUT"
@@ -35,6 +128,27 @@ class HttpRequestType:
     patch = "PATCH"
 
 
+# Requests that are safe to send again if we don't know whether the first attempt was applied
+IDEMPOTENT_REQUESTS = {HttpRequestType.get, HttpRequestType.put, HttpRequestType.delete}
+
+# Statuses that mean the api is unavailable rather than that the request was bad, only these
+# and connection failures are retried and count toward opening the circuit
+UNAVAILABLE_STATUSES = {
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """
+    Gets the delay before a retry, the delay doubles every attempt up to cap and is randomized
+    so callers that failed at the same time don't retry at the same time
+    """
+    delay = min(cap, base * 2**attempt)
+    return random.uniform(delay / 2, delay)
+
+
 T_STATE_CHANGE_CB = t.Optional[t.Callable[[], t.Coroutine[t.Any, t.Any, None]]]
 
 
@@ -45,6 +159,11 @@ class ApiClient:
         connect_callback: T_STATE_CHANGE_CB = None,
         disconnect_callback: T_STATE_CHANGE_CB = None,
         bot_only: bool = False,
+        pool_settings: ConnectionPoolSettings | None = None,
+        log_settings: RequestLogSettings | None = None,
+        retry_settings: RetrySettings | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        json_codec: JsonCodec | None = None,
     ):
         self.auth_token: str | None = None
         self.session: aiohttp.ClientSession | None = None
@@ -55,6 +174,25 @@ class ApiClient:
 
         self.bot_only = bot_only
 
+        self.pool_settings = pool_settings or ConnectionPoolSettings()
+        self.log_settings = log_settings or RequestLogSettings()
+        self.retry_settings = retry_settings or RetrySettings()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(name="clembot_api")
+        self.json_codec = json_codec or get_default_codec()
+        self._request_semaphore = asyncio.Semaphore(self.pool_settings.max_concurrent_requests)
+
+        # Pool utilization counters reported through pool_stats
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waiting = 0
+        self._total_requests = 0
+        self._timed_out_requests = 0
+        self._deduplicated_requests = 0
+
+        # GET requests currently in flight keyed by everything that identifies the request,
+        # identical GETs made while one is in flight wait on it instead of sending another
+        self._in_flight_gets = dict[tuple[str, ...], asyncio.Future[t.Any]]()
+
         # Create an empty async method so our callback doesnt throw when we await it
         async def async_stub() -> None:
             pass
@@ -68,9 +206,40 @@ class ApiClient:
     @staticmethod
     def _build_url(url: str) -> str:
         url = f"{bot_secrets.secrets.api_url}{Urls.base_api_url}{quote(url)}"
-        log.info("Building URL: {url}", url=url)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Building URL: {url}", url=url)
         return url
 
+    def pool_stats(self) -> PoolStats:
+        """Gets the current utilization of the connection pool along with lifetime counters"""
+        return PoolStats(
+            pool_size=self.pool_settings.pool_size,
+            max_concurrent_requests=self.pool_settings.max_concurrent_requests,
+            in_flight=self._in_flight,
+            peak_in_flight=self._peak_in_flight,
+            waiting=self._waiting,
+            total_requests=self._total_requests,
+            timed_out_requests=self._timed_out_requests,
+            deduplicated_requests=self._deduplicated_requests,
+        )
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        settings = self.pool_settings
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.pool_size,
+            keepalive_timeout=settings.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.total_timeout,
+            sock_connect=settings.connect_timeout,
+            sock_read=settings.read_timeout,
+        )
+
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, raise_for_status=False)
+
     async def close(self) -> None:
         """Close the aiohttp session."""
         assert self.session is not None
@@ -106,23 +275,28 @@ class ApiClient:
         # Check if we have an active session, this means we are trying to reconnect
         # if we are, do nothing
         if not self.session:
-            self.session = aiohttp.ClientSession(raise_for_status=False)
+            self.session = self._create_session()
 
-        # Loop infinitely checking the api every RECONNECT_TIMEOUT seconds
+        # Loop infinitely checking the api with an exponential backoff
         # Once auth succeeds then we allow other requests
+        attempt = 0
         while not self.connected:
             self.connected = await self._authorize()
 
             if self.connected:
                 log.info("Connecting to ClemBot.Api succeeded")
+                self.circuit_breaker.record_success()
                 await self.connect_callback()
                 break
 
+            delay = jittered_backoff(attempt, RECONNECT_TIMEOUT, RECONNECT_MAX_TIMEOUT)
+            attempt += 1
+
             log.error(
                 "Connecting to ClemBot.Api failed, retrying in {reconnect_timeout} seconds",
-                reconnect_timeout=RECONNECT_TIMEOUT,
+                reconnect_timeout=round(delay, 1),
             )
-            await asyncio.sleep(RECONNECT_TIMEOUT)
+            await asyncio.sleep(delay)
 
     async def _disconnected(self) -> None:
         log.warning("ClemBot.Api disconnected")
@@ -178,6 +352,7 @@ class ApiClient:
         raise_on_error: bool,
         params: t.Any = None,
         body: t.Any = None,
+        timeout: aiohttp.ClientTimeout | None = None,
     ) -> Result:
 
         log.info(
@@ -195,21 +370,61 @@ class ApiClient:
             "params": params,
         }
 
-        if body:
-            req_args["json"] = body
+        # Encode the body ourselves so every request goes through the configured codec,
+        # the Content-type header is already set to json. Async iterables of already encoded
+        # bytes are sent as they are produced with chunked transfer encoding
+        if isinstance(body, t.AsyncIterable):
+            req_args["data"] = body
+        elif body:
+            req_args["data"] = self.json_codec.dumps(body)
+
+        # Only override the sessions timeout when asked, E.G for long running bulk requests
+        if timeout is not None:
+            req_args["timeout"] = timeout
+
+        assert self.session is not None
+
+        # Wait for a free request slot, this bounds how many requests
+        # can be competing for a pooled connection at once
+        self._waiting += 1
+        try:
+            await self._request_semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        self._total_requests += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        try:
+            return await self._send_request(http_type, endpoint, body, req_args)
+        except asyncio.TimeoutError:
+            self._timed_out_requests += 1
+            log.error(
+                '{type} Request at endpoint "{endpoint}" timed out',
+                type=http_type,
+                endpoint=endpoint,
+            )
+            raise
+        finally:
+            self._in_flight -= 1
+            self._request_semaphore.release()
 
+    async def _send_request(
+        self, http_type: str, endpoint: str, body: t.Any, req_args: dict[str, t.Any]
+    ) -> Result:
         assert self.session is not None
 
         async with self.session.request(**req_args) as resp:
             if resp.status == HTTPStatus.OK:
-                data = await resp.json()
+                raw = await resp.read()
+                data = self.json_codec.loads(raw) if raw.strip() else None
                 log.info(
-                    '{type} Request at endpoint "{endpoint}" with request data:{body}  Succeeded with response data:{data}',
+                    '{type} Request at endpoint "{endpoint}" Succeeded',
                     type=http_type,
                     endpoint=endpoint,
-                    body=body,
-                    data=data,
                 )
+                self._log_payloads(http_type, endpoint, body, data)
 
                 return Result(resp.status, data)
 
@@ -228,11 +443,46 @@ class ApiClient:
 
             return Result(resp.status, None)
 
+    def _log_payloads(self, http_type: str, endpoint: str, body: t.Any, data: t.Any) -> None:
+        settings = self.log_settings
+
+        # Bail before doing any formatting work for payloads that will never be shipped
+        if not log.isEnabledFor(settings.payload_level):
+            return
+
+        if settings.sample_rate < 1 and random.random() >= settings.sample_rate:
+            return
+
+        log.log(
+            settings.payload_level,
+            '{type} Request at endpoint "{endpoint}" with request data:{body}  Succeeded with response data:{data}',
+            type=http_type,
+            endpoint=endpoint,
+            body=self._truncate_payload(body),
+            data=self._truncate_payload(data),
+        )
+
+    def _truncate_payload(self, payload: t.Any) -> t.Any:
+        if payload is None:
+            return None
+
+        if isinstance(payload, t.AsyncIterable):
+            return "<streamed body>"
+
+        text = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+        max_chars = self.log_settings.max_payload_chars
+
+        if len(text) <= max_chars:
+            return text
+
+        return f"{text[:max_chars]}... ({len(text) - max_chars} more characters)"
+
     async def _request_or_reconnect(self, http_type: str, endpoint: str, **kwargs: t.Any) -> t.Any:
 
         raise_on_error = kwargs.get("raise_on_error", False)
         body = kwargs.get("data", None)
         params = kwargs.get("params", None)
+        timeout = kwargs.get("timeout", None)
 
         # If we are in bot_only mode stop the request and report that
         if self.bot_only:
@@ -242,35 +492,104 @@ class ApiClient:
         if not self.connected:
             raise ApiClientRequestError("ClemBot.Api not connected")
 
-        try:
-            resp = await self._request(
-                http_type, endpoint, raise_on_error=raise_on_error, body=body, params=params
-            )
+        # Only retry requests that are safe to apply twice,
+        # a streamed body is consumed by the first attempt so it can't be resent
+        attempts = (
+            self.retry_settings.max_attempts
+            if http_type in IDEMPOTENT_REQUESTS and not isinstance(body, t.AsyncIterable)
+            else 1
+        )
+
+        for attempt in range(1, attempts + 1):
+            # Fail fast while the api is down instead of piling more requests onto it
+            if not self.circuit_breaker.allow_request():
+                raise ApiCircuitOpenError("ClemBot.Api is failing, request not sent")
+
+            retry = attempt < attempts
+
+            try:
+                resp = await self._request(
+                    http_type,
+                    endpoint,
+                    raise_on_error=raise_on_error,
+                    body=body,
+                    params=params,
+                    timeout=timeout,
+                )
 
-        # The request errored out and had raise_for_status enabled
-        except aiohttp.ClientResponseError as e:
-            # Check if the error was an HTTP 401 Unauthorized or HTTP 403 Forbidden,
-            # this means we need to try and reconnect to the api
-            # before we raise the error further
-            if e.status == HTTPStatus.UNAUTHORIZED or e.status == HTTPStatus.FORBIDDEN:
+            # The request errored out and had raise_for_status enabled
+            except aiohttp.ClientResponseError as e:
+                if e.status in UNAVAILABLE_STATUSES:
+                    if retry:
+                        await self._retry_backoff(http_type, endpoint, attempt, e)
+                        continue
+                    # Failures are only counted once all attempts are used so a single
+                    # request can't open the circuit by itself
+                    self.circuit_breaker.record_failure()
+                    raise e
+
+                # The api responded so it is up, the request itself was bad
+                self.circuit_breaker.record_success()
+
+                # Check if the error was an HTTP 401 Unauthorized or HTTP 403 Forbidden,
+                # this means we need to try and reconnect to the api
+                # before we raise the error further
+                if e.status == HTTPStatus.UNAUTHORIZED or e.status == HTTPStatus.FORBIDDEN:
+                    asyncio.create_task(self._disconnected())
+                # Rethrow the error so it can be reported by the handlers
+                raise e
+
+            # The request failed because the Api didn't respond
+            # put the client in reconnect mode and raise an error
+            except aiohttp.ClientConnectorError as e:
+                if retry:
+                    await self._retry_backoff(http_type, endpoint, attempt, e)
+                    continue
+                self.circuit_breaker.record_failure()
+                asyncio.create_task(self._disconnected())
+                raise ConnectionError("Request to ClemBot.Api failed")
+
+            # The request hung past its timeout, the api is still reachable so don't reconnect
+            except asyncio.TimeoutError as e:
+                if retry:
+                    await self._retry_backoff(http_type, endpoint, attempt, e)
+                    continue
+                self.circuit_breaker.record_failure()
+                raise ConnectionError("Request to ClemBot.Api timed out")
+
+            # An unavailable status with raise_for_status set to False, handle it like a raised one
+            if resp.status in UNAVAILABLE_STATUSES:
+                if retry:
+                    await self._retry_backoff(http_type, endpoint, attempt, resp.status)
+                    continue
+                self.circuit_breaker.record_failure()
+                return resp.value
+
+            self.circuit_breaker.record_success()
+
+            # Check if the response returned an HTTP 401 Unauthorized or 403 Forbidden
+            # with raise_for_status set to False We still need to handle that case
+            # and put the client in reconnect mode
+            if resp.status == HTTPStatus.UNAUTHORIZED or resp.status == HTTPStatus.FORBIDDEN:
                 asyncio.create_task(self._disconnected())
-            # Rethrow the error so it can be reported by the handlers
-            raise e
+                raise ConnectionError("Request to ClemBot.Api failed")
 
-        # The request failed because the Api didn't respond
-        # put the client in reconnect mode and raise an error
-        except aiohttp.ClientConnectorError:
-            asyncio.create_task(self._disconnected())
-            raise ConnectionError("Request to ClemBot.Api failed")
+            return resp.value
 
-        # Check if the response returned an HTTP 401 Unauthorized or 403 Forbidden
-        # with raise_for_status set to False We still need to handle that case
-        # and put the client in reconnect mode
-        if resp.status == HTTPStatus.UNAUTHORIZED or resp.status == HTTPStatus.FORBIDDEN:
-            asyncio.create_task(self._disconnected())
-            raise ConnectionError("Request to ClemBot.Api failed")
+    async def _retry_backoff(
+        self, http_type: str, endpoint: str, attempt: int, error: t.Any
+    ) -> None:
+        settings = self.retry_settings
+        delay = jittered_backoff(attempt - 1, settings.base_delay, settings.max_delay)
 
-        return resp.value
+        log.warning(
+            '{type} Request at endpoint "{endpoint}" failed with {error}, retrying in {delay} seconds',
+            type=http_type,
+            endpoint=endpoint,
+            error=str(error),
+            delay=round(delay, 2),
+        )
+        await asyncio.sleep(delay)
 
     async def get(self, endpoint: str, **kwargs: t.Any) -> t.Any:
         """
@@ -281,9 +600,38 @@ class ApiClient:
             data: (Optional) The json request body
             raise_on_error: (Optional) (Defaults to False) Flag to tell the client to raise an exception
             for status codes above 400
+            timeout: (Optional) An aiohttp.ClientTimeout that replaces the pools timeouts for this request
         @return:
+
+        Identical concurrent GETs share a single request and all receive the same response value,
+        callers must treat the returned value as read only
         """
-        return await self._request_or_reconnect(HttpRequestType.get, endpoint, **kwargs)
+        key = (
+            endpoint,
+            str(kwargs.get("raise_on_error", False)),
+            json.dumps(kwargs.get("params"), sort_keys=True, default=str),
+            json.dumps(kwargs.get("data"), sort_keys=True, default=str),
+        )
+
+        if (in_flight := self._in_flight_gets.get(key)) is not None:
+            self._deduplicated_requests += 1
+            log.info("Joining in flight GET request to endpoint: {endpoint}", endpoint=endpoint)
+        else:
+            in_flight = asyncio.ensure_future(
+                self._request_or_reconnect(HttpRequestType.get, endpoint, **kwargs)
+            )
+            self._in_flight_gets[key] = in_flight
+            in_flight.add_done_callback(lambda f: self._end_flight(key, f))
+
+        # Shield the shared request so one caller being cancelled doesn't cancel it for the others
+        return await asyncio.shield(in_flight)
+
+    def _end_flight(self, key: tuple[str, ...], future: asyncio.Future[t.Any]) -> None:
+        self._in_flight_gets.pop(key, None)
+
+        # Mark the exception as retrieved in case every caller was cancelled before it finished
+        if not future.cancelled():
+            future.exception()
 
     async def post(self, endpoint: str, **kwargs: t.Any) -> t.Any:
         """
@@ -294,6 +642,7 @@ class ApiClient:
             data: (Optional) The json request body
             raise_on_error: (Optional) (Defaults to False) Flag to tell the client to raise an exception
             for status codes above 400
+            timeout: (Optional) An aiohttp.ClientTimeout that replaces the pools timeouts for this request
         @return:
         """
         return await self._request_or_reconnect(HttpRequestType.post, endpoint, **kwargs)
@@ -304,9 +653,10 @@ class ApiClient:
 
         @param endpoint: The route to make a request too
         @param kwargs:
-            data: (Optional) The json request body
+            data: (Optional) The json request body, or an async iterable of encoded json to stream
             raise_on_error: (Optional) (Defaults to False) Flag to tell the client to raise an exception
             for status codes above 400
+            timeout: (Optional) An aiohttp.ClientTimeout that replaces the pools timeouts for this request
         @return:
         """
         return await self._request_or_reconnect(HttpRequestType.patch, endpoint, **kwargs)
@@ -320,6 +670,7 @@ class ApiClient:
             data: (Optional) The json request body
             raise_on_error: (Optional) (Defaults to False) Flag to tell the client to raise an exception
             for status codes above 400
+            timeout: (Optional) An aiohttp.ClientTimeout that replaces the pools timeouts for this request
         @return:
         """
         return await self._request_or_reconnect(HttpRequestType.put, endpoint, **kwargs)
@@ -333,6 +684,7 @@ class ApiClient:
             data: (Optional) The json request body
             raise_on_error: (Optional) (Defaults to False) Flag to tell the client to raise an exception
             for status codes above 400
+            timeout: (Optional) An aiohttp.ClientTimeout that replaces the pools timeouts for this request
         @return:
         """
         return await self._request_or_reconnect(HttpRequestType.delete, endpoint, **kwargs)
@@ -1,8 +1,142 @@
 import abc
+import functools
+import inspect
+import typing as t
 
 from bot.api.api_client import ApiClient
+from bot.errors import ApiClientRequestError
+from bot.utils.cache import TtlCache
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+# The default max number of responses a single cached route method holds
+ROUTE_CACHE_MAX_SIZE = 1024
+
+F = t.TypeVar("F", bound=t.Callable[..., t.Coroutine[t.Any, t.Any, t.Any]])
 
 
 class BaseRoute(abc.ABC):
     def __init__(self, client: ApiClient):
         self._client: ApiClient = client
+
+        # Response caches of the routes methods decorated with @cached, keyed by method name
+        self._response_caches = dict[str, TtlCache[t.Any, t.Any]]()
+
+    def invalidate_cache_tags(self, *tags: str) -> None:
+        """Drops every cached response of this route that was stored under any of the given tags"""
+        for cache in self._response_caches.values():
+            cache.invalidate_where(lambda k: any(tag in k[0] for tag in tags))
+
+    def clear_response_caches(self) -> None:
+        """Drops every cached response of this route"""
+        for cache in self._response_caches.values():
+            cache.clear()
+
+    def _get_response_cache(self, name: str, ttl: float, max_size: int) -> TtlCache[t.Any, t.Any]:
+        if (cache := self._response_caches.get(name)) is None:
+            cache = TtlCache[t.Any, t.Any](ttl=ttl, max_size=max_size, keep_expired=True, name=name)
+            self._response_caches[name] = cache
+
+        return cache
+
+
+def _bind_arguments(
+    signature: inspect.Signature, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]
+) -> dict[str, t.Any]:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    # Drop self and the request options in **kwargs (E.G raise_on_error),
+    # they don't change what the api responds with
+    return {
+        name: value
+        for i, (name, value) in enumerate(bound.arguments.items())
+        if i > 0 and signature.parameters[name].kind is not inspect.Parameter.VAR_KEYWORD
+    }
+
+
+def cached(
+    *,
+    ttl: float,
+    max_size: int = ROUTE_CACHE_MAX_SIZE,
+    key: str | None = None,
+    tags: t.Sequence[str] = (),
+) -> t.Callable[[F], F]:
+    """
+    Caches the responses of a BaseRoute method in memory
+
+    Failed requests returning None are never cached. If the api can't be reached the last
+    cached response is served even if it has expired, stale data beats failing every caller.
+    Keys and tags are format strings filled in with the methods arguments by name,
+    E.G "tags:{guild_id}" or "{user.guild.id}"
+
+    Args:
+        ttl (float): How long in seconds a response is served from the cache
+        max_size (int): The max number of responses held, the least recently used are evicted first
+        key (str | None): Format string for the cache key, defaults to every argument of the method
+        tags (t.Sequence[str]): Format strings for the tags the response is stored under,
+            any write method can drop them with @invalidates or invalidate_cache_tags
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self: BaseRoute, *args: t.Any, **kwargs: t.Any) -> t.Any:
+            arguments = _bind_arguments(signature, (self, *args), kwargs)
+            entry_key = (
+                tuple(tag.format(**arguments) for tag in tags),
+                key.format(**arguments) if key else tuple(arguments.values()),
+            )
+
+            cache = self._get_response_cache(func.__qualname__, ttl, max_size)
+            if (value := cache.get(entry_key)) is not None:
+                return value
+
+            try:
+                value = await func(self, *args, **kwargs)
+            except (ApiClientRequestError, ConnectionError) as e:
+                if (stale := cache.get_stale(entry_key)) is None:
+                    raise
+
+                log.warning(
+                    "Serving stale response from {cache} after request failed with: {error}",
+                    cache=cache.name,
+                    error=str(e),
+                )
+                return stale
+
+            if value is not None:
+                cache.set(entry_key, value)
+
+            return value
+
+        return t.cast(F, wrapper)
+
+    return decorator
+
+
+def invalidates(*tags: str) -> t.Callable[[F], F]:
+    """
+    Drops the cached responses stored under the given tags after a BaseRoute write method runs
+
+    Args:
+        tags (str): Format strings for the tags to drop, filled in with the methods arguments by name
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self: BaseRoute, *args: t.Any, **kwargs: t.Any) -> t.Any:
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                # Invalidate even if the write raised, it might have been applied before failing
+                arguments = _bind_arguments(signature, (self, *args), kwargs)
+                self.invalidate_cache_tags(*(tag.format(**arguments) for tag in tags))
+
+        return t.cast(F, wrapper)
+
+    return decorator
@@ -3,19 +3,26 @@ import typing as t
 import discord
 
 from bot.api.api_client import ApiClient
-from bot.api.base_route import BaseRoute
+from bot.api.base_route import BaseRoute, cached, invalidates
 from bot.consts import Claims
 
+# How long in seconds a users claims are cached before they are requested again,
+# this bounds staleness for claims changed outside the bot (E.G the website)
+USER_CLAIMS_CACHE_TTL = 60
+
 
 class ClaimRoute(BaseRoute):
     def __init__(self, api_client: ApiClient):
         super().__init__(api_client)
 
+    # A role can be held by any number of users so we can't know which cached claims are stale
+    @invalidates("claims")
     async def add_claim_mapping(self, claim: Claims, role_id: int, **kwargs: t.Any) -> None:
         json = {"RoleId": role_id, "Claim": claim.name}
 
         await self._client.post("bot/claimmappings", data=json, **kwargs)
 
+    @invalidates("claims")
     async def remove_claim_mapping(self, claim: Claims, role_id: int, **kwargs: t.Any) -> None:
         json = {"RoleId": role_id, "Claim": claim.name}
 
@@ -24,6 +31,12 @@ class ClaimRoute(BaseRoute):
     async def get_claims_role(self, role_id: int) -> list[Claims]:
         return [Claims[c] for c in await self._client.get(f"bot/roles/{role_id}/claimmappings")]
 
+    # Claims are checked before nearly every command
+    @cached(
+        ttl=USER_CLAIMS_CACHE_TTL,
+        key="{user.guild.id}:{user.id}",
+        tags=["claims", "claims:{user.guild.id}", "claims:{user.guild.id}:{user.id}"],
+    )
     async def get_claims_user(self, user: discord.Member) -> list[Claims]:
         return [
             Claims[c] for c in await self._client.get(f"bot/users/{user.id}/{user.guild.id}/claims")
@@ -34,3 +47,11 @@ class ClaimRoute(BaseRoute):
 
     async def check_claim_user(self, claim: Claims, user: discord.Member) -> bool:
         return claim in await self.get_claims_user(user)
+
+    def invalidate_user_claims(self, guild_id: int, user_id: int) -> None:
+        """Drops the cached claims of a user, call this when their roles change"""
+        self.invalidate_cache_tags(f"claims:{guild_id}:{user_id}")
+
+    def invalidate_guild_claims(self, guild_id: int) -> None:
+        """Drops the cached claims of every user in a guild, call this when its roles change"""
+        self.invalidate_cache_tags(f"claims:{guild_id}")
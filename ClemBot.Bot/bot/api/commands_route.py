@@ -1,8 +1,13 @@
 import typing as t
 
 from bot.api.api_client import ApiClient
-from bot.api.base_route import BaseRoute
-from bot.models.command_models import CommandModel, CommandStatusModel
+from bot.api.base_route import BaseRoute, cached, invalidates
+from bot.models.command_models import CommandInvocationModel, CommandModel, CommandStatusModel
+from bot.utils.helpers import format_datetime
+
+# How long in seconds a commands restriction status is cached before it is requested again,
+# this bounds staleness for commands enabled or disabled outside the bot (E.G the website)
+COMMAND_STATUS_CACHE_TTL = 60
 
 
 class CommandsRoute(BaseRoute):
@@ -22,6 +27,26 @@ class CommandsRoute(BaseRoute):
 
         await self._client.post("bot/commands", data=json, **kwargs)
 
+    async def add_command_invocations(
+        self, invocations: list[CommandInvocationModel], **kwargs: t.Any
+    ) -> None:
+        json = {
+            "Invocations": [
+                {
+                    "CommandName": i.command_name,
+                    "GuildId": i.guild_id,
+                    "ChannelId": i.channel_id,
+                    "UserId": i.user_id,
+                    "Time": format_datetime(i.time),
+                }
+                for i in invocations
+            ]
+        }
+
+        await self._client.post("bot/commands/batch", data=json, **kwargs)
+
+    # Statuses are checked before every command
+    @cached(ttl=COMMAND_STATUS_CACHE_TTL, tags=["command_status:{guild_id}"])
     async def get_status(
         self, guild_id: int, channel_id: int, command_name: str, **kwargs: t.Any
     ) -> CommandStatusModel | None:
@@ -46,6 +71,7 @@ class CommandsRoute(BaseRoute):
 
         return CommandModel(**resp)
 
+    @invalidates("command_status:{guild_id}")
     async def disable_command(
         self,
         name: str,
@@ -61,6 +87,7 @@ class CommandsRoute(BaseRoute):
 
         await self._client.put("bot/commands/disable", data=json, **kwargs)
 
+    @invalidates("command_status:{guild_id}")
     async def enable_command(
         self, name: str, guild_id: int, channel_id: t.Optional[int] = None, **kwargs: t.Any
     ) -> None:
@@ -70,3 +97,7 @@ class CommandsRoute(BaseRoute):
             json["ChannelId"] = channel_id
 
         await self._client.delete("bot/commands/enable", data=json, **kwargs)
+
+    def invalidate_guild_statuses(self, guild_id: int) -> None:
+        """Drops every cached command status in a guild"""
+        self.invalidate_cache_tags(f"command_status:{guild_id}")
@@ -0,0 +1,67 @@
+import asyncio
+import csv
+import io
+import json
+import typing as t
+
+# The number of csv rows encoded into each chunk of a streamed request body
+CSV_CHUNK_ROWS = 5000
+
+
+def encode_csv(
+    header: t.Sequence[str],
+    rows: t.Iterable[t.Sequence[t.Any]],
+    *,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> t.Iterator[str]:
+    """
+    Lazily encodes rows into csv text, yielding it in chunks of chunk_rows rows
+
+    Only a single chunk of text is held in memory at a time so rows can be
+    a generator over something large like a guilds members
+
+    Args:
+        header (t.Sequence[str]): The column names written as the first row
+        rows (t.Iterable[t.Sequence[t.Any]]): The rows to encode, None values are written as empty
+        chunk_rows (int): The max number of rows in each yielded chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    writer.writerow(header)
+
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+
+        if i % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def stream_csv_body(
+    fields: dict[str, t.Any], csv_field: str, chunks: t.Iterable[str]
+) -> t.AsyncIterator[bytes]:
+    """
+    Streams a json object holding the given fields and a csv_field containing the csv chunks,
+    the ApiClient sends this as a chunked request so the full body is never built in memory
+
+    Args:
+        fields (dict[str, t.Any]): The other fields of the json object
+        csv_field (str): The name of the field the csv text is the value of
+        chunks (t.Iterable[str]): The csv text, E.G from encode_csv
+    """
+    # Open the object and the csv string by cutting the closing '"}' off an empty one
+    yield json.dumps({**fields, csv_field: ""})[:-2].encode()
+
+    for chunk in chunks:
+        # Escape the chunk as the inside of a json string
+        yield json.dumps(chunk)[1:-1].encode()
+
+        # Encoding a large guild can take a while, let other tasks run between chunks
+        await asyncio.sleep(0)
+
+    yield b'"}'
@@ -1,12 +1,27 @@
 import typing as t
 
+import aiohttp
 import discord
-import pandas as pd
 
 from bot.api.api_client import ApiClient
 from bot.api.base_route import BaseRoute
+from bot.api.csv_stream import encode_csv, stream_csv_body
 from bot.consts import GuildSettings
 from bot.models.guild_models import Guild, SlotScore
+from bot.utils.guild_state import GuildEntity, guild_rows
+
+# How long in seconds the api can take to respond once a guild sync body is sent,
+# replacing a large guilds entity set takes far longer than a normal request
+GUILD_SYNC_READ_TIMEOUT = 300
+
+# The endpoint, csv field and csv header each guild entity set is synced with
+_SYNC_ENDPOINTS: dict[GuildEntity, tuple[str, str, tuple[str, ...]]] = {
+    GuildEntity.users: ("users", "UserCsv", ("UserId", "Name")),
+    GuildEntity.roles: ("roles", "RoleCsv", ("Id", "Name", "Admin")),
+    GuildEntity.role_user_mappings: ("RoleUserMappings", "RoleMappingCsv", ("RoleId", "UserId")),
+    GuildEntity.channels: ("channels", "ChannelCsv", ("ChannelId", "Name")),
+    GuildEntity.threads: ("threads", "ThreadCsv", ("ThreadId", "Name", "ParentId")),
+}
 
 
 class GuildRoute(BaseRoute):
@@ -57,64 +72,40 @@ class GuildRoute(BaseRoute):
         await self._client.patch("bot/guilds", data=json)
 
     async def update_guild_users(self, guild: discord.Guild) -> None:
-        users = [{"UserId": u.id, "Name": u.name} for u in guild.members]
-
-        df: pd.DataFrame = pd.DataFrame.from_records(users)
-
-        json = {"GuildId": guild.id, "UserCsv": df.to_csv(index=False)}
-
-        await self._client.patch("bot/guilds/update/users", data=json)
+        await self.sync_guild_entity(guild, GuildEntity.users)
 
     async def update_guild_roles(self, guild: discord.Guild) -> None:
-        roles = [
-            {
-                "Id": r.id,
-                "Name": r.name,
-                "Admin": r.permissions.administrator,
-            }
-            for r in guild.roles
-        ]
-
-        df: pd.DataFrame = pd.DataFrame.from_records(roles)
-
-        json = {"GuildId": guild.id, "RoleCsv": df.to_csv(index=False)}
-
-        await self._client.patch("bot/guilds/update/roles", data=json)
+        await self.sync_guild_entity(guild, GuildEntity.roles)
 
     async def update_guild_role_user_mappings(self, guild: discord.Guild) -> None:
-
-        mappings = []
-        for role in guild.roles:
-            for user in role.members:
-                mappings.append({"RoleId": role.id, "UserId": user.id})
-
-        df: pd.DataFrame = pd.DataFrame.from_records(mappings)
-
-        json = {"GuildId": guild.id, "RoleMappingCsv": df.to_csv(index=False)}
-
-        await self._client.patch("bot/guilds/update/RoleUserMappings", data=json)
+        await self.sync_guild_entity(guild, GuildEntity.role_user_mappings)
 
     async def update_guild_channels(self, guild: discord.Guild) -> None:
-
-        channels = [{"ChannelId": c.id, "Name": c.name} for c in guild.channels]
-
-        df: pd.DataFrame = pd.DataFrame.from_records(channels)
-
-        json = {"GuildId": guild.id, "ChannelCsv": df.to_csv(index=False)}
-
-        await self._client.patch("bot/guilds/update/channels", data=json)
+        await self.sync_guild_entity(guild, GuildEntity.channels)
 
     async def update_guild_threads(self, guild: discord.Guild) -> None:
+        await self.sync_guild_entity(guild, GuildEntity.threads)
+
+    async def sync_guild_entity(
+        self, guild: discord.Guild, entity: GuildEntity, **kwargs: t.Any
+    ) -> None:
+        """Replaces the api's copy of a guilds entity set with the bots current view of it"""
+        endpoint, csv_field, header = _SYNC_ENDPOINTS[entity]
+
+        # The api replaces the guilds whole entity set with the csv so it has to be sent
+        # in one request, stream it in chunks instead of building it all in memory first
+        csv = encode_csv(header, guild_rows(guild, entity))
+        body = stream_csv_body({"GuildId": guild.id}, csv_field, csv)
+
+        kwargs.setdefault(
+            "timeout",
+            aiohttp.ClientTimeout(
+                sock_connect=self._client.pool_settings.connect_timeout,
+                sock_read=GUILD_SYNC_READ_TIMEOUT,
+            ),
+        )
 
-        threads = [
-            {"ThreadId": c.id, "Name": c.name, "ParentId": c.parent_id} for c in guild.threads
-        ]
-
-        df: pd.DataFrame = pd.DataFrame.from_records(threads)
-
-        json = {"GuildId": guild.id, "ThreadCsv": df.to_csv(index=False)}
-
-        await self._client.patch("bot/guilds/update/threads", data=json)
+        await self._client.patch(f"bot/guilds/update/{endpoint}", data=body, **kwargs)
 
     async def get_can_embed_link(self, guild_id: int) -> t.Any:
         resp = await self._client.get(
@@ -0,0 +1,46 @@
+import dataclasses
+import json
+import typing as t
+
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonCodec:
+    """A pair of functions the ApiClient uses to encode request bodies and decode responses"""
+
+    name: str
+    dumps: t.Callable[[t.Any], bytes]
+    loads: t.Callable[[bytes | str], t.Any]
+
+
+def _stdlib_dumps(obj: t.Any) -> bytes:
+    # Match the separators aiohttp used so request bodies don't change size
+    return json.dumps(obj).encode()
+
+
+STDLIB_CODEC = JsonCodec(name="json", dumps=_stdlib_dumps, loads=json.loads)
+
+ORJSON_CODEC: JsonCodec | None
+
+try:
+    import orjson
+
+    def _orjson_dumps(obj: t.Any) -> bytes:
+        # The stdlib allows int dict keys, keep that working. Annotated so the result
+        # is typed as bytes even when orjson isn't installed for type checking
+        encoded: bytes = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return encoded
+
+    ORJSON_CODEC = JsonCodec(name="orjson", dumps=_orjson_dumps, loads=orjson.loads)
+except ImportError:
+    ORJSON_CODEC = None
+
+
+def get_default_codec() -> JsonCodec:
+    """Gets the fastest codec that is installed, orjson is optional so fall back to the stdlib"""
+    codec = ORJSON_CODEC or STDLIB_CODEC
+    log.info("Using json codec: {codec}", codec=codec.name)
+    return codec
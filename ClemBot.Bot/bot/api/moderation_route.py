@@ -5,6 +5,7 @@ from bot.api.api_client import ApiClient
 from bot.api.base_route import BaseRoute
 from bot.consts import Infractions
 from bot.models.moderation_models import Infraction
+from bot.utils.helpers import format_datetime
 
 
 class ModerationRoute(BaseRoute):
@@ -93,6 +94,24 @@ class ModerationRoute(BaseRoute):
 
         return [Infraction(**i) for i in resp]
 
+    async def get_active_timed_infractions(
+        self, before: datetime | None = None, **kwargs: t.Any
+    ) -> list[Infraction] | None:
+        """
+        Gets every active infraction with a duration across all guilds in one request,
+        only the ones expiring before the given time if there is one
+
+        Returns None if the request failed so callers can tell that apart from there being none,
+        E.G against an api without the bulk endpoint, and fall back to get_guild_infractions
+        """
+        params = {"before": format_datetime(before)} if before else None
+        resp = await self._client.get("bot/infractions/active", params=params, **kwargs)
+
+        if resp is None:
+            return None
+
+        return [Infraction(**i) for i in resp]
+
     async def get_guild_infractions_user(self, guild_id: int, user_id: int) -> list[Infraction]:
         resp = await self._client.get(f"bot/users/infractions/{user_id}/{guild_id}")
 
@@ -46,8 +46,14 @@ class ReminderRoute(BaseRoute):
 
         return Reminder(**resp)
 
-    async def fetch_all_reminders(self, **kwargs: t.Any) -> list[ReminderReload]:
-        resp = await self._client.get("bot/reminders", **kwargs)
+    async def fetch_all_reminders(
+        self, before: datetime | None = None, **kwargs: t.Any
+    ) -> list[ReminderReload]:
+        """
+        Gets every pending reminder, only the ones due before the given time if there is one
+        """
+        params = {"before": format_datetime(before)} if before else None
+        resp = await self._client.get("bot/reminders", params=params, **kwargs)
 
         if not resp:
             return []
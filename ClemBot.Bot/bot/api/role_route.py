@@ -1,14 +1,19 @@
 import typing as t
 
 from bot.api.api_client import ApiClient
-from bot.api.base_route import BaseRoute
+from bot.api.base_route import BaseRoute, cached, invalidates
 from bot.models.role_models import Role, RoleFull
 
+# How long in seconds role details are cached before they are requested again,
+# this bounds staleness for roles edited outside the bot (E.G the website)
+ROLE_CACHE_TTL = 300
+
 
 class RoleRoute(BaseRoute):
     def __init__(self, api_client: ApiClient):
         super().__init__(api_client)
 
+    @invalidates("guild_roles:{guild_id}")
     async def create_role(
         self, role_id: int, name: str, is_admin: bool, guild_id: int, **kwargs: t.Any
     ) -> None:
@@ -19,27 +24,38 @@ class RoleRoute(BaseRoute):
     async def get_role(self, role_id: int) -> RoleFull:
         return RoleFull(**await self._client.get(f"bot/roles/{role_id}"))
 
-    async def edit_role(self, role_id: int, name: str, is_admin: bool, **kwargs: t.Any) -> None:
+    @invalidates("role:{role_id}", "guild_roles:{guild_id}")
+    async def edit_role(
+        self, role_id: int, name: str, is_admin: bool, guild_id: int, **kwargs: t.Any
+    ) -> None:
         json = {"Id": role_id, "Name": name, "Admin": is_admin}
 
         await self._client.patch("bot/roles", data=json, **kwargs)
 
-    async def set_assignable(self, role_id: int, assignable: bool, **kwargs: t.Any) -> None:
+    @invalidates("role:{role_id}", "guild_roles:{guild_id}")
+    async def set_assignable(
+        self, role_id: int, assignable: bool, guild_id: int, **kwargs: t.Any
+    ) -> None:
         json = {"Id": role_id, "Assignable": assignable}
 
         await self._client.patch("bot/roles", data=json, **kwargs)
 
-    async def set_auto_assigned(self, role_id: int, auto_assigned: bool, **kwargs: t.Any) -> None:
+    @invalidates("role:{role_id}", "guild_roles:{guild_id}")
+    async def set_auto_assigned(
+        self, role_id: int, auto_assigned: bool, guild_id: int, **kwargs: t.Any
+    ) -> None:
         json = {"Id": role_id, "AutoAssigned": auto_assigned}
 
         await self._client.patch("bot/roles", data=json, **kwargs)
 
-    async def remove_role(self, role_id: int, **kwargs: t.Any) -> None:
+    @invalidates("role:{role_id}", "guild_roles:{guild_id}")
+    async def remove_role(self, role_id: int, guild_id: int, **kwargs: t.Any) -> None:
         await self._client.delete(f"bot/roles/{role_id}", **kwargs)
 
     async def get_guilds_roles(self, guild_id: int) -> list[int] | None:
         return t.cast(list[int] | None, await self._client.get(f"bot/guilds/{guild_id}/roles"))
 
+    @cached(ttl=ROLE_CACHE_TTL, tags=["guild_roles:{guild_id}"])
     async def get_guilds_assignable_roles(self, guild_id: int) -> list[Role] | None:
         roles = await self._client.get(f"bot/guilds/{guild_id}/roles")
 
@@ -48,14 +64,16 @@ class RoleRoute(BaseRoute):
 
         return [Role(**r) for r in roles if r["isAssignable"]]
 
-    async def get_guilds_auto_assigned_roles(self, guild_id: int) -> list[Role]:
+    @cached(ttl=ROLE_CACHE_TTL, tags=["guild_roles:{guild_id}"])
+    async def get_guilds_auto_assigned_roles(self, guild_id: int) -> list[Role] | None:
         roles = await self._client.get(f"bot/guilds/{guild_id}/roles")
 
-        if not roles:
-            return []
+        if roles is None:
+            return None
 
         return [Role(**r) for r in roles if r["isAutoAssigned"]]
 
+    @cached(ttl=ROLE_CACHE_TTL, tags=["role:{role_id}"])
     async def check_role_assignable(self, role_id: int) -> bool | None:
         roles = await self._client.get(f"bot/roles/{role_id}")
 
@@ -2,13 +2,19 @@ import typing as t
 
 import bot.models.tag_models as models
 from bot.api.api_client import ApiClient
-from bot.api.base_route import BaseRoute
+from bot.api.base_route import BaseRoute, cached, invalidates
+from bot.utils.helpers import format_datetime
+
+# How long in seconds a tag is cached before it is requested again,
+# this bounds how stale a tags use count or content edited outside the bot can get
+TAG_CACHE_TTL = 60
 
 
 class TagRoute(BaseRoute):
     def __init__(self, api_client: ApiClient):
         super().__init__(api_client)
 
+    @invalidates("tags:{guild_id}")
     async def create_tag(
         self, name: str, content: str, guild_id: int, user_id: int, **kwargs: t.Any
     ) -> models.Tag | None:
@@ -26,6 +32,7 @@ class TagRoute(BaseRoute):
 
         return models.Tag(**tag_dict)
 
+    @invalidates("tags:{guild_id}")
     async def edit_tag_content(
         self, guild_id: int, name: str, content: str, **kwargs: t.Any
     ) -> models.Tag | None:
@@ -38,6 +45,7 @@ class TagRoute(BaseRoute):
 
         return models.Tag(**tag_dict)
 
+    @invalidates("tags:{guild_id}")
     async def edit_tag_owner(
         self, guild_id: int, name: str, user_id: int, **kwargs: t.Any
     ) -> models.Tag | None:
@@ -50,6 +58,8 @@ class TagRoute(BaseRoute):
 
         return models.Tag(**tag_dict)
 
+    # The tag includes its use count, so it is also dropped whenever a use is recorded
+    @cached(ttl=TAG_CACHE_TTL, tags=["tags:{guild_id}", "tag_uses:{guild_id}"])
     async def get_tag(
         self, guild_id: int, name: str, *, do_fuzzy: bool = False
     ) -> models.Tag | None:
@@ -66,6 +76,7 @@ class TagRoute(BaseRoute):
 
         return models.Tag(**tag_dict)
 
+    @cached(ttl=TAG_CACHE_TTL, tags=["tags:{guild_id}"])
     async def get_tag_content(self, guild_id: int, name: str) -> str | None:
         json = {
             "GuildId": guild_id,
@@ -76,6 +87,7 @@ class TagRoute(BaseRoute):
 
         return None if resp is None else resp["content"]
 
+    @invalidates("tags:{guild_id}")
     async def delete_tag(
         self, guild_id: int, name: str, **kwargs: t.Any
     ) -> models.TagDelete | None:
@@ -99,6 +111,7 @@ class TagRoute(BaseRoute):
 
         return models.TagDelete(**resp)
 
+    @invalidates("tag_uses:{guild_id}")
     async def add_tag_use(
         self, guild_id: int, name: str, channel_id: int, user_id: int
     ) -> models.TagInvoke | None:
@@ -117,8 +130,27 @@ class TagRoute(BaseRoute):
 
         return models.TagInvoke(**resp)
 
-    async def get_guilds_tags(self, guild_id: int) -> list[models.Tag]:
-        resp = await self._client.get(f"guilds/{guild_id}/tags")
+    async def add_tag_uses(self, uses: list[models.TagUse], **kwargs: t.Any) -> None:
+        json = {
+            "Uses": [
+                {
+                    "GuildId": u.guild_id,
+                    "Name": u.name,
+                    "ChannelId": u.channel_id,
+                    "UserId": u.user_id,
+                    "Time": format_datetime(u.time),
+                }
+                for u in uses
+            ]
+        }
+
+        try:
+            await self._client.post("bot/tags/invoke/batch", data=json, **kwargs)
+        finally:
+            self.invalidate_cache_tags(*{f"tag_uses:{u.guild_id}" for u in uses})
+
+    async def get_guilds_tags(self, guild_id: int, **kwargs: t.Any) -> list[models.Tag]:
+        resp = await self._client.get(f"guilds/{guild_id}/tags", **kwargs)
 
         if not resp:
             return []
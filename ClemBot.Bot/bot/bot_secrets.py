@@ -1,5 +1,6 @@
 import json
 import os
+import typing as t
 
 from bot.errors import ConfigAccessError
 from bot.utils.logging_utils import get_logger
@@ -24,6 +25,10 @@ class BotSecrets:
         self._site_url: str | None = None
         self._docs_url: str | None = None
         self._allow_bot_input_ids: list[int] | None = None
+        self._message_spill_file: str | None = None
+        self._api_pool_settings: dict[str, t.Any] | None = None
+        self._guild_fingerprint_file: str | None = None
+        self._startup_sync_concurrency: int | None = None
 
     @property
     def client_token(self) -> str:
@@ -197,6 +202,51 @@ class BotSecrets:
             raise ConfigAccessError("allow_bot_input_ids has already been initialized")
         self._allow_bot_input_ids = value
 
+    @property
+    def message_spill_file(self) -> str | None:
+        # Optional, message batches that fail to send are dropped without one
+        return self._message_spill_file
+
+    @message_spill_file.setter
+    def message_spill_file(self, value: str | None) -> None:
+        if self._message_spill_file:
+            raise ConfigAccessError("message_spill_file has already been initialized")
+        self._message_spill_file = value
+
+    @property
+    def api_pool_settings(self) -> dict[str, t.Any]:
+        # Optional, overrides of the ApiClients ConnectionPoolSettings by field name
+        if not self._api_pool_settings:
+            return {}
+        return self._api_pool_settings
+
+    @api_pool_settings.setter
+    def api_pool_settings(self, value: dict[str, t.Any] | None) -> None:
+        if self._api_pool_settings:
+            raise ConfigAccessError("api_pool_settings has already been initialized")
+        self._api_pool_settings = value
+
+    @property
+    def guild_fingerprint_file(self) -> str | None:
+        # Optional, every guild is fully synced on startup without one
+        return self._guild_fingerprint_file
+
+    @guild_fingerprint_file.setter
+    def guild_fingerprint_file(self, value: str | None) -> None:
+        if self._guild_fingerprint_file:
+            raise ConfigAccessError("guild_fingerprint_file has already been initialized")
+        self._guild_fingerprint_file = value
+
+    @property
+    def startup_sync_concurrency(self) -> int | None:
+        return self._startup_sync_concurrency
+
+    @startup_sync_concurrency.setter
+    def startup_sync_concurrency(self, value: int | None) -> None:
+        if self._startup_sync_concurrency:
+            raise ConfigAccessError("startup_sync_concurrency has already been initialized")
+        self._startup_sync_concurrency = value
+
     def load_development_secrets(self, lines: str) -> None:
         secrets = json.loads(lines)
 
@@ -214,6 +264,10 @@ class BotSecrets:
         self.site_url = secrets["SiteUrl"]
         self.docs_url = secrets["DocsUrl"]
         self.allow_bot_input_ids = secrets["AllowBotInputIds"]
+        self.message_spill_file = secrets.get("MessageSpillFile")
+        self.api_pool_settings = secrets.get("ApiPoolSettings")
+        self.guild_fingerprint_file = secrets.get("GuildFingerprintFile")
+        self.startup_sync_concurrency = secrets.get("StartupSyncConcurrency")
 
         log.info("Bot Secrets Loaded")
 
@@ -240,6 +294,11 @@ class BotSecrets:
         self.allow_bot_input_ids = [
             int(n) for n in os.environ.get("ALLOW_BOT_INPUT_IDS").split(",")  # type: ignore
         ]
+        self.message_spill_file = os.environ.get("MESSAGE_SPILL_FILE")
+        self.api_pool_settings = json.loads(os.environ.get("API_POOL_SETTINGS") or "{}")
+        self.guild_fingerprint_file = os.environ.get("GUILD_FINGERPRINT_FILE")
+        concurrency = os.environ.get("STARTUP_SYNC_CONCURRENCY")
+        self.startup_sync_concurrency = int(concurrency) if concurrency else None
 
         log.info("Production keys loaded")
 
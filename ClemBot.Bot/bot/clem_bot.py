@@ -37,11 +37,15 @@ from bot.api import (
     user_route,
     welcome_message_route,
 )
-from bot.api.api_client import ApiClient
+from bot.api.api_client import ApiClient, ConnectionPoolSettings
 from bot.consts import Colors
+from bot.designated_channel_registry import DesignatedChannelRegistry
 from bot.errors import BotOnlyRequestError, SilentCommandRestrictionError
 from bot.messaging.events import Events
 from bot.messaging.messenger import Messenger
+from bot.models.command_models import CommandInvocationModel
+from bot.models.tag_models import TagUse
+from bot.utils.batcher import WriteBehindBatcher
 from bot.utils.logging_utils import get_logger
 from bot.utils.scheduler import Scheduler
 
@@ -76,6 +80,7 @@ class ClemBot(commands.Bot):
             connect_callback=self.on_backend_connect,
             disconnect_callback=self.on_backend_disconnect,
             bot_only=bot_secrets.secrets.bot_only,
+            pool_settings=ConnectionPoolSettings(**bot_secrets.secrets.api_pool_settings),
         )
 
         # Bool to indicate if the bot is still in its startup procedure, if it is then
@@ -110,6 +115,19 @@ class ClemBot(commands.Bot):
         self.health_check_route = health_check_route.HealthCheckRoute(self.api_client)
         self.reminder_route = reminder_route.ReminderRoute(self.api_client)
 
+        # In memory lookups of each guilds designated channels, shared by every service
+        self.designated_channel_registry = DesignatedChannelRegistry(
+            messenger, self.designated_channel_route
+        )
+
+        # Analytics writes are batched off the critical path of commands and tags
+        self.command_invocation_batcher = WriteBehindBatcher[CommandInvocationModel](
+            self.commands_route.add_command_invocations, name="command_invocations"
+        )
+        self.tag_use_batcher = WriteBehindBatcher[TagUse](
+            self.tag_route.add_tag_uses, name="tag_uses"
+        )
+
         self.active_services: dict[str, base_service.BaseService] = {}
 
     async def setup_hook(self) -> None:
@@ -176,6 +194,19 @@ class ClemBot(commands.Bot):
         log.info("Shutdown started: logging close time")
 
         await self.messenger.close()
+
+        for service in self.active_services.values():
+            try:
+                await service.unload_service()
+            except Exception as e:
+                await self.global_error_handler(e)
+
+        # Flush after the messenger so analytics from the last dispatched events are written
+        await self.command_invocation_batcher.close()
+        await self.tag_use_batcher.close()
+
+        await self.scheduler.close()
+
         await super().close()
 
     async def send_startup_log_embed(self, embed: discord.Embed) -> None:
@@ -191,8 +222,11 @@ class ClemBot(commands.Bot):
         """
         Before invoke hook to check for command restrictions & claims
         """
-        await self.messenger.publish(Events.on_restrictions_check, ctx)
-        await self.messenger.publish(Events.on_claims_check, ctx)
+        # The checks are independent of each other so run them at the same time,
+        # if both fail the restriction error still takes priority
+        await self.messenger.publish_concurrent(
+            (Events.on_restrictions_check, Events.on_claims_check), ctx
+        )
 
     async def claims_check(self, ctx: ext.ClemBotCtx) -> bool:
         """
@@ -281,7 +315,9 @@ class ClemBot(commands.Bot):
         await self.publish_to_queue_with_error(Events.on_guild_joined, guild.id, guild)
 
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
-        await self.publish_to_queue_with_error(Events.on_guild_update, before.id, before, after)
+        await self.publish_to_queue_with_error(
+            Events.on_guild_update, before.id, before, after, coalesce_key=after.id
+        )
 
     async def on_guild_remove(self, guild: discord.Guild) -> None:
         await self.publish_to_queue_with_error(Events.on_guild_leave, guild.id, guild)
@@ -291,7 +327,7 @@ class ClemBot(commands.Bot):
 
     async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
         await self.publish_to_queue_with_error(
-            Events.on_guild_role_update, before.guild.id, before, after
+            Events.on_guild_role_update, before.guild.id, before, after, coalesce_key=after.id
         )
 
     async def on_guild_role_delete(self, role: discord.Role) -> None:
@@ -311,7 +347,7 @@ class ClemBot(commands.Bot):
         self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
     ) -> None:
         await self.publish_to_queue_with_error(
-            Events.on_guild_channel_update, before.guild.id, before, after
+            Events.on_guild_channel_update, before.guild.id, before, after, coalesce_key=after.id
         )
 
     async def on_thread_create(self, thread: discord.Thread) -> None:
@@ -324,7 +360,7 @@ class ClemBot(commands.Bot):
 
     async def on_thread_update(self, before: discord.Thread, after: discord.Thread) -> None:
         await self.publish_to_queue_with_error(
-            Events.on_guild_thread_update, before.guild.id, before, after
+            Events.on_guild_thread_update, before.guild.id, before, after, coalesce_key=after.id
         )
 
     async def on_member_join(self, user: discord.Member) -> None:
@@ -362,7 +398,7 @@ class ClemBot(commands.Bot):
 
     async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
         await self.publish_to_queue_with_error(
-            Events.on_member_update, before.guild.id, before, after
+            Events.on_member_update, before.guild.id, before, after, coalesce_key=after.id
         )
 
     """
@@ -370,11 +406,18 @@ class ClemBot(commands.Bot):
     """
 
     async def publish_to_queue_with_error(
-        self, event: str, guild_id: int, *args: t.Any, **kwargs: dict[str, t.Any]
+        self,
+        event: str,
+        guild_id: int,
+        *args: t.Any,
+        coalesce_key: t.Hashable | None = None,
+        **kwargs: dict[str, t.Any],
     ) -> None:
         try:
             if not self.is_starting_up:
-                await self.messenger.publish_to_queue(event, guild_id, *args, **kwargs)
+                await self.messenger.publish_to_queue(
+                    event, guild_id, *args, coalesce_key=coalesce_key, **kwargs
+                )
         except Exception as e:
             tb = traceback.format_exc()
             await self.global_error_handler(e, traceback=tb)
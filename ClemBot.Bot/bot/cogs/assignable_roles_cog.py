@@ -251,7 +251,7 @@ class AssignableRolesCog(commands.Cog):
     @ext.short_help("Marks a role as user assignable")
     @ext.example("roles add @SomeExampleRole")
     async def add(self, ctx: ext.ClemBotCtx, *, role: discord.Role) -> None:
-        await self.bot.role_route.set_assignable(role.id, True, raise_on_error=True)
+        await self.bot.role_route.set_assignable(role.id, True, role.guild.id, raise_on_error=True)
 
         title = f"Role @{role.name} Added as assignable :white_check_mark:"
         embed = discord.Embed(title=title, color=Colors.ClemsonOrange)
@@ -264,7 +264,7 @@ class AssignableRolesCog(commands.Cog):
     @ext.short_help("Removes a role as user assignable")
     @ext.example("roles delete @SomeExampleRole")
     async def remove(self, ctx: ext.ClemBotCtx, *, role: discord.Role) -> None:
-        await self.bot.role_route.set_assignable(role.id, False, raise_on_error=True)
+        await self.bot.role_route.set_assignable(role.id, False, role.guild.id, raise_on_error=True)
 
         title = f"Role @{role.name} Removed as assignable :white_check_mark:"
         embed = discord.Embed(title=title, color=Colors.ClemsonOrange)
@@ -278,6 +278,13 @@ class AssignableRolesCog(commands.Cog):
     async def auto(self, ctx: ext.ClemBotCtx) -> None:
         roles = await self.bot.role_route.get_guilds_auto_assigned_roles(ctx.guild.id)
 
+        if roles is None:
+            embed = discord.Embed(
+                title="Error: Could not fetch auto assigned roles", color=Colors.Error
+            )
+            await ctx.send(embed=embed)
+            return
+
         if not roles:
             embed = discord.Embed(
                 title="No roles are currently auto assigned on join", color=Colors.ClemsonOrange
@@ -323,6 +330,13 @@ class AssignableRolesCog(commands.Cog):
 
         roles = await self.bot.role_route.get_guilds_auto_assigned_roles(ctx.guild.id)
 
+        if roles is None:
+            embed = discord.Embed(
+                title="Error: Could not fetch auto assigned roles", color=Colors.Error
+            )
+            await ctx.send(embed=embed)
+            return
+
         if role.id in [r.id for r in roles]:
             embed = discord.Embed(
                 title=f"Error: @{role.name} already set as auto assigned", color=Colors.Error
@@ -330,7 +344,7 @@ class AssignableRolesCog(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        await self.bot.role_route.set_auto_assigned(role.id, True)
+        await self.bot.role_route.set_auto_assigned(role.id, True, role.guild.id)
 
         title = f"Role @{role.name} Added as an auto assigned on join role :white_check_mark:"
         embed = discord.Embed(title=title, color=Colors.ClemsonOrange)
@@ -346,6 +360,13 @@ class AssignableRolesCog(commands.Cog):
 
         roles = await self.bot.role_route.get_guilds_auto_assigned_roles(ctx.guild.id)
 
+        if roles is None:
+            embed = discord.Embed(
+                title="Error: Could not fetch auto assigned roles", color=Colors.Error
+            )
+            await ctx.send(embed=embed)
+            return
+
         if not role.id in [r.id for r in roles]:
             embed = discord.Embed(
                 title=f"Error: @{role.name} not set as auto assigned", color=Colors.Error
@@ -353,7 +374,7 @@ class AssignableRolesCog(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        await self.bot.role_route.set_auto_assigned(role.id, False)
+        await self.bot.role_route.set_auto_assigned(role.id, False, role.guild.id)
 
         title = f"Role @{role.name} Removed as an auto assigned on join role :white_check_mark:"
         embed = discord.Embed(title=title, color=Colors.ClemsonOrange)
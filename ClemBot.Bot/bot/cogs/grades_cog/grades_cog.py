@@ -56,10 +56,10 @@ class GradesCog(commands.Cog):
 
         self.prof_class_counts = Counter(map(str.lower, self.grades_df["Instructor"].to_list()))
 
-    def fuzzy_find_professors(self, prof: str) -> list[str]:
+    def fuzzy_find_professors(self, prof: str, limit: int | None = None) -> list[str]:
         return [
             e.item
-            for e in query_search_bank(self.prof_search_bank, prof.lower())
+            for e in query_search_bank(self.prof_search_bank, prof.lower(), limit=limit)
             if e.similarity > 0.3
         ]
 
@@ -253,7 +253,7 @@ class GradesCog(commands.Cog):
             result = f'"{prof}" is not a known professor'
 
             matcher_results = sorted(
-                self.fuzzy_find_professors(prof)[:5],
+                self.fuzzy_find_professors(prof, limit=5),
                 key=(lambda p: self.prof_class_counts[p]),
                 reverse=True,
             )
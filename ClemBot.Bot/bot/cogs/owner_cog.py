@@ -1,6 +1,7 @@
 # type: ignore
 
 import asyncio
+import dataclasses
 import json
 from collections import deque
 
@@ -10,6 +11,7 @@ import discord.ext.commands as commands
 import bot.extensions as ext
 from bot.clem_bot import ClemBot
 from bot.consts import Colors, DesignatedChannels, Moderation, OwnerDesignatedChannels
+from bot.messaging.events import Events
 from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
@@ -99,10 +101,17 @@ class OwnerCog(commands.Cog):
     @owner.group(invoke_without_command=True)
     @commands.is_owner()
     async def queuestatus(self, ctx):
-        stats = {}
-        for k, v in self.bot.messenger._guild_event_queue.items():
-            stats[k] = v.qsize()
+        stats = dataclasses.asdict(self.bot.messenger.queue_stats())
 
+        # Idle queues are noise, only report the depths of queues that have work waiting
+        stats["depths"] = {k: v for k, v in stats["depths"].items() if v > 0}
+
+        await ctx.send(json.dumps(stats, indent=2))
+
+    @owner.group(invoke_without_command=True)
+    @commands.is_owner()
+    async def apistatus(self, ctx):
+        stats = dataclasses.asdict(self.bot.api_client.pool_stats())
         await ctx.send(json.dumps(stats, indent=2))
 
     @owner.group(invoke_without_command=True, aliases=["channels"])
@@ -158,6 +167,7 @@ class OwnerCog(commands.Cog):
             return
 
         await self.bot.designated_channel_route.register_channel(channel.id, channel_type)
+        await self.bot.messenger.publish(Events.on_designated_channels_changed, ctx.guild.id)
 
         embed = discord.Embed(title="Owner Designated Channel added", color=Colors.ClemsonOrange)
         embed.add_field(
@@ -192,6 +202,7 @@ class OwnerCog(commands.Cog):
             return
 
         await self.bot.designated_channel_route.delete_channel(channel.id, channel_type)
+        await self.bot.messenger.publish(Events.on_designated_channels_changed, ctx.guild.id)
 
         embed = discord.Embed(title="Owner Designated Channel deleted", color=Colors.ClemsonOrange)
         embed.add_field(
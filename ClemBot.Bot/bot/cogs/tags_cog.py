@@ -1,4 +1,5 @@
 import typing as t
+from datetime import datetime
 
 import discord
 import discord.ext.commands as commands
@@ -8,7 +9,7 @@ from bot import bot_secrets
 from bot.clem_bot import ClemBot
 from bot.consts import Claims, Colors
 from bot.messaging.events import Events
-from bot.models.tag_models import Tag
+from bot.models.tag_models import Tag, TagUse
 from bot.utils.helpers import chunk_sequence
 from bot.utils.logging_utils import get_logger
 
@@ -40,8 +41,14 @@ class TagCog(commands.Cog):
             tag_name = tag_name.lower()
             if not (tag := await self._check_tag_exists(ctx, tag_name, do_suggestions=True)):
                 return
-            await self.bot.tag_route.add_tag_use(
-                ctx.guild.id, tag_name, ctx.channel.id, ctx.author.id
+            self.bot.tag_use_batcher.add(
+                TagUse(
+                    guild_id=ctx.guild.id,
+                    name=tag_name,
+                    channel_id=ctx.channel.id,
+                    user_id=ctx.author.id,
+                    time=datetime.utcnow(),
+                )
             )
 
             msg = await ctx.send(tag.content)
@@ -146,6 +153,7 @@ class TagCog(commands.Cog):
         await self.bot.tag_route.create_tag(
             name, formatted_content, ctx.guild.id, ctx.author.id, raise_on_error=True
         )
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(title=":white_check_mark: Tag Added", color=Colors.ClemsonOrange)
         embed.add_field(name="Name", value=name, inline=True)
         embed.set_footer(text=str(ctx.author), icon_url=ctx.author.display_avatar.url)
@@ -246,6 +254,7 @@ class TagCog(commands.Cog):
         await self.bot.tag_route.edit_tag_content(
             ctx.guild.id, tag.name, formatted_content, raise_on_error=True
         )
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(title=":white_check_mark: Tag Edited", color=Colors.ClemsonOrange)
         embed.add_field(name="Name", value=tag.name, inline=False)
         embed.set_footer(text=str(author), icon_url=author.display_avatar.url)
@@ -266,6 +275,7 @@ class TagCog(commands.Cog):
         # transfer tag to new owner
         author = ctx.author
         await self.bot.tag_route.edit_tag_owner(ctx.guild.id, name, author.id, raise_on_error=True)
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(title=":white_check_mark: Tag Claimed", color=Colors.ClemsonOrange)
         embed.add_field(name="Name", value=tag.name, inline=True)
         embed.add_field(name="Owner", value=author.mention, inline=True)
@@ -375,6 +385,7 @@ class TagCog(commands.Cog):
             return await self._error_embed(ctx, "Tag prefix cannot contain the character '`'.")
 
         await self.bot.custom_tag_prefix_route.set_custom_tag_prefix(ctx.guild.id, tag_prefix)
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(
             title=":white_check_mark: Tag Prefix Changed", color=Colors.ClemsonOrange
         )
@@ -393,6 +404,7 @@ class TagCog(commands.Cog):
         await self.bot.custom_tag_prefix_route.set_custom_tag_prefix(
             ctx.guild.id, DEFAULT_TAG_PREFIX
         )
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(
             title=":white_check_mark: Tag Prefix Reset", color=Colors.ClemsonOrange
         )
@@ -403,6 +415,7 @@ class TagCog(commands.Cog):
         user = ctx.guild.get_member(tag.user_id)
         assert user is not None
         await self.bot.tag_route.edit_tag_owner(ctx.guild.id, tag.name, to.id, raise_on_error=True)
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
         embed = discord.Embed(
             title=":white_check_mark: Tag Transferred", color=Colors.ClemsonOrange
         )
@@ -415,6 +428,7 @@ class TagCog(commands.Cog):
     async def _delete_tag(self, name: str, ctx: ext.ClemBotCtx) -> None:
         name = name.lower()
         tag = await self.bot.tag_route.delete_tag(ctx.guild.id, name, raise_on_error=True)
+        await self.bot.messenger.publish(Events.on_guild_tags_changed, ctx.guild.id)
 
         if not tag:
             return None
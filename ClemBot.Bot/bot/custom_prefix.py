@@ -4,16 +4,39 @@ from discord.ext import commands
 import bot.bot_secrets as bot_secrets
 from bot.clem_bot import ClemBot
 from bot.errors import PrefixRequestError
+from bot.messaging.events import Events
+from bot.messaging.messenger import Messenger
+from bot.utils.cache import TtlCache
 from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
 
+# How long in seconds a guilds prefixes are served from memory before being requested again,
+# this bounds how stale prefixes can get if they are changed outside the bot (E.G the website)
+PREFIX_CACHE_TTL = 300
+
 
 class CustomPrefix:
-    def __init__(self, *, default: str):
+    def __init__(self, *, default: str, messenger: Messenger):
         log.info(f'Setting default prefix too: "{default}""')
         self.default = default
 
+        self._prefix_cache = TtlCache[int, list[str]](
+            ttl=PREFIX_CACHE_TTL, keep_expired=True, name="custom_prefix"
+        )
+
+        # The messenger holds a weak reference to the listener,
+        # the bot holds a strong reference to this instance through its command_prefix
+        messenger.subscribe(Events.on_set_custom_prefix, self.on_set_custom_prefix)
+
+    async def on_set_custom_prefix(self, guild: discord.Guild, prefix: str) -> None:
+        log.info(
+            "Invalidating cached prefixes for guild {guild} after prefix set to {prefix}",
+            guild=guild.id,
+            prefix=prefix,
+        )
+        self._prefix_cache.invalidate(guild.id)
+
     async def get_prefix(self, bot: ClemBot, message: discord.Message) -> list[str]:
 
         prefixes = []
@@ -21,19 +44,34 @@ class CustomPrefix:
         # Check if bot is in BotOnly mode, if it is we cant get custom prefixes
         # so we have to fall back to self.default
         if not bot_secrets.secrets.bot_only:
-            # noinspection PyBroadException
-            try:
-                # Try to grab the prefixes from the db, raise an error on failure
-                # and bailout, we cant respond to anything at the moment
-                assert message.guild
-                prefixes = await bot.custom_prefix_route.get_custom_prefixes(
-                    message.guild.id, raise_on_error=True
-                )
-            except Exception as e:
-                log.error("Custom prefix request failed with error: {error}", error=e)
-                raise PrefixRequestError("Requesting custom prefix from the api failed")
+            assert message.guild
+            prefixes = await self._get_custom_prefixes(bot, message.guild.id)
 
         if len(prefixes) == 0:
             prefixes = [self.default]
 
         return commands.when_mentioned(bot, message) + prefixes
+
+    async def _get_custom_prefixes(self, bot: ClemBot, guild_id: int) -> list[str]:
+        # This is called for every message the bot sees so serve it from memory when we can
+        if (cached := self._prefix_cache.get(guild_id)) is not None:
+            return cached
+
+        # noinspection PyBroadException
+        try:
+            # Try to grab the prefixes from the db, raise an error on failure
+            # and bailout, we cant respond to anything at the moment
+            prefixes = await bot.custom_prefix_route.get_custom_prefixes(
+                guild_id, raise_on_error=True
+            )
+        except Exception as e:
+            log.error("Custom prefix request failed with error: {error}", error=e)
+
+            # Keep responding with the last known prefixes while the api is unavailable
+            if (stale := self._prefix_cache.get_stale(guild_id)) is not None:
+                return stale
+
+            raise PrefixRequestError("Requesting custom prefix from the api failed")
+
+        self._prefix_cache.set(guild_id, prefixes)
+        return prefixes
@@ -0,0 +1,79 @@
+import aiohttp
+import discord
+
+from bot.api.designated_channel_route import DesignatedChannelRoute
+from bot.consts import DesignatedChannelBase
+from bot.errors import ApiClientRequestError
+from bot.messaging.events import Events
+from bot.messaging.messenger import Messenger
+from bot.utils.cache import TtlCache
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+# How long in seconds a guilds designated channel mappings are served from memory,
+# this bounds staleness for channels registered outside the bot (E.G the website)
+DESIGNATED_CHANNEL_CACHE_TTL = 300
+
+
+class DesignatedChannelRegistry:
+    """
+    In memory registry of every designated channel mapping in a guild
+
+    A guilds mappings are requested from ClemBot.Api once and then served from memory
+    until they expire or are invalidated by an on_designated_channels_changed event
+    """
+
+    def __init__(self, messenger: Messenger, route: DesignatedChannelRoute) -> None:
+        self._route = route
+        self._mappings = TtlCache[int, dict[str, list[int]]](
+            ttl=DESIGNATED_CHANNEL_CACHE_TTL, keep_expired=True, name="designated_channels"
+        )
+
+        messenger.subscribe(
+            Events.on_designated_channels_changed, self.on_designated_channels_changed
+        )
+        messenger.subscribe(Events.on_guild_channel_delete, self.on_guild_channel_delete)
+
+    async def on_designated_channels_changed(self, guild_id: int) -> None:
+        self._mappings.invalidate(guild_id)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        # A deleted channel is removed from all of its designations by the api
+        self._mappings.invalidate(channel.guild.id)
+
+    async def get_channel_ids(
+        self, guild_id: int, designation: DesignatedChannelBase | str
+    ) -> list[int]:
+        """
+        Gets the ids of all channels registered to a given designation in a guild
+
+        Args:
+            guild_id (int): The guild to get the registered channels of
+            designation (DesignatedChannelBase | str): The designated channel to look up
+        """
+        name = designation if isinstance(designation, str) else designation.name
+        return (await self.get_all(guild_id)).get(name, [])
+
+    async def get_all(self, guild_id: int) -> dict[str, list[int]]:
+        if (mappings := self._mappings.get(guild_id)) is not None:
+            return mappings
+
+        try:
+            mappings = await self._route.get_guild_all_designated_channels(
+                guild_id, raise_on_error=True
+            )
+        except (aiohttp.ClientResponseError, ApiClientRequestError, ConnectionError) as e:
+            # Don't cache a failed request, that would hide every designated channel
+            # in the guild until the entry expired
+            log.error(
+                "Requesting designated channels for guild {guild} failed with error: {error}",
+                guild=guild_id,
+                error=e,
+            )
+
+            # Fall back to the last known mappings while the api is unavailable
+            return self._mappings.get_stale(guild_id) or {}
+
+        self._mappings.set(guild_id, mappings)
+        return mappings
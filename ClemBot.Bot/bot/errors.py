@@ -74,6 +74,12 @@ class ApiClientRequestError(Exception):
         self.message = message
 
 
+class ApiCircuitOpenError(ApiClientRequestError):
+    """
+    Raised instead of sending a request while ClemBot.Api is failing
+    """
+
+
 class BotOnlyRequestError(Exception):
     def __init__(self, message: str):
         self.message = message
@@ -269,6 +269,17 @@ class EventsMeta(type):
         """
         return "on_add_designated_channel"
 
+    @property
+    def on_designated_channels_changed(self) -> str:
+        """
+        Published whenever a channel is registered to or deleted from a designated channel in a guild
+
+        Args:
+
+            guild_id (int) The id of the guild whose designated channels changed
+        """
+        return "on_designated_channels_changed"
+
     @property
     def on_send_in_designated_channel(self) -> str:
         """
@@ -549,6 +560,16 @@ class EventsMeta(type):
         """
         return "on_claims_check"
 
+    @property
+    def on_guild_tags_changed(self) -> str:
+        """
+        Published when a tag or the tag prefix in a guild is created, edited, deleted or transferred
+
+        Args:
+            guild_id (int): The id of the guild whose tags changed
+        """
+        return "on_guild_tags_changed"
+
 
 class Events(metaclass=EventsMeta):
     pass
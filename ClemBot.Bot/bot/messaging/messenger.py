@@ -1,5 +1,6 @@
 import asyncio
 import dataclasses
+import enum
 import inspect
 import traceback
 import typing as t
@@ -9,12 +10,80 @@ from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
 
+# The max number of events that can be waiting in a single guilds event queue
+GUILD_QUEUE_MAX_SIZE = 5000
+
+# How long in seconds a guilds event queue can sit empty before its queue and dispatch task are removed,
+# they are recreated the next time an event is published for that guild
+GUILD_QUEUE_IDLE_TIMEOUT = 600
+
+# The number of workers that dispatch guild events when using the worker pool dispatcher
+GUILD_QUEUE_WORKER_COUNT = 8
+
+
+class DispatchMode(enum.Enum):
+    """Defines how a listener is invoked when its event is published"""
+
+    # Awaited one after another in subscription order, this is the default
+    serial = enum.auto()
+
+    # Awaited at the same time as the serial listeners and the other concurrent listeners
+    concurrent = enum.auto()
+
+    # Scheduled in the background without being awaited by the publisher,
+    # exceptions are reported to the messengers error callback
+    fire_and_forget = enum.auto()
+
+
+class OverflowPolicy(enum.Enum):
+    """Defines what happens when an event is published to a guild queue that is full"""
+
+    # Wait for the queue to have room, applying backpressure to the publisher
+    block = enum.auto()
+
+    # Discard the event being published
+    drop_newest = enum.auto()
+
+    # Discard the oldest event waiting in the queue to make room for the new one
+    drop_oldest = enum.auto()
+
+
+class QueueDispatcher(enum.Enum):
+    """Defines how events in the guild event queues are dispatched"""
+
+    # Every guild queue gets its own dispatch task
+    per_guild = enum.auto()
+
+    # A fixed pool of workers takes turns dispatching one event at a time from each guild queue
+    # with pending events, this caps how many queued events are dispatched at once
+    worker_pool = enum.auto()
+
+
+@dataclasses.dataclass
+class QueueStats:
+    """Point in time metrics of the messengers guild event queues"""
+
+    active_queues: int
+    total_depth: int
+    max_depth: int
+    dropped_events: int
+    coalesced_events: int
+    reaped_queues: int
+    depths: dict[int, int]
+
+
+@dataclasses.dataclass
+class Subscription:
+    ref: wr.ReferenceType[t.Any]
+    dispatch: DispatchMode = DispatchMode.serial
+
 
 @dataclasses.dataclass
 class QueuedEvent:
     name: str
     args: tuple[t.Any, ...]
     kwargs: dict[str, t.Any]
+    coalesce_key: tuple[int, str, t.Hashable] | None = None
 
 
 @dataclasses.dataclass
@@ -26,10 +95,39 @@ class DispatchQueue:
 class Messenger:
     """The global message bus that handles all application level events"""
 
-    def __init__(self, name: str | None = None):
+    def __init__(
+        self,
+        name: str | None = None,
+        *,
+        max_queue_size: int = GUILD_QUEUE_MAX_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.block,
+        idle_timeout: float | None = GUILD_QUEUE_IDLE_TIMEOUT,
+        dispatcher: QueueDispatcher = QueueDispatcher.per_guild,
+        worker_count: int = GUILD_QUEUE_WORKER_COUNT,
+    ):
         log.info("New messenger created with name: {name}", name=name)
         self.name = name
-        self._events = dict[str, list[wr.ReferenceType[t.Any]]]()
+        self._events = dict[str, list[Subscription]]()
+
+        # Guild event queue bounds, a max_queue_size of 0 means the queues are unbounded
+        # and an idle_timeout of None means idle queues are never removed
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.idle_timeout = idle_timeout
+
+        self.dispatcher = dispatcher
+        self.worker_count = worker_count
+
+        self._dropped_events = 0
+        self._coalesced_events = 0
+        self._reaped_queues = 0
+
+        # Coalescable events that are still waiting in a guild queue keyed by (guild, event, entity)
+        self._coalescable_events = dict[tuple[int, str, t.Hashable], QueuedEvent]()
+
+        # Number of publishers waiting for room in each full guild queue,
+        # a queue can't be removed while someone is waiting to put an event in it
+        self._pending_puts = dict[int, int]()
 
         # Error callback to report exceptions in queued events back to
         self.error_callback: t.Callable[..., t.Any] | None = None
@@ -38,25 +136,42 @@ class Messenger:
 
         self._queue_dispatch_tasks = dict[int, DispatchQueue]()
 
-    def subscribe(self, event: str, callback: t.Callable[..., t.Awaitable[t.Any]]) -> None:
+        # Worker pool dispatcher state, a guild is scheduled while it is waiting in
+        # the ready queue or being dispatched by a worker, never both
+        self._pool_workers = list[asyncio.Task[t.Any]]()
+        self._ready_guilds = asyncio.Queue[int]()
+        self._scheduled_guilds = set[int]()
+        self._pool_idle = asyncio.Event()
+        self._pool_idle.set()
+
+        # Strong references to running fire and forget listeners so they aren't garbage collected
+        self._detached_tasks = set[asyncio.Task[t.Any]]()
+
+    def subscribe(
+        self,
+        event: str,
+        callback: t.Callable[..., t.Awaitable[t.Any]],
+        dispatch: DispatchMode = DispatchMode.serial,
+    ) -> None:
         """Subscribes a method as a callback listener to a given event"""
         if not asyncio.iscoroutinefunction(callback):
             raise TypeError("A given messenger callback must be awaitable")
 
-        weak_ref = self.__get_weak_ref(callback)
+        subscription = Subscription(self.__get_weak_ref(callback), dispatch)
         if event in self._events.keys():
-            self._events[event].append(weak_ref)
+            self._events[event].append(subscription)
         else:
             log.info(
                 "Registering new event: {event} to Messenger: {name}",
                 event=str(event),
                 name=self.name,
             )
-            self._events[event] = [weak_ref]
+            self._events[event] = [subscription]
 
         log.info(
-            "Registering listener {callback} to event: {event} in Messenger: {name}",
-            callback=str(weak_ref.__callback__),
+            "Registering {dispatch} listener {callback} to event: {event} in Messenger: {name}",
+            dispatch=dispatch.name,
+            callback=str(subscription.ref.__callback__),
             event=str(event),
             name=self.name,
         )
@@ -72,17 +187,90 @@ class Messenger:
         log.info("Received published event: {event}", event=str(event))
         await self.__publish(event, *args, **kwargs)
 
+    async def publish_concurrent(
+        self, events: t.Iterable[str], *args: t.Any, **kwargs: t.Any
+    ) -> None:
+        """
+        Immediately publishes one or more events with the same args onto the global message bus,
+        invoking every listener of every event concurrently instead of one after another.
+        Bypasses the messenger guild event queue
+
+        All listeners are allowed to complete, then if any of them raised, the exception of the
+        listener that would have been invoked first by a serial publish is raised
+
+        Args:
+            events (Iterable[str]): The events to invoke the listeners on, in priority order
+        """
+        events = list(events)
+        log.info("Received concurrently published events: {events}", events=events)
+
+        listeners = []
+        for event in events:
+            for listener, dispatch in self.__get_listeners(event):
+                if dispatch is DispatchMode.fire_and_forget:
+                    self.__detach(listener, *args, **kwargs)
+                else:
+                    listeners.append(listener(*args, **kwargs))
+
+        await self.__gather(*listeners)
+
     async def publish_to_queue(
-        self, event: str, guild_id: int, *args: t.Any, **kwargs: t.Any
+        self,
+        event: str,
+        guild_id: int,
+        *args: t.Any,
+        coalesce_key: t.Hashable | None = None,
+        **kwargs: t.Any,
     ) -> None:
         """
         Publishes an event to listeners with given args onto the guild message queue
 
+        When a coalesce_key is given and an event with the same name and key is still waiting
+        in the guild queue the new event is merged into the waiting one instead of being queued.
+        The waiting event keeps its place in the queue and its first argument while the rest of its
+        arguments are replaced, for (before, after) update events this means the listener
+        sees the state before the first change and after the latest one
+
         Args:
             event (str): The event invoke the listeners on
+            guild_id (int): The guild queue to publish the event onto
+            coalesce_key (t.Hashable | None): The id of the entity the event is about
         """
         log.info("Received published to queue event: {event}", event=str(event))
-        await self.__add_to_queue(event, guild_id, *args, **kwargs)
+
+        if coalesce_key is not None:
+            key = (guild_id, event, coalesce_key)
+
+            if pending := self._coalescable_events.get(key):
+                log.info(
+                    "Coalescing event {event} for {key} into queued event on queue {queue}",
+                    event=event,
+                    key=str(coalesce_key),
+                    queue=guild_id,
+                )
+                pending.args = pending.args[:1] + args[1:]
+                pending.kwargs.update(kwargs)
+                self._coalesced_events += 1
+                return
+
+            await self.__add_to_queue(QueuedEvent(event, args, kwargs, key), guild_id)
+            return
+
+        await self.__add_to_queue(QueuedEvent(event, args, kwargs), guild_id)
+
+    def queue_stats(self) -> QueueStats:
+        """Gets the current depth of every active guild event queue along with lifetime counters"""
+        depths = {guild_id: queue.qsize() for guild_id, queue in self._guild_event_queue.items()}
+
+        return QueueStats(
+            active_queues=len(depths),
+            total_depth=sum(depths.values()),
+            max_depth=max(depths.values(), default=0),
+            dropped_events=self._dropped_events,
+            coalesced_events=self._coalesced_events,
+            reaped_queues=self._reaped_queues,
+            depths=depths,
+        )
 
     async def close(self) -> None:
         """
@@ -104,98 +292,283 @@ class Messenger:
             dispatch_task.cancelled = True
 
         # Wait for all dispatch tasks to exit gracefully
-        await asyncio.gather(*[task.task for task in self._queue_dispatch_tasks.values()])
+        await asyncio.gather(
+            *[task.task for task in self._queue_dispatch_tasks.values()], return_exceptions=True
+        )
 
         self._queue_dispatch_tasks.clear()
 
+        if self._pool_workers:
+            # Wait for the workers to drain every guild queue before stopping them
+            await self._pool_idle.wait()
+
+            for worker in self._pool_workers:
+                worker.cancel()
+
+            await asyncio.gather(*self._pool_workers, return_exceptions=True)
+            self._pool_workers.clear()
+
+        # Let any fire and forget listeners that are still running finish
+        await asyncio.gather(*self._detached_tasks, return_exceptions=True)
+
         log.info("All messenger tasks cancelled successfully")
 
     async def __publish(self, event: str, *args: t.Any, **kwargs: t.Any) -> None:
-        if event in self._events.keys():
-            listeners = self._events[event]
-            for i, sub in enumerate(listeners):
-                if sub._alive:  # type: ignore
-                    log.info(
-                        "Invoking listener: {sub} on event {event} in Messenger: {name}",
-                        sub=str(sub),
-                        event=str(event),
-                        name=self.name,
-                    )
-                    await sub()(*args, **kwargs)  # type: ignore
-                else:
-                    log.info(
-                        "Deleting dead reference in Event: {event} function: {sub}",
-                        event=str(event),
-                        sub=str(sub),
-                    )
-                    del listeners[i]
-
-    async def __add_to_queue(
-        self, event: str, guild_id: int, *args: t.Any, **kwargs: t.Any
+        serial = []
+        concurrent = []
+
+        for listener, dispatch in self.__get_listeners(event):
+            if dispatch is DispatchMode.fire_and_forget:
+                self.__detach(listener, *args, **kwargs)
+            elif dispatch is DispatchMode.concurrent:
+                concurrent.append(listener)
+            else:
+                serial.append(listener)
+
+        # Fast path, nothing opted into concurrent dispatch so there is nothing to gather
+        if not concurrent:
+            for listener in serial:
+                await listener(*args, **kwargs)
+            return
+
+        async def run_serial() -> None:
+            for listener in serial:
+                await listener(*args, **kwargs)
+
+        await self.__gather(run_serial(), *(listener(*args, **kwargs) for listener in concurrent))
+
+    async def __gather(self, *coros: t.Awaitable[t.Any]) -> None:
+        """
+        Awaits all given coroutines at the same time, then raises the exception
+        of the first one in argument order that raised
+        """
+        results = await asyncio.gather(*coros, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def __detach(
+        self, listener: t.Callable[..., t.Awaitable[t.Any]], *args: t.Any, **kwargs: t.Any
     ) -> None:
+        async def run_detached() -> None:
+            try:
+                await listener(*args, **kwargs)
+            except Exception as e:
+                # Nothing is awaiting this listener, so the error callback is the only place
+                # the exception can be reported
+                await self.__report_error(e)
+
+        task = asyncio.create_task(run_detached())
+        self._detached_tasks.add(task)
+        task.add_done_callback(self._detached_tasks.discard)
+
+    async def __report_error(self, e: Exception) -> None:
+        """Reports an exception to the error callback, must be called from inside an except block"""
+        # Check if we have an error callback to report the error too
+        if self.error_callback:
+            tb = traceback.format_exc()
+            # pylint: disable=E1102
+            await self.error_callback(e, traceback=tb)
+        else:
+            log.exception(
+                "No error callback set in messenger {messenger} for error {error}",
+                messenger=self.name,
+                error=e,
+            )
+
+    def __get_listeners(
+        self, event: str
+    ) -> list[tuple[t.Callable[..., t.Awaitable[t.Any]], DispatchMode]]:
+        """
+        Resolves the live listeners of an event and their dispatch modes in subscription order,
+        deleting any dead references that are found along the way
+        """
+        if event not in self._events.keys():
+            return []
+
+        listeners = []
+        alive = []
+        for sub in self._events[event]:
+            fn = sub.ref()
+            if fn is not None:
+                log.info(
+                    "Invoking listener: {sub} on event {event} in Messenger: {name}",
+                    sub=str(sub.ref),
+                    event=str(event),
+                    name=self.name,
+                )
+                listeners.append((fn, sub.dispatch))
+                alive.append(sub)
+            else:
+                log.info(
+                    "Deleting dead reference in Event: {event} function: {sub}",
+                    event=str(event),
+                    sub=str(sub.ref),
+                )
+
+        self._events[event][:] = alive
+        return listeners
+
+    async def __add_to_queue(self, complete_event: QueuedEvent, guild_id: int) -> None:
 
         # Check if the guild_id is the in the queue dict, if it's not we need to create the queue first
         if guild_id not in self._guild_event_queue:
             log.info("Creating guild event queue for guild {guild}", guild=guild_id)
-            self._guild_event_queue[guild_id] = asyncio.Queue[QueuedEvent]()
+            self._guild_event_queue[guild_id] = asyncio.Queue[QueuedEvent](
+                maxsize=self.max_queue_size
+            )
 
-            # Create the polling task to dispatch events
-            task = asyncio.create_task(self.__send_guild_queue(guild_id))
+            if self.dispatcher is QueueDispatcher.per_guild:
+                # Create the polling task to dispatch events
+                task = asyncio.create_task(self.__send_guild_queue(guild_id))
+
+                # Add the task to the dispatch task list, so we can stop it later
+                self._queue_dispatch_tasks[guild_id] = DispatchQueue(task=task)
+            elif not self._pool_workers:
+                self._pool_workers = [
+                    asyncio.create_task(self.__guild_queue_worker())
+                    for _ in range(self.worker_count)
+                ]
+
+        queue = self._guild_event_queue[guild_id]
+
+        if queue.full() and self.overflow_policy is not OverflowPolicy.block:
+            self._dropped_events += 1
+
+            if self.overflow_policy is OverflowPolicy.drop_newest:
+                log.warning(
+                    "Guild event queue {queue} is full, dropping new event {event}",
+                    queue=guild_id,
+                    event=complete_event.name,
+                )
+                return
 
-            # Add the task to the dispatch task list, so we can stop it later
-            self._queue_dispatch_tasks[guild_id] = DispatchQueue(task=task)
+            dropped = queue.get_nowait()
+            self.__release_coalescable(dropped)
+            log.warning(
+                "Guild event queue {queue} is full, dropping oldest event {event}",
+                queue=guild_id,
+                event=dropped.name,
+            )
 
-        size = self._guild_event_queue[guild_id].qsize()
         log.info(
             "Added event {event} to queue {queue} with new size {size}",
-            event=event,
+            event=complete_event.name,
             queue=guild_id,
-            size=size + 1,
+            size=queue.qsize() + 1,
         )
 
-        complete_event = QueuedEvent(event, args, kwargs)
+        # With the block policy this waits for room in the queue
+        if queue.full():
+            self._pending_puts[guild_id] = self._pending_puts.get(guild_id, 0) + 1
+            try:
+                await queue.put(complete_event)
+            finally:
+                self._pending_puts[guild_id] -= 1
+                if self._pending_puts[guild_id] == 0:
+                    del self._pending_puts[guild_id]
+        else:
+            queue.put_nowait(complete_event)
 
-        await self._guild_event_queue[guild_id].put(complete_event)
+        if complete_event.coalesce_key is not None:
+            self._coalescable_events[complete_event.coalesce_key] = complete_event
 
-    async def __send_guild_queue(self, guild_id: int) -> None:
+        if self.dispatcher is QueueDispatcher.worker_pool:
+            self.__schedule_guild(guild_id)
 
+    def __schedule_guild(self, guild_id: int) -> None:
+        if guild_id in self._scheduled_guilds:
+            return
+
+        self._scheduled_guilds.add(guild_id)
+        self._pool_idle.clear()
+        self._ready_guilds.put_nowait(guild_id)
+
+    async def __guild_queue_worker(self) -> None:
         # Loop infinitely to dispatch events
         while True:
-            event = await self._guild_event_queue[guild_id].get()
-            size = self._guild_event_queue[guild_id].qsize()
+            guild_id = await self._ready_guilds.get()
+            queue = self._guild_event_queue[guild_id]
 
-            log.info(
-                "Dispatching queued event: {event} on queue: {queue} new queue size: {size}",
-                event=event.name,
-                queue=guild_id,
-                size=size,
-            )
+            await self.__dispatch_queued_event(guild_id, queue, queue.get_nowait())
+
+            if queue.qsize() > 0:
+                # Go to the back of the line so every other guild with pending events gets a turn,
+                # this keeps one busy guild from starving the rest
+                self._ready_guilds.put_nowait(guild_id)
+                continue
+
+            self._scheduled_guilds.discard(guild_id)
+
+            # Queues are cheap to recreate, so drop them as soon as they are drained
+            if guild_id not in self._pending_puts:
+                del self._guild_event_queue[guild_id]
+                self._reaped_queues += 1
+
+            if not self._scheduled_guilds:
+                self._pool_idle.set()
+
+    async def __send_guild_queue(self, guild_id: int) -> None:
+        queue = self._guild_event_queue[guild_id]
+
+        # Loop infinitely to dispatch events
+        while True:
             try:
-                await self.__publish(event.name, *event.args, **event.kwargs)
-            except Exception as e:
-                # Check if we have an error callback to report the error too
-                if self.error_callback:
-                    # Notify the error callback of the exception and continue attempting to dispatch events
-                    # We don't want to raise the exception further than this because
-                    # That will exit our loop and cause no more events to be dispatched
-                    tb = traceback.format_exc()
-                    # pylint: disable=E1102
-                    await self.error_callback(e, traceback=tb)
-                else:
-                    log.exception(
-                        "No error callback set in messenger {messenger} for error {error}",
-                        messenger=self.name,
-                        error=e,
-                    )
+                event = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                # Nothing can be added to the queue between the timeout and here
+                # because there is no await in between, so it is safe to remove
+                if (
+                    queue.qsize() == 0
+                    and guild_id not in self._pending_puts
+                    and not self._queue_dispatch_tasks[guild_id].cancelled
+                ):
+                    self.__reap_guild_queue(guild_id)
+                    return
+                continue
+
+            await self.__dispatch_queued_event(guild_id, queue, event)
 
             # Check if the task has been cancelled AFTER we have attempted to dispatch all events
             # This is important for the tests to be deterministic
-            if (
-                self._queue_dispatch_tasks[guild_id].cancelled
-                and self._guild_event_queue[guild_id].qsize() == 0
-            ):
+            if self._queue_dispatch_tasks[guild_id].cancelled and queue.qsize() == 0:
                 return
 
+    async def __dispatch_queued_event(
+        self, guild_id: int, queue: asyncio.Queue[QueuedEvent], event: QueuedEvent
+    ) -> None:
+        # Once an event leaves the queue newer events can no longer be merged into it
+        self.__release_coalescable(event)
+
+        log.info(
+            "Dispatching queued event: {event} on queue: {queue} new queue size: {size}",
+            event=event.name,
+            queue=guild_id,
+            size=queue.qsize(),
+        )
+        try:
+            await self.__publish(event.name, *event.args, **event.kwargs)
+        except Exception as e:
+            # Notify the error callback of the exception and continue attempting to dispatch events
+            # We don't want to raise the exception further than this because
+            # That will exit our loop and cause no more events to be dispatched
+            await self.__report_error(e)
+
+    def __release_coalescable(self, event: QueuedEvent) -> None:
+        if event.coalesce_key is not None:
+            self._coalescable_events.pop(event.coalesce_key, None)
+
+    def __reap_guild_queue(self, guild_id: int) -> None:
+        log.info(
+            "Removing guild event queue {queue} after {timeout} idle seconds",
+            queue=guild_id,
+            timeout=self.idle_timeout,
+        )
+        del self._guild_event_queue[guild_id]
+        del self._queue_dispatch_tasks[guild_id]
+        self._reaped_queues += 1
+
     def __get_weak_ref(self, obj: t.Any) -> (wr.WeakMethod[t.Any] | wr.ReferenceType[t.Any]):
         """
         Get a weak reference to obj. If obj is a bound method, a WeakMethod
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from bot.models.clem_bot_model import ClemBotModel
 
 
@@ -18,3 +20,11 @@ class CommandStatusModel(ClemBotModel):
 
     disabled: bool
     silently_fail: bool | None
+
+
+class CommandInvocationModel(ClemBotModel):
+    command_name: str
+    guild_id: int
+    channel_id: int
+    user_id: int
+    time: datetime
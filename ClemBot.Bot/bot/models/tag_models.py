@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from bot.models.clem_bot_model import ClemBotModel
 
 
@@ -16,6 +18,14 @@ class TagDelete(ClemBotModel):
     content: str | None
 
 
+class TagUse(ClemBotModel):
+    guild_id: int
+    name: str
+    channel_id: int
+    user_id: int
+    time: datetime
+
+
 class TagInvoke(ClemBotModel):
     guildId: int
     name: str | None
@@ -3,6 +3,7 @@ import inspect
 import typing as t
 
 from bot.clem_bot import ClemBot
+from bot.messaging.messenger import DispatchMode
 
 
 class BaseService(abc.ABC):
@@ -21,7 +22,8 @@ class BaseService(abc.ABC):
             if hasattr(value, "__event_listener__"):
                 event = getattr(value, "__event_listener__")
             if event:
-                self.bot.messenger.subscribe(event, value)
+                dispatch = getattr(value, "__event_dispatch__", DispatchMode.serial)
+                self.bot.messenger.subscribe(event, value, dispatch)
 
     @abc.abstractmethod
     async def load_service(self) -> None:
@@ -31,8 +33,17 @@ class BaseService(abc.ABC):
         """
         pass
 
+    async def unload_service(self) -> None:
+        """
+        Optional method for services to handle on shutdown tasks,
+        E.G writing out anything still buffered in memory
+        """
+        pass
+
     @classmethod
-    def listener(cls, event: str | None = None) -> t.Callable[[t.Any], t.Any]:
+    def listener(
+        cls, event: str | None = None, *, dispatch: DispatchMode = DispatchMode.serial
+    ) -> t.Callable[[t.Any], t.Any]:
         """
         The method decorator to allow for service methods to be marked as a callback
         for application level events
@@ -40,6 +51,9 @@ class BaseService(abc.ABC):
         Args:
             event ([Str], optional): The event that the method is subscribing too.
             Defaults to None.
+            dispatch (DispatchMode, optional): How the method is invoked when the event is
+            published. Only opt out of serial dispatch if the method doesn't depend on any
+            other listener of the event. Defaults to DispatchMode.serial.
         """
 
         def wrapper(func: t.Any) -> t.Any:
@@ -49,6 +63,7 @@ class BaseService(abc.ABC):
             if not inspect.iscoroutinefunction(actual):
                 raise TypeError("Listener function must be a coroutine function.")
             actual.__event_listener__ = event or actual.__name__
+            actual.__event_dispatch__ = dispatch
 
             return func
 
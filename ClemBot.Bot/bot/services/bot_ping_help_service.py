@@ -4,6 +4,7 @@ import bot.bot_secrets as bot_secrets
 from bot.clem_bot import ClemBot
 from bot.consts import Colors
 from bot.messaging.events import Events
+from bot.messaging.messenger import DispatchMode
 from bot.services.base_service import BaseService
 from bot.utils.logging_utils import get_logger
 
@@ -24,7 +25,7 @@ class BotPingHelpService(BaseService):
         # <@!...> is still used sometimes for some reason?
         self.mention_strs = {f"<@{bot.user.id}>", f"<@!{bot.user.id}>"}
 
-    @BaseService.listener(Events.on_guild_message_received)
+    @BaseService.listener(Events.on_guild_message_received, dispatch=DispatchMode.concurrent)
     async def on_guild_message_received(self, message: discord.Message) -> None:
         # we only want to respond if the message is ONLY a ping to ClemBot
         if message.content not in self.mention_strs:
@@ -1,9 +1,12 @@
+from datetime import datetime
+
 import bot.extensions as ext
 import bot.utils.log_serializers as serializers
 from bot.clem_bot import ClemBot
 from bot.consts import Claims
 from bot.errors import CommandRestrictionError, SilentCommandRestrictionError
 from bot.messaging.events import Events
+from bot.models.command_models import CommandInvocationModel
 from bot.services.base_service import BaseService
 from bot.utils.logging_utils import get_logger
 
@@ -26,8 +29,14 @@ class CommandService(BaseService):
             user=serializers.log_user(ctx.author),
         )
 
-        await self.bot.commands_route.add_command_invocation(
-            ctx.command.qualified_name, ctx.guild.id, ctx.channel.id, ctx.author.id
+        self.bot.command_invocation_batcher.add(
+            CommandInvocationModel(
+                command_name=ctx.command.qualified_name,
+                guild_id=ctx.guild.id,
+                channel_id=ctx.channel.id,
+                user_id=ctx.author.id,
+                time=datetime.utcnow(),
+            )
         )
 
     @BaseService.listener(Events.on_restrictions_check)
@@ -34,10 +34,8 @@ class DesignatedChannelService(BaseService):
             content (Union[str, discord.Embed]): The message to send
             dc_id [optional] (int) an optional callback id to associate sent dc messages at the publish site
         """
-        assigned_channel_ids = (
-            await self.bot.designated_channel_route.get_guild_designated_channel_ids(
-                guild_id, designated_name.name
-            )
+        assigned_channel_ids = await self.bot.designated_channel_registry.get_channel_ids(
+            guild_id, designated_name
         )
 
         if assigned_channel_ids is None:
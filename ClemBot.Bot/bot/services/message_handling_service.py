@@ -1,15 +1,23 @@
+import asyncio
 import datetime
 import json
+import os
 import re
+import typing as t
+import uuid
 from typing import Iterable
 
+import aiohttp
 import discord
 
 import bot.bot_secrets as bot_secrets
 import bot.utils.log_serializers as serializers
+from bot.api.api_client import UNAVAILABLE_STATUSES
 from bot.clem_bot import ClemBot
 from bot.consts import Colors, DesignatedChannels, OwnerDesignatedChannels
+from bot.errors import ApiClientRequestError
 from bot.messaging.events import Events
+from bot.messaging.messenger import DispatchMode
 from bot.models.message_models import SingleBatchMessage, SingleBatchMessageEdit
 from bot.services.base_service import BaseService
 from bot.utils.logging_utils import get_logger
@@ -19,6 +27,21 @@ log = get_logger(__name__)
 MESSAGE_BATCH_SIZE = 20
 MAX_QUOTED_CONTENT_SIZE = 1021  # 1024 - 3 (for content + '...')
 
+# How long in seconds a message can wait in a batch before the batch is sent,
+# this stops messages in quiet guilds from sitting in memory indefinitely
+MESSAGE_BATCH_MAX_AGE = 30
+
+# Errors that mean the api couldn't be reached rather than that it rejected the batch,
+# only batches that failed with these are spilled to bot_secrets.secrets.message_spill_file
+# and resent once the api accepts a batch again. Unavailable responses from a proxy in
+# front of the api are spillable too, see _is_spillable
+SPILLABLE_ERRORS = (ConnectionError, ApiClientRequestError)
+
+BATCH_CREATE = "create"
+BATCH_EDIT = "edit"
+
+BatchItem = SingleBatchMessage | SingleBatchMessageEdit
+
 
 class MessageHandlingService(BaseService):
     def __init__(self, *, bot: ClemBot):
@@ -26,6 +49,12 @@ class MessageHandlingService(BaseService):
         self.message_batch = dict[int, SingleBatchMessage]()
         self.message_edit_batch = list[SingleBatchMessageEdit]()
 
+        # Ids of the scheduled max age flushes of each batch
+        self._message_flush_id: uuid.UUID | None = None
+        self._message_edit_flush_id: uuid.UUID | None = None
+
+        self._replaying_spill = False
+
     async def batch_send_message(self, message: discord.Message) -> None:
         """
         Batch the messages to send them all at once to
@@ -34,15 +63,6 @@ class MessageHandlingService(BaseService):
 
         assert message.guild is not None
 
-        if len(self.message_batch) > MESSAGE_BATCH_SIZE:
-            # Copy the list values and clear the batch list BEFORE
-            # we send them. This way we can accept new messages while
-            # the current batch is being sent
-            batch_values = list(self.message_batch.values())
-            self.message_batch.clear()
-
-            await self.bot.message_route.batch_create_message(batch_values, raise_on_error=False)
-
         # We only want to save a message if a guild has the message log enabled
         # otherwise its useless requests
         if not await self.should_save_message(message.guild.id):
@@ -62,6 +82,13 @@ class MessageHandlingService(BaseService):
             time=datetime.datetime.utcnow(),
         )
 
+        if len(self.message_batch) >= MESSAGE_BATCH_SIZE:
+            await self.flush_message_batch()
+        elif self._message_flush_id is None:
+            self._message_flush_id = self.bot.scheduler.schedule_in(
+                self._scheduled_flush_message_batch(), time=MESSAGE_BATCH_MAX_AGE
+            )
+
     async def batch_send_message_edit(self, id: int, guild_id: int, content: str) -> None:
         """
         Batch the message edits to send them all at once to
@@ -72,15 +99,6 @@ class MessageHandlingService(BaseService):
             self.message_batch[message.id].content = content
             return
 
-        if len(self.message_edit_batch) > MESSAGE_BATCH_SIZE:
-            # Copy the list and clear the batch edit list BEFORE
-            # we send them. This way we can accept new message edits while
-            # the current batch is being sent
-            batch_values = list(self.message_edit_batch)
-            self.message_edit_batch.clear()
-
-            await self.bot.message_route.batch_edit_message(batch_values, raise_on_error=False)
-
         # We only want to save a message if a guild has the message log enabled
         # otherwise its useless requests
         if not await self.should_save_message(guild_id):
@@ -96,13 +114,141 @@ class MessageHandlingService(BaseService):
             SingleBatchMessageEdit(id=id, content=content, time=datetime.datetime.utcnow())
         )
 
+        if len(self.message_edit_batch) >= MESSAGE_BATCH_SIZE:
+            await self.flush_message_edit_batch()
+        elif self._message_edit_flush_id is None:
+            self._message_edit_flush_id = self.bot.scheduler.schedule_in(
+                self._scheduled_flush_message_edit_batch(), time=MESSAGE_BATCH_MAX_AGE
+            )
+
+    async def flush_message_batch(self) -> None:
+        self._cancel_scheduled_flush(self._message_flush_id)
+        self._message_flush_id = None
+
+        if not self.message_batch:
+            return
+
+        # Copy the values and clear the batch BEFORE we send them.
+        # This way we can accept new messages while the current batch is being sent
+        batch = list(self.message_batch.values())
+        self.message_batch.clear()
+
+        await self._send_batch(BATCH_CREATE, batch)
+
+    async def flush_message_edit_batch(self) -> None:
+        self._cancel_scheduled_flush(self._message_edit_flush_id)
+        self._message_edit_flush_id = None
+
+        if not self.message_edit_batch:
+            return
+
+        batch = list(self.message_edit_batch)
+        self.message_edit_batch.clear()
+
+        await self._send_batch(BATCH_EDIT, batch)
+
+    async def _scheduled_flush_message_batch(self) -> None:
+        # Forget the id first so the flush doesn't cancel the task it is running in
+        self._message_flush_id = None
+        await self.flush_message_batch()
+
+    async def _scheduled_flush_message_edit_batch(self) -> None:
+        self._message_edit_flush_id = None
+        await self.flush_message_edit_batch()
+
+    def _cancel_scheduled_flush(self, flush_id: uuid.UUID | None) -> None:
+        if flush_id is not None and flush_id in self.bot.scheduler:
+            self.bot.scheduler.cancel(flush_id)
+
+    async def _post_batch(self, kind: str, batch: t.Sequence[BatchItem]) -> None:
+        if kind == BATCH_CREATE:
+            await self.bot.message_route.batch_create_message(
+                t.cast(list[SingleBatchMessage], batch), raise_on_error=True
+            )
+        else:
+            await self.bot.message_route.batch_edit_message(
+                t.cast(list[SingleBatchMessageEdit], batch), raise_on_error=True
+            )
+
+    async def _send_batch(self, kind: str, batch: t.Sequence[BatchItem]) -> None:
+        try:
+            await self._post_batch(kind, batch)
+        except Exception as e:
+            if _is_spillable(e):
+                log.error(
+                    "Sending {kind} batch of {size} messages failed with error: {error}",
+                    kind=kind,
+                    size=len(batch),
+                    error=e,
+                )
+
+                if spill_file := bot_secrets.secrets.message_spill_file:
+                    await asyncio.to_thread(_spill_batch, spill_file, kind, batch)
+
+                return
+
+            # The api rejected the batch, sending it again would fail the same way
+            log.error(
+                "Dropping {kind} batch of {size} messages rejected with error: {error}",
+                kind=kind,
+                size=len(batch),
+                error=e,
+            )
+            return
+
+        # The api is accepting batches, resend anything that was spilled while it wasn't
+        await self.replay_spilled_batches()
+
+    async def replay_spilled_batches(self) -> None:
+        spill_file = bot_secrets.secrets.message_spill_file
+        if not spill_file or self._replaying_spill:
+            return
+
+        self._replaying_spill = True
+        try:
+            entries = await asyncio.to_thread(_take_spilled_batches, spill_file)
+
+            if not entries:
+                return
+
+            log.info("Replaying {count} spilled message batches", count=len(entries))
+
+            while entries:
+                kind, batch = entries[0]
+
+                try:
+                    await self._post_batch(kind, batch)
+                except Exception as e:
+                    if _is_spillable(e):
+                        # The api went away again, keep the rest for the next replay
+                        log.error(
+                            "Replaying spilled message batches stopped with {count} left: {error}",
+                            count=len(entries),
+                            error=e,
+                        )
+                        return
+
+                    log.error(
+                        "Dropping spilled {kind} batch of {size} messages rejected with error: {error}",
+                        kind=kind,
+                        size=len(batch),
+                        error=e,
+                    )
+
+                # Remove each batch as soon as it is handled so a crash mid replay
+                # doesn't resend the ones that already went through
+                entries.pop(0)
+                await asyncio.to_thread(_write_replay_file, spill_file, entries)
+        finally:
+            self._replaying_spill = False
+
     async def should_save_message(self, guild_id: int) -> bool:
-        channels = await self.bot.designated_channel_route.get_guild_designated_channel_ids(
-            guild_id, DesignatedChannels.message_log.name
+        channels = await self.bot.designated_channel_registry.get_channel_ids(
+            guild_id, DesignatedChannels.message_log
         )
         return len(channels) > 0
 
-    @BaseService.listener(Events.on_guild_message_received)
+    @BaseService.listener(Events.on_guild_message_received, dispatch=DispatchMode.concurrent)
     async def on_guild_message_received(self, message: discord.Message) -> None:
         assert message.guild is not None
 
@@ -458,4 +604,80 @@ class MessageHandlingService(BaseService):
         return (string[i : i + n] for i in range(0, len(string), n))
 
     async def load_service(self) -> None:
-        pass
+        # Resend batches spilled before the last shutdown
+        await self.replay_spilled_batches()
+
+    async def unload_service(self) -> None:
+        await self.flush_message_batch()
+        await self.flush_message_edit_batch()
+
+
+def _is_spillable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in UNAVAILABLE_STATUSES
+
+    return isinstance(error, SPILLABLE_ERRORS)
+
+
+def _serialize_batch(kind: str, batch: t.Sequence[BatchItem]) -> str:
+    return json.dumps({"kind": kind, "messages": [m.dict() for m in batch]}, default=str)
+
+
+def _spill_batch(path: str, kind: str, batch: t.Sequence[BatchItem]) -> None:
+    with open(path, "a") as f:
+        f.write(_serialize_batch(kind, batch))
+        f.write("\n")
+
+
+def _write_replay_file(path: str, entries: list[tuple[str, list[BatchItem]]]) -> None:
+    """Replaces the replay file with the entries that are left to replay"""
+    replay_path = f"{path}.replay"
+
+    if not entries:
+        os.remove(replay_path)
+        return
+
+    # Write to a temp file first so a crash mid write can't truncate the replay file
+    tmp_path = f"{replay_path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(f"{_serialize_batch(kind, batch)}\n" for kind, batch in entries)
+
+    os.replace(tmp_path, replay_path)
+
+
+def _take_spilled_batches(path: str) -> list[tuple[str, list[BatchItem]]]:
+    # Move spilled batches to a replay file so batches spilled during the replay
+    # aren't lost, a replay file left by a crash mid replay is picked up again
+    replay_path = f"{path}.replay"
+
+    if os.path.exists(path):
+        with open(path) as src, open(replay_path, "a") as dst:
+            dst.write(src.read())
+        os.remove(path)
+
+    if not os.path.exists(replay_path):
+        return []
+
+    with open(replay_path) as f:
+        lines = [line for line in f.read().splitlines() if line]
+
+    if not lines:
+        os.remove(replay_path)
+        return []
+
+    models: dict[str, type[BatchItem]] = {
+        BATCH_CREATE: SingleBatchMessage,
+        BATCH_EDIT: SingleBatchMessageEdit,
+    }
+
+    entries = list[tuple[str, list[BatchItem]]]()
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            model = models[entry["kind"]]
+            entries.append((entry["kind"], [model(**m) for m in entry["messages"]]))
+        except Exception as e:
+            # A partially written line from a crash can't be recovered, don't let it block the rest
+            log.error("Skipping malformed spilled message batch with error: {error}", error=e)
+
+    return entries
@@ -7,17 +7,25 @@ import bot.utils.log_serializers as serializers
 from bot.clem_bot import ClemBot
 from bot.consts import Colors, DesignatedChannels, Infractions, Moderation
 from bot.messaging.events import Events
+from bot.models.moderation_models import Infraction
 from bot.services.base_service import BaseService
-from bot.utils.helpers import format_datetime
+from bot.utils.helpers import format_datetime, gather_bounded
 from bot.utils.logging_utils import get_logger
+from bot.utils.scheduler import TIMER_LOAD_HORIZON, TIMER_LOAD_INTERVAL
 
 log = get_logger(__name__)
 
+# The max number of guilds whose infractions are fetched at once if the bulk fetch fails
+INFRACTION_FETCH_CONCURRENCY = 8
+
 
 class ModerationService(BaseService):
     def __init__(self, *, bot: ClemBot):
         super().__init__(bot)
 
+        # Ids of the mutes with a scheduled unmute
+        self._scheduled_mutes = set[int]()
+
     @BaseService.listener(Events.on_bot_warn)
     async def on_bot_warn(
         self, guild: discord.Guild, author: discord.Member, subject: discord.Member, reason: str
@@ -78,9 +86,9 @@ class ModerationService(BaseService):
             log.error("Creating mute failed in guild: {guild_id}", guild_id=guild.id)
             return None
 
-        self.bot.scheduler.schedule_at(
-            self._unmute_callback(guild.id, subject.id, mute_id), time=duration
-        )
+        # Mutes past the horizon are scheduled by a later horizon load
+        if duration <= datetime.utcnow() + TIMER_LOAD_HORIZON:
+            self._schedule_unmute(guild.id, subject.id, mute_id, duration)
 
     @BaseService.listener(Events.on_bot_unmute)
     async def on_bot_unmute(
@@ -249,18 +257,72 @@ class ModerationService(BaseService):
             Events.on_bot_unmute, guild_id, user_id, mute_id, "Mute Time Expired"
         )
 
+    def _schedule_unmute(
+        self, guild_id: int, subject_id: int, mute_id: int, duration: datetime
+    ) -> None:
+        callback = self._scheduled_unmute_callback(guild_id, subject_id, mute_id)
+
+        # Mutes that expired while we were offline are caught up in the background
+        if duration <= datetime.utcnow():
+            self.bot.scheduler.schedule_overdue(callback)
+        else:
+            self.bot.scheduler.schedule_at(callback, time=duration)
+
+        self._scheduled_mutes.add(mute_id)
+
+    async def _scheduled_unmute_callback(self, guild_id: int, user_id: int, mute_id: int) -> None:
+        try:
+            await self._unmute_callback(guild_id, user_id, mute_id)
+        finally:
+            self._scheduled_mutes.discard(mute_id)
+
+    async def load_horizon(self) -> None:
+        """Schedules the unmute of every active mute expiring within the load horizon"""
+        horizon = datetime.utcnow() + TIMER_LOAD_HORIZON
+        guild_ids = {g.id for g in self.bot.guilds}
+
+        for mute in await self._get_active_mutes(horizon):
+            # Skip mutes in guilds we have left since they were given
+            if mute.guild_id not in guild_ids or mute.id in self._scheduled_mutes:
+                continue
+
+            assert mute.duration is not None
+
+            # Older apis ignore the window and send every active infraction
+            if mute.duration > horizon:
+                continue
+
+            self._schedule_unmute(mute.guild_id, mute.subject_id, mute.id, mute.duration)
+
+    async def _load_horizon_periodically(self) -> None:
+        try:
+            await self.load_horizon()
+        finally:
+            self.bot.scheduler.schedule_in(
+                self._load_horizon_periodically(), time=TIMER_LOAD_INTERVAL.total_seconds()
+            )
+
     async def load_service(self) -> None:
-        for guild in self.bot.guilds:
-            mutes = await self.bot.moderation_route.get_guild_infractions(guild.id)
+        # Only mutes expiring soon are held in memory, the rest are
+        # loaded as they come within the horizon
+        await self.load_horizon()
+
+        self.bot.scheduler.schedule_in(
+            self._load_horizon_periodically(), time=TIMER_LOAD_INTERVAL.total_seconds()
+        )
 
-            for mute in (m for m in mutes if m.type == Infractions.mute and m.active):
+    async def _get_active_mutes(self, before: datetime) -> list[Infraction]:
+        route = self.bot.moderation_route
+        infractions = await route.get_active_timed_infractions(before=before)
 
-                assert mute.duration is not None
+        if infractions is None:
+            log.warning("Fetching active infractions in bulk failed, fetching each guilds instead")
+
+            per_guild = await gather_bounded(
+                self.bot.guilds,
+                lambda g: route.get_guild_infractions(g.id),
+                limit=INFRACTION_FETCH_CONCURRENCY,
+            )
+            infractions = [i for guild_infractions in per_guild for i in guild_infractions]
 
-                if (mute.duration - datetime.utcnow()).total_seconds() <= 0:
-                    await self._unmute_callback(guild.id, mute.subject_id, mute.id)
-                else:
-                    self.bot.scheduler.schedule_at(
-                        self._unmute_callback(guild.id, mute.subject_id, mute.id),
-                        time=mute.duration,
-                    )
+        return [i for i in infractions if i.type == Infractions.mute and i.active]
@@ -9,6 +9,7 @@ from bot.errors import ReminderError
 from bot.messaging.events import Events
 from bot.services.base_service import BaseService
 from bot.utils.logging_utils import get_logger
+from bot.utils.scheduler import TIMER_LOAD_HORIZON, TIMER_LOAD_INTERVAL
 
 log = get_logger(__name__)
 
@@ -54,8 +55,9 @@ class ReminderService(BaseService):
         if not reminder_id:
             raise ReminderError("Creating reminder failed")
 
-        task_id = self.bot.scheduler.schedule_at(self._reminder_callback(reminder_id), time=time)
-        self.reminders[reminder_id] = task_id
+        # Reminders past the horizon are scheduled by a later horizon load
+        if time <= datetime.utcnow() + TIMER_LOAD_HORIZON:
+            self._schedule_reminder(reminder_id, time)
 
     @BaseService.listener(Events.on_delete_reminder)
     async def on_delete_reminder(self, reminder_id: int) -> None:
@@ -65,18 +67,55 @@ class ReminderService(BaseService):
             log.warning("Attempted to delete nonexistent reminder: {id}", id=reminder_id)
             return None
 
-        self.bot.scheduler.cancel(self.reminders[reminder_id])
-        self.reminders.pop(reminder_id)
+        # Reminders past the horizon were never scheduled
+        task_id = self.reminders.pop(reminder_id, None)
+        if task_id is not None and task_id in self.bot.scheduler:
+            self.bot.scheduler.cancel(task_id)
+
+    def _schedule_reminder(self, reminder_id: int, time: datetime) -> None:
+        callback = self._scheduled_reminder_callback(reminder_id)
+
+        # Reminders that came due while we were offline are caught up in the background
+        if time <= datetime.utcnow():
+            self.reminders[reminder_id] = self.bot.scheduler.schedule_overdue(callback)
+        else:
+            self.reminders[reminder_id] = self.bot.scheduler.schedule_at(callback, time=time)
+
+    async def _scheduled_reminder_callback(self, reminder_id: int) -> None:
+        try:
+            await self._reminder_callback(reminder_id)
+        finally:
+            # Forget the reminder only once it is dispatched so a horizon load
+            # running at the same time doesn't schedule it again
+            self.reminders.pop(reminder_id, None)
+
+    async def load_horizon(self) -> None:
+        """Schedules every pending reminder due within the load horizon that isn't already"""
+        horizon = datetime.utcnow() + TIMER_LOAD_HORIZON
+        reminders = await self.bot.reminder_route.fetch_all_reminders(
+            before=horizon, raise_on_error=True
+        )
 
-    async def load_service(self) -> None:
-        reminders = await self.bot.reminder_route.fetch_all_reminders(raise_on_error=True)
         for reminder in reminders:
-            if (reminder.time - datetime.utcnow()).total_seconds() <= 0:
-                await self._reminder_callback(reminder.id)
-                await self.bot.reminder_route.dispatch_reminder(reminder.id)
+            # Older apis ignore the window and send every pending reminder
+            if reminder.id in self.reminders or reminder.time > horizon:
                 continue
 
-            task_id = self.bot.scheduler.schedule_at(
-                self._reminder_callback(reminder.id), time=reminder.time
+            self._schedule_reminder(reminder.id, reminder.time)
+
+    async def _load_horizon_periodically(self) -> None:
+        try:
+            await self.load_horizon()
+        finally:
+            self.bot.scheduler.schedule_in(
+                self._load_horizon_periodically(), time=TIMER_LOAD_INTERVAL.total_seconds()
             )
-            self.reminders[reminder.id] = task_id
+
+    async def load_service(self) -> None:
+        # Only reminders due soon are held in memory, the rest are
+        # loaded as they come within the horizon
+        await self.load_horizon()
+
+        self.bot.scheduler.schedule_in(
+            self._load_horizon_periodically(), time=TIMER_LOAD_INTERVAL.total_seconds()
+        )
@@ -28,7 +28,8 @@ class RoleHandlingService(BaseService):
             guild=serializers.log_guild(role.guild),
         )
 
-        await self.bot.role_route.remove_role(role.id, raise_on_error=True)
+        await self.bot.role_route.remove_role(role.id, role.guild.id, raise_on_error=True)
+        self.bot.claim_route.invalidate_guild_claims(role.guild.id)
 
     @BaseService.listener(Events.on_guild_role_update)
     async def on_role_update(self, before: discord.Role, after: discord.Role) -> None:
@@ -47,13 +48,24 @@ class RoleHandlingService(BaseService):
         )
 
         await self.bot.role_route.edit_role(
-            after.id, after.name, after.permissions.administrator, raise_on_error=True
+            after.id,
+            after.name,
+            after.permissions.administrator,
+            after.guild.id,
+            raise_on_error=True,
         )
+        self.bot.claim_route.invalidate_guild_claims(after.guild.id)
 
     @BaseService.listener(Events.on_user_join_initialized)
     async def add_auto_assigned_roles(self, member: discord.Member) -> None:
         roles = await self.bot.role_route.get_guilds_auto_assigned_roles(member.guild.id)
 
+        if roles is None:
+            log.warning(
+                "Failed to fetch auto assigned roles for guild: {guild}", guild=member.guild.id
+            )
+            return
+
         d_roles: list[discord.Role] = []
         for r in roles:
             d_role = member.guild.get_role(r.id)
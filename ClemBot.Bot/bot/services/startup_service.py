@@ -1,96 +1,247 @@
 import asyncio
 import os
+import time
+import typing as t
+
+import aiohttp
+import discord
 
 import bot.bot_secrets as bot_secrets
 from bot.clem_bot import ClemBot
+from bot.consts import Colors
+from bot.errors import ApiClientRequestError
 from bot.services.base_service import BaseService
+from bot.utils.guild_state import (
+    GuildFingerprints,
+    changed_entities,
+    fingerprint_guild,
+    save_fingerprints,
+    take_fingerprints,
+)
+from bot.utils.helpers import gather_bounded
 from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
 
+# The default max number of guilds reconciled with the api at once on startup,
+# overridden by bot_secrets.secrets.startup_sync_concurrency
+STARTUP_SYNC_CONCURRENCY = 8
+
+# The min number of seconds between progress reports of a startup stage
+STARTUP_PROGRESS_INTERVAL = 30
+
+T = t.TypeVar("T")
+
 
 class StartupService(BaseService):
     """
     Service to reload discord state into the database on restart
     this is to account for any leaves or joins, new roles, new channels etc
     that happened while the bot was offline
+
+    Fingerprints of the state each guild was last successfully synced with are kept in
+    bot_secrets.secrets.guild_fingerprint_file between restarts, so startup only uploads the
+    entity sets of guilds that changed since. Guilds are reconciled concurrently,
+    at most concurrency at a time
     """
 
-    def __init__(self, *, bot: ClemBot) -> None:
+    def __init__(self, *, bot: ClemBot, concurrency: int | None = None) -> None:
         super().__init__(bot)
+        self.concurrency = (
+            concurrency or bot_secrets.secrets.startup_sync_concurrency or STARTUP_SYNC_CONCURRENCY
+        )
+
+        # The fingerprints of the state the api confirmed for each guild, only these are
+        # saved so a failed sync or event update is retried on the next startup
+        self._synced_fingerprints: GuildFingerprints = {}
+
+        # Wall clock seconds each startup stage took
+        self._stage_timings = dict[str, float]()
+
+        # Seconds spent syncing each entity set summed across guilds
+        self._entity_timings = dict[str, float]()
+
+    async def load_guild(self, guild: discord.Guild) -> None:
+        try:
+            if await self.bot.guild_route.get_guild(guild.id):
+                return
+
+            log.info(f"Loading guild {guild.name}: {guild.id}")
+            assert guild.owner is not None
+            await self.bot.guild_route.add_guild(guild.id, guild.name, guild.owner.id)
+        except (ApiClientRequestError, ConnectionError) as e:
+            log.error(
+                "Loading guild {guild_id} failed with error: {error}", guild_id=guild.id, error=e
+            )
 
     async def load_guilds(self) -> None:
-        tasks = []
-        for guild in self.bot.guilds:
-            if not await self.bot.guild_route.get_guild(guild.id):
-                log.info(f"Loading guild {guild.name}: {guild.id}")
-                assert guild.owner is not None
-                tasks.append(
-                    asyncio.create_task(
-                        self.bot.guild_route.add_guild(guild.id, guild.name, guild.owner.id)
-                    )
-                )
-        await asyncio.gather(*tasks)
+        await self._run_stage("Guilds", self.load_guild)
 
     async def load_users(self) -> None:
         await self.bot.user_route.create_user_bulk(self.bot.users)
 
-    async def load_users_guilds(self) -> None:
-        for guild in self.bot.guilds:
-            await self.bot.guild_route.update_guild_users(guild)
+    async def sync_guild(self, guild: discord.Guild, stored: dict[str, str] | None) -> bool:
+        """
+        Uploads the entity sets of a guild that changed since its fingerprints were stored,
+        every set is uploaded if none were stored
+
+        Returns:
+            If anything was uploaded
+        """
+        current = fingerprint_guild(guild)
+        changed = changed_entities(current, stored)
+
+        # Unchanged sets were confirmed by the sync that stored their fingerprints,
+        # changed sets are only confirmed once the api accepts them
+        synced = {k: v for k, v in (stored or {}).items() if k in current and v == current[k]}
+        self._synced_fingerprints[guild.id] = synced
+
+        if not changed:
+            return False
+
+        log.info(
+            "Syncing {entities} of guild {guild}: {guild_id}",
+            entities=[e.name for e in changed],
+            guild=guild.name,
+            guild_id=guild.id,
+        )
+
+        try:
+            # Roles are synced before their user mappings because of the entity order
+            for entity in changed:
+                start = time.perf_counter()
+                await self.bot.guild_route.sync_guild_entity(guild, entity, raise_on_error=True)
+                synced[entity.name] = current[entity.name]
+                self._entity_timings[entity.name] = (
+                    self._entity_timings.get(entity.name, 0) + time.perf_counter() - start
+                )
+        except (ApiClientRequestError, ConnectionError, aiohttp.ClientResponseError) as e:
+            log.error(
+                "Syncing state of guild {guild_id} failed with error: {error}",
+                guild_id=guild.id,
+                error=e,
+            )
+            return False
+
+        return True
+
+    async def sync_guild_state(self, fingerprints: GuildFingerprints) -> None:
+        results = await self._run_stage(
+            "Guild State", lambda g: self.sync_guild(g, fingerprints.get(g.id))
+        )
+
+        log.info(
+            "Synced state of {synced} out of {total} guilds",
+            synced=sum(results),
+            total=len(results),
+        )
+
+    async def _run_stage(
+        self, name: str, func: t.Callable[[discord.Guild], t.Awaitable[T]]
+    ) -> list[T]:
+        guilds = list(self.bot.guilds)
+        start = time.perf_counter()
+        last_report = start
+        done = 0
+
+        async def run(guild: discord.Guild) -> T:
+            nonlocal done, last_report
+
+            result = await func(guild)
+            done += 1
+
+            now = time.perf_counter()
+            if now - last_report >= STARTUP_PROGRESS_INTERVAL and done < len(guilds):
+                last_report = now
+                await self._report_progress(
+                    f"{name}: {done}/{len(guilds)} guilds reconciled in {now - start:.1f}s"
+                )
 
-    async def load_roles(self) -> None:
-        for guild in self.bot.guilds:
-            await self.bot.guild_route.update_guild_roles(guild)
+            return result
 
-        for guild in self.bot.guilds:
-            await self.bot.guild_route.update_guild_role_user_mappings(guild)
+        log.info(
+            "Starting startup stage {stage} for {count} guilds with concurrency {concurrency}",
+            stage=name,
+            count=len(guilds),
+            concurrency=self.concurrency,
+        )
 
-    async def load_channels(self) -> None:
-        for guild in self.bot.guilds:
-            await self.bot.guild_route.update_guild_channels(guild)
+        results = await gather_bounded(guilds, run, limit=self.concurrency)
 
-    async def load_threads(self) -> None:
-        for guild in self.bot.guilds:
-            await self.bot.guild_route.update_guild_threads(guild)
+        self._stage_timings[name] = time.perf_counter() - start
+        log.info(
+            "Finished startup stage {stage} in {elapsed:.2f} seconds",
+            stage=name,
+            elapsed=self._stage_timings[name],
+        )
 
-    async def load_service(self) -> None:
+        return results
 
-        # The startup load is too heavy on prod to reset state everytime we restart,
-        # So we should only do this on dev bots. We rely on the 24/7 uptime of the bot to
-        # Keep the database in sync. Future solutions to this problem
-        # Should be heavily researched
-        if bool(os.environ.get("PROD")):
-            log.warning("Skipping internal state reset on prod deployment")
-            self.bot.is_starting_up = False
-            return
+    async def _report_progress(self, description: str, timings: bool = False) -> None:
+        embed = discord.Embed(
+            title="Startup Reconciliation  :arrows_counterclockwise:", color=Colors.ClemsonOrange
+        )
+        embed.description = description
+
+        if timings:
+            stages = "\n".join(f"{k}: {v:.2f}s" for k, v in self._stage_timings.items())
+            embed.add_field(name="Stages", value=stages or "None")
+
+            entities = "\n".join(f"{k}: {v:.2f}s" for k, v in self._entity_timings.items())
+            embed.add_field(name="Uploads (summed across guilds)", value=entities or "None")
 
+        # Progress reports are best effort, they shouldn't fail the startup
+        try:
+            await self.bot.send_startup_log_embed(embed)
+        except Exception as e:
+            log.error("Sending startup progress failed with error: {error}", error=e)
+
+    async def load_service(self) -> None:
         if bot_secrets.secrets.bot_only:
             log.warning("Skipping internal state reset in bot_only deployment")
             self.bot.is_starting_up = False
             return
 
-        log.info("Starting development bot startup internal state reset")
+        # Without stored fingerprints every guild is fully resynced, that is
+        # too heavy to do on every prod restart so only dev bots do it
+        fingerprint_file = bot_secrets.secrets.guild_fingerprint_file
+        if bool(os.environ.get("PROD")) and not fingerprint_file:
+            log.warning(
+                "Skipping internal state reset on prod deployment, "
+                "set GUILD_FINGERPRINT_FILE to enable incremental sync"
+            )
+            self.bot.is_starting_up = False
+            return
+
+        log.info("Starting bot startup internal state sync")
 
         # First load any new guilds so that we can reference them
         log.info("Resetting Guilds")
         await self.load_guilds()
 
-        # Load user guild relationships, takes every guild and sends a complete list of users to the backend
-        # to replace the current known state
-        log.info("Resetting User_Guilds state")
-        await self.load_users_guilds()
+        fingerprints: GuildFingerprints = {}
+        if fingerprint_file:
+            fingerprints = await asyncio.to_thread(take_fingerprints, fingerprint_file)
 
-        # Reset active roles, send all roles to the backend and delete any not present and add any that are new
-        log.info("Resetting Guild Roles state")
-        await self.load_roles()
+        # Send the users, roles, role mappings, channels and threads of every guild that changed
+        # while we were offline to the backend to replace its current known state
+        log.info("Syncing changed guild state")
+        await self.sync_guild_state(fingerprints)
 
-        # Reset active channels, send all channels to the backend and delete any not present and add any that are new
-        log.info("Resetting Guild Channels state")
-        await self.load_channels()
-
-        # Reset active threads, send all channels to the backend and delete any not present and add any that are new
-        log.info("Resetting Guild Threads state")
-        await self.load_threads()
+        await self._report_progress(
+            f"Reconciled {len(self.bot.guilds)} guilds with concurrency {self.concurrency}",
+            timings=True,
+        )
 
         self.bot.is_starting_up = False
+
+    async def unload_service(self) -> None:
+        fingerprint_file = bot_secrets.secrets.guild_fingerprint_file
+        if not fingerprint_file or bot_secrets.secrets.bot_only:
+            return
+
+        # Only what the startup sync confirmed is saved, changes made while running are
+        # sent by event handlers that can fail so those sets are checked again next startup
+        await asyncio.to_thread(save_fingerprints, fingerprint_file, self._synced_fingerprints)
+
+        log.info("Saved state fingerprints of {count} guilds", count=len(self._synced_fingerprints))
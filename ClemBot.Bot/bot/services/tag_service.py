@@ -1,5 +1,8 @@
+import asyncio
+import dataclasses
 import re
 import typing as t
+from datetime import datetime
 
 import discord
 
@@ -7,7 +10,10 @@ import bot.bot_secrets as bot_secrets
 import bot.utils.log_serializers as serializers
 from bot.clem_bot import ClemBot
 from bot.messaging.events import Events
+from bot.messaging.messenger import DispatchMode
+from bot.models.tag_models import TagUse
 from bot.services.base_service import BaseService
+from bot.utils.cache import TtlCache
 from bot.utils.helpers import chunk_sequence
 from bot.utils.logging_utils import get_logger
 
@@ -16,37 +22,69 @@ log = get_logger(__name__)
 TAG_PAGINATE_THRESHOLD = 500
 TAG_PREFIX_DEFAULT = "$"
 
+# How long in seconds a guilds tag index is trusted before it is reloaded,
+# this bounds staleness for tags changed outside the bot (E.G the website)
+TAG_INDEX_TTL = 300
+
+
+@dataclasses.dataclass
+class GuildTagIndex:
+    prefix: str
+    pattern: re.Pattern[str]
+    names: set[str]
+
 
 class TagService(BaseService):
     def __init__(self, *, bot: ClemBot):
         super().__init__(bot)
+        self._tag_indexes = TtlCache[int, GuildTagIndex](
+            ttl=TAG_INDEX_TTL, keep_expired=True, name="tag_index"
+        )
+
+    @BaseService.listener(Events.on_guild_tags_changed)
+    async def on_guild_tags_changed(self, guild_id: int) -> None:
+        self._tag_indexes.invalidate(guild_id)
 
-    @BaseService.listener(Events.on_guild_message_received)
+    @BaseService.listener(Events.on_guild_message_received, dispatch=DispatchMode.concurrent)
     async def on_guild_message_received(self, message: discord.Message) -> None:
-        tag_prefix: list[str] | str | None = await self.get_tag_prefixes(self.bot, message=message)
-        if tag_prefix is None:
+        if not message.guild:
             return
 
-        tag_prefix = tag_prefix[0]
+        index = await self.get_tag_index(message.guild.id)
+        if index is None:
+            return
 
-        tags_contents = []
+        # find all tag matches in the message content that are real tags in this guild,
+        # messages without any never have to touch the api
+        matches = [
+            match
+            for match in set(i[1] for i in index.pattern.findall(message.content))
+            if match.lower() in index.names
+        ]
 
-        # find all tag matches in the message content
-        pattern = re.compile(rf"(^|\s){re.escape(tag_prefix)}(\w+)")
-        for match in set(i[1] for i in pattern.findall(message.content)):
+        if not matches:
+            return
 
-            if not message.guild:
-                return
+        tags = await asyncio.gather(
+            *(self.bot.tag_route.get_tag(message.guild.id, match) for match in matches)
+        )
 
-            tag = await self.bot.tag_route.get_tag(message.guild.id, match)
+        tags_contents = []
 
+        for match, tag in zip(matches, tags):
             if not tag:
                 continue
 
             tags_contents.append(tag.content)
 
-            await self.bot.tag_route.add_tag_use(
-                message.guild.id, match, message.channel.id, message.author.id
+            self.bot.tag_use_batcher.add(
+                TagUse(
+                    guild_id=message.guild.id,
+                    name=match,
+                    channel_id=message.channel.id,
+                    user_id=message.author.id,
+                    time=datetime.utcnow(),
+                )
             )
 
             log.info(
@@ -89,31 +127,50 @@ class TagService(BaseService):
             Events.on_set_deletable, msg=msg, author=message.author, timeout=60
         )
 
-    async def get_tag_prefixes(self, bot: ClemBot, message: discord.Message) -> list[str] | None:
-        tag_prefixes = []
+    async def get_tag_index(self, guild_id: int) -> GuildTagIndex | None:
+        if (index := self._tag_indexes.get(guild_id)) is not None:
+            return index
 
-        assert message.guild is not None
+        tag_prefixes: list[str] = []
+        names = set[str]()
 
         # Check if bot is in BotOnly mode, if it is we cant get custom tag prefixes
         # so we have to fall back to self.default
         if not bot_secrets.secrets.bot_only:
             # noinspection PyBroadException
             try:
-                # Try to grab the tag prefixes from the db, raise an error on failure
+                # Try to grab the tag prefixes and tag names from the db, raise an error on failure
                 # and bailout, we cant respond to anything at the moment
-                tag_prefixes = await bot.custom_tag_prefix_route.get_custom_tag_prefixes(
-                    message.guild.id, raise_on_error=True
+                tag_prefixes, tags = await asyncio.gather(
+                    self.bot.custom_tag_prefix_route.get_custom_tag_prefixes(
+                        guild_id, raise_on_error=True
+                    ),
+                    self.bot.tag_route.get_guilds_tags(guild_id, raise_on_error=True),
                 )
             except Exception:
                 # if the api call fails for any reason then we bail out and return nothing
                 # so as to not spam the servers with error messages on every message.
-                # failing silently is preferable to that
-                return None
+                # failing silently is preferable to that, use the last known index if we have one
+                return self._tag_indexes.get_stale(guild_id)
+
+            names = {tag.name.lower() for tag in tags}
 
-        if len(tag_prefixes) == 0:
-            tag_prefixes = [TAG_PREFIX_DEFAULT]
+        prefix = tag_prefixes[0] if tag_prefixes else TAG_PREFIX_DEFAULT
+
+        index = GuildTagIndex(
+            prefix=prefix,
+            pattern=re.compile(rf"(^|\s){re.escape(prefix)}(\w+)"),
+            names=names,
+        )
+
+        log.info(
+            "Loaded tag index for guild {guild} with {count} tags",
+            guild=guild_id,
+            count=len(names),
+        )
 
-        return tag_prefixes
+        self._tag_indexes.set(guild_id, index)
+        return index
 
     async def load_service(self) -> None:
         pass
@@ -86,6 +86,7 @@ class UserHandlingService(BaseService):
             if not await self.bot.user_route.get_user(before.id):
                 # Possibly add them to the db if they don't exist
                 # For future enhancement
+                self.bot.claim_route.invalidate_user_claims(before.guild.id, before.id)
                 return
 
             log.info(
@@ -100,6 +101,9 @@ class UserHandlingService(BaseService):
             before.id, before.guild.id, [r.id for r in after.roles], raise_on_error=False
         )
 
+        # Claims are derived from roles, drop the cached claims only after the api has the new roles
+        self.bot.claim_route.invalidate_user_claims(before.guild.id, before.id)
+
     async def notify_user_join(self, user: discord.Member) -> None:
         embed = discord.Embed(title="New User Joined", color=Colors.ClemsonOrange)
         embed.add_field(name="Username", value=str(user))
@@ -0,0 +1,100 @@
+import asyncio
+import typing as t
+
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+T = t.TypeVar("T")
+
+# The default max number of items buffered before a batch is flushed
+BATCH_MAX_SIZE = 50
+
+# The default max number of seconds an item is buffered before its batch is flushed
+BATCH_FLUSH_INTERVAL = 10
+
+
+class WriteBehindBatcher(t.Generic[T]):
+    """
+    Buffers items in memory and writes them in batches off the callers critical path
+
+    A batch is flushed once it reaches max_size items or flush_interval seconds after its
+    first item was added, whichever comes first. Writes that fail are logged and dropped so this
+    should only be used for writes that are safe to lose, E.G analytics
+    """
+
+    def __init__(
+        self,
+        flush_callback: t.Callable[[list[T]], t.Awaitable[t.Any]],
+        *,
+        max_size: int = BATCH_MAX_SIZE,
+        flush_interval: float = BATCH_FLUSH_INTERVAL,
+        name: str | None = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("Batch max_size must be a positive number of items")
+
+        self.flush_callback = flush_callback
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.name = name
+
+        self._items = list[T]()
+        self._timer: asyncio.Task[None] | None = None
+        self._flushes = set[asyncio.Task[None]]()
+
+    def add(self, item: T) -> None:
+        """Buffers an item to be written with the next batch, this never waits on the write"""
+        self._items.append(item)
+
+        if len(self._items) >= self.max_size:
+            self.__flush_in_background()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self.__flush_later())
+
+    async def flush(self) -> None:
+        """Writes every buffered item now and waits for all in progress batches to finish"""
+        self.__flush_in_background()
+        await asyncio.gather(*self._flushes)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def __flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+
+        # Clear the timer first so flushing doesn't cancel the task we are running in
+        self._timer = None
+        self.__flush_in_background()
+
+    def __flush_in_background(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._items:
+            return
+
+        batch, self._items = self._items, list[T]()
+
+        task = asyncio.create_task(self.__write(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def __write(self, batch: list[T]) -> None:
+        log.info(
+            "Flushing batch of {size} items from batcher {name}", size=len(batch), name=self.name
+        )
+
+        try:
+            await self.flush_callback(batch)
+        except Exception as e:
+            log.error(
+                "Flushing batch of {size} items from batcher {name} failed with error: {error}",
+                size=len(batch),
+                name=self.name,
+                error=e,
+            )
@@ -0,0 +1,93 @@
+import time
+import typing as t
+
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+K = t.TypeVar("K", bound=t.Hashable)
+V = t.TypeVar("V")
+
+
+class TtlCache(t.Generic[K, V]):
+    """
+    A small in memory key value cache where every entry expires a fixed
+    number of seconds after it was written.
+
+    Expired entries are lazily dropped the next time they are read,
+    when a max_size is given the least recently used entry is evicted to make room for new ones.
+    With keep_expired expired entries are kept until they are replaced so get_stale can serve them
+    as a fallback when their source is unavailable
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        max_size: int | None = None,
+        keep_expired: bool = False,
+        name: str | None = None,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("Cache ttl must be a positive number of seconds")
+
+        if max_size is not None and max_size <= 0:
+            raise ValueError("Cache max_size must be a positive number of entries")
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.keep_expired = keep_expired
+        self.name = name
+        self._entries = dict[K, tuple[float, V]]()
+
+    def get(self, key: K) -> V | None:
+        """Returns the cached value for a key or None if it is missing or has expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            if not self.keep_expired:
+                del self._entries[key]
+            return None
+
+        if self.max_size is not None:
+            # Dicts keep insertion order, moving the entry to the end marks it most recently used
+            del self._entries[key]
+            self._entries[key] = entry
+
+        return value
+
+    def get_stale(self, key: K) -> V | None:
+        """Returns the cached value for a key even if it has expired or None if it is missing"""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Stores a value in the cache, restarting its ttl"""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, key: K) -> None:
+        """Drops a single key from the cache, does nothing if the key is not cached"""
+        if self._entries.pop(key, None) is not None:
+            log.info("Invalidated key {key} in cache {name}", key=str(key), name=self.name)
+
+    def invalidate_where(self, predicate: t.Callable[[K], bool]) -> None:
+        """Drops every key in the cache that matches a given predicate"""
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drops every entry in the cache"""
+        self._entries.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,91 @@
+import enum
+import time
+
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+# The default number of consecutive failures that open the circuit
+CIRCUIT_FAILURE_THRESHOLD = 5
+
+# The default number of seconds the circuit stays open before a trial request is let through
+CIRCUIT_RESET_TIMEOUT = 30
+
+
+class CircuitState(enum.Enum):
+    # Requests are let through normally
+    closed = enum.auto()
+
+    # Requests fail fast without being sent
+    open = enum.auto()
+
+    # A single trial request is let through to check if the dependency has recovered
+    half_open = enum.auto()
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of a dependency and stops callers from hammering it while it is down
+
+    The circuit opens after failure_threshold consecutive failures. Once reset_timeout seconds pass
+    a single trial request is allowed, its success closes the circuit and its failure reopens it
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        name: str | None = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.closed
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return CircuitState.half_open
+
+        return CircuitState.open
+
+    def allow_request(self) -> bool:
+        """Checks if a request should be sent, a True in the half open state claims the trial request"""
+        state = self.state
+
+        if state is CircuitState.half_open:
+            # Restart the timeout so everyone else keeps failing fast while the trial is in flight,
+            # if the trial never reports back another one is allowed after the timeout
+            log.info("Circuit {name} is half open, allowing a trial request", name=self.name)
+            self._opened_at = time.monotonic()
+            return True
+
+        return state is CircuitState.closed
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            log.info("Circuit {name} closed", name=self.name)
+
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+
+        if self._failures < self.failure_threshold:
+            return
+
+        if self._opened_at is None:
+            log.warning(
+                "Circuit {name} opened after {failures} consecutive failures",
+                name=self.name,
+                failures=self._failures,
+            )
+
+        self._opened_at = time.monotonic()
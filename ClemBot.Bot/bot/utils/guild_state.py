@@ -0,0 +1,106 @@
+import enum
+import hashlib
+import json
+import os
+import typing as t
+
+import discord
+
+from bot.utils.logging_utils import get_logger
+
+log = get_logger(__name__)
+
+Row = tuple[t.Any, ...]
+
+# The fingerprints of every synced entity of a guild, keyed by guild id then entity name
+GuildFingerprints = dict[int, dict[str, str]]
+
+
+class GuildEntity(enum.Enum):
+    """A set of guild state the api stores a full copy of"""
+
+    users = enum.auto()
+    roles = enum.auto()
+    role_user_mappings = enum.auto()
+    channels = enum.auto()
+    threads = enum.auto()
+
+
+_ROW_BUILDERS: dict[GuildEntity, t.Callable[[discord.Guild], t.Iterator[Row]]] = {
+    GuildEntity.users: lambda g: ((u.id, u.name) for u in g.members),
+    GuildEntity.roles: lambda g: ((r.id, r.name, r.permissions.administrator) for r in g.roles),
+    GuildEntity.role_user_mappings: lambda g: (
+        (role.id, user.id) for role in g.roles for user in role.members
+    ),
+    GuildEntity.channels: lambda g: ((c.id, c.name) for c in g.channels),
+    GuildEntity.threads: lambda g: ((c.id, c.name, c.parent_id) for c in g.threads),
+}
+
+
+def guild_rows(guild: discord.Guild, entity: GuildEntity) -> t.Iterator[Row]:
+    """Lazily gets the rows of a guilds entity set in the shape the api syncs them"""
+    return _ROW_BUILDERS[entity](guild)
+
+
+def fingerprint_rows(rows: t.Iterable[Row]) -> str:
+    """
+    Hashes a set of rows into a short fingerprint that doesn't depend on the order of the rows
+
+    Discord doesn't guarantee the order of members or channels between restarts, so each row is
+    hashed on its own and the hashes are summed instead of sorting every row of a large guild
+    """
+    total = 0
+    count = 0
+
+    for row in rows:
+        digest = hashlib.blake2b(repr(row).encode(), digest_size=16).digest()
+        total = (total + int.from_bytes(digest, "big")) % (1 << 128)
+        count += 1
+
+    return f"{count}:{total:032x}"
+
+
+def fingerprint_guild(guild: discord.Guild) -> dict[str, str]:
+    return {entity.name: fingerprint_rows(guild_rows(guild, entity)) for entity in GuildEntity}
+
+
+def changed_entities(current: dict[str, str], stored: dict[str, str] | None) -> list[GuildEntity]:
+    """
+    Compares a guilds current fingerprints, E.G from fingerprint_guild, with its stored ones
+
+    Returns:
+        The entity sets that changed, every set if nothing was stored
+    """
+    stored = stored or {}
+
+    return [e for e in GuildEntity if stored.get(e.name) != current[e.name]]
+
+
+def take_fingerprints(path: str) -> GuildFingerprints:
+    """
+    Reads the fingerprints stored at path and deletes the file
+
+    The file is only written on a clean shutdown, deleting it means a crash
+    can't leave fingerprints behind that no longer match what the api holds
+    """
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+        return {int(guild_id): dict(entities) for guild_id, entities in raw.items()}
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        log.error("Failed to read guild fingerprints at {path}: {error}", path=path, error=e)
+        return {}
+    finally:
+        os.remove(path)
+
+
+def save_fingerprints(path: str, fingerprints: GuildFingerprints) -> None:
+    # Write to a temp file first so a crash mid write can't leave a truncated file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({str(guild_id): e for guild_id, e in fingerprints.items()}, f)
+
+    os.replace(tmp_path, path)
@@ -1,6 +1,17 @@
+import asyncio
 import calendar
 from datetime import datetime
-from typing import Annotated, Generator, Iterator, Literal, Sequence, TypeVar
+from typing import (
+    Annotated,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Literal,
+    Sequence,
+    TypeVar,
+)
 
 import arrow
 from dateutil.relativedelta import relativedelta
@@ -8,6 +19,7 @@ from dateutil.relativedelta import relativedelta
 from bot.utils.converters import FutureDuration, PastDuration
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 def chunk_sequence(sequence: Sequence[T], chunk_size: int) -> Generator[Sequence[T], None, None]:
@@ -17,6 +29,25 @@ def chunk_sequence(sequence: Sequence[T], chunk_size: int) -> Generator[Sequence
         yield sequence[i : i + chunk_size]
 
 
+async def gather_bounded(
+    items: Iterable[T], func: Callable[[T], Awaitable[R]], *, limit: int
+) -> list[R]:
+    """
+    Awaits func for every item with at most limit running at once,
+    results are returned in the order of the items like asyncio.gather
+    """
+    if limit <= 0:
+        raise ValueError("Concurrency limit must be a positive number")
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(i) for i in items))
+
+
 def format_datetime(time: datetime) -> str:
     """
     Formats the given datetime to a string.
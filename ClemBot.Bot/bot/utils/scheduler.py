@@ -1,11 +1,15 @@
 import asyncio
+import collections
 import contextlib
+import dataclasses
+import functools
+import heapq
 import inspect
+import itertools
+import time as time_
 import typing as t
 import uuid
-from asyncio import Task
-from datetime import datetime
-from functools import partial
+from datetime import datetime, timedelta
 from typing import Optional
 
 from discord.ext.commands.errors import BadArgument
@@ -14,10 +18,73 @@ from bot.utils.logging_utils import get_logger
 
 log = get_logger(__name__)
 
+# The min number of cancelled timers left in the heap before it is compacted
+HEAP_COMPACT_THRESHOLD = 1024
+
+# The default max number of overdue callbacks run at once while catching up
+CATCH_UP_CONCURRENCY = 5
+
+# The default max number of overdue callbacks started per second while catching up,
+# they tend to hit discord (DMs, role changes) so bursts would just get rate limited
+CATCH_UP_RATE = 10
+
+# Long lived timers (reminders, mutes) are only loaded from the api once they are due within this
+TIMER_LOAD_HORIZON = timedelta(hours=24)
+
+# How often the next horizon of long lived timers is loaded, must be shorter than the horizon
+TIMER_LOAD_INTERVAL = timedelta(hours=1)
+
+
+@dataclasses.dataclass
+class ScheduledTimer:
+    id: uuid.UUID
+    # The time.monotonic() the callback is due at
+    when: float
+    callback: t.Coroutine[t.Any, t.Any, t.Any]
+
 
 class Scheduler:
-    def __init__(self) -> None:
-        self._scheduled_tasks: dict[t.Hashable, asyncio.Task[t.Any]] = {}
+    """
+    Runs callbacks at a later time
+
+    Pending timers live in a min heap ordered by when they are due, a single driver task
+    sleeps until the earliest one and starts its callback. Only callbacks that are
+    running have a task of their own so long lived timers like reminders and mutes are cheap
+
+    Callbacks that were due while the bot was offline are queued with schedule_overdue and
+    caught up in the background by at most catch_up_concurrency workers
+    """
+
+    def __init__(
+        self,
+        *,
+        catch_up_concurrency: int = CATCH_UP_CONCURRENCY,
+        catch_up_rate: float = CATCH_UP_RATE,
+    ) -> None:
+        if catch_up_concurrency <= 0 or catch_up_rate <= 0:
+            raise ValueError("Catch up concurrency and rate must be positive numbers")
+
+        self.catch_up_concurrency = catch_up_concurrency
+        self.catch_up_rate = catch_up_rate
+
+        # Timers that haven't fired yet keyed by their id
+        self._scheduled_tasks: dict[t.Hashable, ScheduledTimer] = {}
+
+        # Entries of (when, sequence, id), cancelled timers are left
+        # in the heap and skipped when they reach the top
+        self._heap: list[tuple[float, int, uuid.UUID]] = []
+        self._sequence = itertools.count()
+
+        self._driver: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._running = set[asyncio.Task[None]]()
+
+        # Ids of overdue timers waiting to be caught up, in the order they were queued
+        self._catch_up_queue = collections.deque[uuid.UUID]()
+        self._catch_up_workers = set[asyncio.Task[None]]()
+
+        # The earliest time.monotonic() the next overdue callback can start at
+        self._next_catch_up_start = 0.0
 
     def schedule_at(
         self, callback: t.Coroutine[t.Any, t.Any, t.Any], *, time: datetime
@@ -78,78 +145,204 @@ class Scheduler:
 
         return self._schedule(time, callback)
 
-    def get_task(self, task_id: int) -> Optional[Task[t.Any]]:
-        if task_id in self._scheduled_tasks.keys():
-            return self._scheduled_tasks[task_id]
-        return None
+    def schedule_overdue(self, callback: t.Coroutine[t.Any, t.Any, t.Any]) -> uuid.UUID:
+        """Queues a callback whose time has already passed, E.G a reminder that was due while the
+        bot was offline. It is run in the background so the caller never waits on it
+
+        Args:
+
+            callback (t.Awaitable): The callback to be executed
+
+        Raises:
+
+            BadArgument:
+
+        Returns:
+
+            uuid: Unique Identifier for the scheduled task, it can be cancelled until it starts
+        """
+
+        if callback is None:
+            raise BadArgument("Scheduled callback was none")
+
+        task_id = uuid.uuid4()
+        self._scheduled_tasks[task_id] = ScheduledTimer(
+            id=task_id, when=time_.monotonic(), callback=callback
+        )
+        self._catch_up_queue.append(task_id)
+
+        if len(self._catch_up_workers) < self.catch_up_concurrency:
+            self._catch_up_workers.add(asyncio.create_task(self._catch_up_worker()))
+
+        return task_id
+
+    def get_task(self, task_id: t.Hashable) -> Optional[ScheduledTimer]:
+        return self._scheduled_tasks.get(task_id)
 
     def __contains__(self, task_id: t.Hashable) -> bool:
         """Return True if a task with the given `task_id` is currently scheduled."""
         return task_id in self._scheduled_tasks
 
+    def __len__(self) -> int:
+        return len(self._scheduled_tasks)
+
     def cancel(self, task_id: uuid.UUID) -> None:
         try:
-            self._scheduled_tasks[task_id].cancel()
+            timer = self._scheduled_tasks.pop(task_id)
         except KeyError:
             log.error("Tried to cancel non existent task - Id: {task_id}", task_id=str(task_id))
             raise
 
-        del self._scheduled_tasks[task_id]
+        # The callback never ran, close it so it isn't reported as never awaited
+        if inspect.iscoroutine(timer.callback):
+            timer.callback.close()
+
+        # The heap entry is skipped lazily, rebuild the heap once most of it is cancelled timers
+        if len(self._heap) > 2 * len(self._scheduled_tasks) + HEAP_COMPACT_THRESHOLD:
+            self._heap = [e for e in self._heap if e[2] in self._scheduled_tasks]
+            heapq.heapify(self._heap)
+
+    async def close(self) -> None:
+        """Stops the driver and drops every pending timer, running callbacks are left to finish"""
+        stopping = list(self._catch_up_workers)
+        if self._driver is not None:
+            stopping.append(self._driver)
+            self._driver = None
+
+        # Catch up callbacks run in their own tasks so cancelling their workers doesn't stop them
+        for task in stopping:
+            task.cancel()
+        self._catch_up_queue.clear()
+
+        for timer in self._scheduled_tasks.values():
+            if inspect.iscoroutine(timer.callback):
+                timer.callback.close()
+
+        self._scheduled_tasks.clear()
+        self._heap.clear()
+
+        # Wait for the cancellations so nothing is left pending when the loop closes
+        await asyncio.gather(*stopping, return_exceptions=True)
 
     def _schedule(self, time: float | int, coro: t.Coroutine[t.Any, t.Any, t.Any]) -> uuid.UUID:
 
         task_id = uuid.uuid4()
 
-        log.info(
+        log.debug(
             "Scheduling coroutine - Id: {task_id} for execution in {time} seconds",
             task_id=str(task_id),
             time=time,
         )
 
-        del_coro = self._delayed_coro(time, coro, task_id)
-        # creates a non-blocking task that elides the await
-        task = asyncio.create_task(del_coro)
+        timer = ScheduledTimer(id=task_id, when=time_.monotonic() + time, callback=coro)
+        self._scheduled_tasks[task_id] = timer
+        heapq.heappush(self._heap, (timer.when, next(self._sequence), task_id))
 
-        # add the callback so the task can be closed and removed from the internal list
-        task.add_done_callback(partial(self._end_scheduled_task, task_id))
+        if self._driver is None or self._driver.done():
+            self._wakeup = asyncio.Event()
+            self._driver = asyncio.create_task(self._drive())
+        elif self._heap[0][2] == task_id:
+            # The new timer is due before the one the driver is sleeping on
+            assert self._wakeup is not None
+            self._wakeup.set()
 
-        self._scheduled_tasks[task_id] = task
         return task_id
 
-    async def _delayed_coro(
-        self, delay: float | int, coro: t.Coroutine[t.Any, t.Any, t.Any], task_id: uuid.UUID
-    ) -> None:
+    async def _drive(self) -> None:
+        assert self._wakeup is not None
+
+        while True:
+            self._wakeup.clear()
+            delay = self._start_due_timers()
+
+            if delay is None:
+                await self._wakeup.wait()
+                continue
+
+            # Sleep until the next timer is due or an earlier one is scheduled
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+
+    def _start_due_timers(self) -> float | None:
+        """Starts every timer that is due, returns the seconds until the next one if there is one"""
+        while self._heap:
+            when, _, task_id = self._heap[0]
+
+            if task_id not in self._scheduled_tasks:
+                heapq.heappop(self._heap)
+                continue
+
+            now = time_.monotonic()
+            if when > now:
+                return when - now
+
+            heapq.heappop(self._heap)
+            timer = self._scheduled_tasks.pop(task_id)
+
+            task = asyncio.create_task(self._run_timer(timer))
+            self._running.add(task)
+            task.add_done_callback(self._end_scheduled_task)
+
+        return None
+
+    async def _catch_up_worker(self) -> None:
         try:
-            # await the timed delay
-            log.info(
-                "Waiting {delay} seconds before executing coroutine with Id: {task_id}",
-                delay=delay,
-                task_id=str(task_id),
-            )
-            await asyncio.sleep(delay)
+            while self._catch_up_queue:
+                task_id = self._catch_up_queue.popleft()
+
+                if task_id not in self._scheduled_tasks:
+                    continue
+
+                # Space out the starts of overdue callbacks across every worker
+                now = time_.monotonic()
+                start = max(now, self._next_catch_up_start)
+                self._next_catch_up_start = start + 1 / self.catch_up_rate
+                await asyncio.sleep(start - now)
+
+                # It might have been cancelled while it was queued
+                if (timer := self._scheduled_tasks.pop(task_id, None)) is None:
+                    continue
+
+                task = asyncio.create_task(self._run_timer(timer))
+                self._running.add(task)
+                task.add_done_callback(functools.partial(self._end_catch_up_task, task_id=task_id))
 
+                # Wait without cancelling the callback if this worker is cancelled
+                await asyncio.wait({task})
+        finally:
+            # Leave the worker set as soon as the queue is empty, a done callback only runs
+            # later so schedule_overdue could count this worker and never start another
+            self._catch_up_workers.discard(t.cast(asyncio.Task[None], asyncio.current_task()))
+
+    async def _run_timer(self, timer: ScheduledTimer) -> None:
+        coro = timer.callback
+        try:
             # time is up, execute the callback
             log.info(
-                "Delay complete for coroutine {task_id}; executing coroutine", task_id=str(task_id)
+                "Delay complete for coroutine {task_id}; executing coroutine", task_id=str(timer.id)
             )
-            await asyncio.shield(coro)
+            await coro
         # use a finally so that the coro is closed even if it throws
         finally:
-            if inspect.getcoroutinestate(coro) == "CORO_CREATED":
-                log.info("Explicitly closing the coroutine for #{task_id}.", task_id=str(task_id))
+            if inspect.iscoroutine(coro) and inspect.getcoroutinestate(coro) == "CORO_CREATED":
+                log.info("Explicitly closing the coroutine for #{task_id}.", task_id=str(timer.id))
                 coro.close()
-            else:
-                log.info("Finally block reached for #{task_id}", task_id=str(task_id))
 
-    def _end_scheduled_task(
-        self, task_id: uuid.UUID, coro: t.Coroutine[t.Any, t.Any, t.Any]
-    ) -> None:
-        finished_task = self._scheduled_tasks.get(task_id)
-        if finished_task:
-            del self._scheduled_tasks[task_id]
+    def _end_catch_up_task(self, task: asyncio.Task[None], task_id: uuid.UUID) -> None:
+        self._running.discard(task)
+
+        if not task.cancelled() and (error := task.exception()) is not None:
+            log.error(
+                "Overdue coroutine {task_id} failed with error: {error}",
+                task_id=str(task_id),
+                error=error,
+            )
+
+    def _end_scheduled_task(self, task: asyncio.Task[None]) -> None:
+        self._running.discard(task)
 
         with contextlib.suppress(asyncio.CancelledError):
-            exception = coro.exception()  # type: ignore
+            exception = task.exception()
             # Log the exception if one exists.
             if exception:
                 raise exception
@@ -1,9 +1,10 @@
-from typing import TypeAlias
+import heapq
+from typing import Iterable, Iterator, TypeAlias
 
 import nltk
 
-T_TRIGRAM_SET: TypeAlias = set[tuple[str, ...]]
-T_SEARCH_BANK: TypeAlias = list[tuple[str, T_TRIGRAM_SET]]
+T_TRIGRAM: TypeAlias = tuple[str, ...]
+T_TRIGRAM_SET: TypeAlias = set[T_TRIGRAM]
 
 
 class BankSearchEntry:
@@ -53,23 +54,74 @@ def similarity(a: T_TRIGRAM_SET, b: T_TRIGRAM_SET) -> float:
     return (compare(a, b) + compare(b, a)) / 2
 
 
+class SearchBank:
+    """
+    Items to fuzzy search with their trigrams, plus an inverted index from each
+    trigram to the items containing it so a query only looks at items it shares a trigram with
+    """
+
+    __slots__ = ("entries", "postings")
+
+    def __init__(self, items: Iterable[str]):
+        self.entries = [(item, make_trigrams(item)) for item in items]
+
+        self.postings = dict[T_TRIGRAM, list[int]]()
+        for i, (_, trigrams) in enumerate(self.entries):
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[tuple[str, T_TRIGRAM_SET]]:
+        return iter(self.entries)
+
+
+T_SEARCH_BANK: TypeAlias = SearchBank
+
+
 def make_search_bank(items: list[str]) -> T_SEARCH_BANK:
-    return [(item, make_trigrams(item)) for item in items]
+    return SearchBank(items)
+
 
+def query_search_bank(
+    bank: T_SEARCH_BANK, query: str, *, limit: int | None = None
+) -> list[BankSearchEntry]:
+    """
+    Gets the items of the bank sharing at least one trigram with the query, most similar first
 
-def query_search_bank(bank: T_SEARCH_BANK, query: str) -> list[BankSearchEntry]:
+    Items sharing no trigrams have a similarity of 0 and are left out. Ties keep the order
+    of the bank. If a limit is given only that many items are returned
+    """
     query_trgrms = make_trigrams(query)
 
-    return sorted(
-        (
-            BankSearchEntry(item, similarity(query_trgrms, item_trgrms))
-            for item, item_trgrms in bank
-        ),
-        reverse=True,
-    )
+    # Count the trigrams each candidate shares with the query,
+    # that is the size of their intersection without building it
+    shared = dict[int, int]()
+    for trigram in query_trgrms:
+        for i in bank.postings.get(trigram, ()):
+            shared[i] = shared.get(i, 0) + 1
+
+    # Score against the negated index so ties rank earlier items first
+    def score(i: int) -> tuple[float, int]:
+        count = shared[i]
+        item_size = len(bank.entries[i][1])
+        sim = (count / (len(query_trgrms) + 1e-10) + count / (item_size + 1e-10)) / 2
+        return sim, -i
+
+    if limit is None:
+        scored = sorted(map(score, shared), reverse=True)
+    else:
+        scored = heapq.nlargest(limit, map(score, shared))
+
+    return [BankSearchEntry(bank.entries[-neg_i][0], sim) for sim, neg_i in scored]
 
 
 def find_best_match(bank: T_SEARCH_BANK, query: str) -> BankSearchEntry:
-    results = query_search_bank(bank, query)
-    assert len(results) > 0
-    return results[0]
+    assert len(bank) > 0
+
+    if results := query_search_bank(bank, query, limit=1):
+        return results[0]
+
+    # Nothing shares a trigram with the query so everything is equally dissimilar
+    return BankSearchEntry(bank.entries[0][0], 0.0)
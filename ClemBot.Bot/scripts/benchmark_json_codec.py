@@ -0,0 +1,73 @@
+import datetime
+import sys
+import timeit
+
+sys.path.append(".")
+
+from bot.api.json_codec import ORJSON_CODEC, STDLIB_CODEC  # noqa: E402
+
+"""
+Script to compare the throughput of the json codecs available to the ApiClient
+on payloads shaped like the ones our routes send and receive
+
+Run from the ClemBot.Bot directory:
+python scripts/benchmark_json_codec.py
+"""
+
+NUMBER = 50
+
+# bot/users/createbulk request sent at startup for every member the bot can see
+user_bulk = {
+    "Users": [
+        {"Id": 100000000000000000 + i, "Name": f"user_{i}#{i % 10000:04}"} for i in range(20000)
+    ]
+}
+
+# bot/messages request sent for every message batch
+message_batch = {
+    "Messages": [
+        {
+            "Id": 900000000000000000 + i,
+            "Content": "some message content that is about as long as a normal message " * 2,
+            "GuildId": 1,
+            "UserId": 2,
+            "ChannelId": 3,
+            "Time": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f"),
+        }
+        for i in range(20)
+    ]
+}
+
+# guilds/{id}/tags response loaded for every guild tag index
+guild_tags = {
+    "tags": [
+        {
+            "name": f"tag_{i}",
+            "content": "tag content " * 20,
+            "creationDate": "2022-01-01T00:00:00",
+            "guildId": 1,
+            "userId": 2,
+            "useCount": i,
+        }
+        for i in range(500)
+    ]
+}
+
+payloads = {"user_bulk": user_bulk, "message_batch": message_batch, "guild_tags": guild_tags}
+codecs = [c for c in (STDLIB_CODEC, ORJSON_CODEC) if c is not None]
+
+if ORJSON_CODEC is None:
+    print("orjson is not installed, only the stdlib codec will be benchmarked\n")
+
+print(f"{'payload':<15}{'codec':<10}{'size':>12}{'encode/s':>12}{'decode/s':>12}")
+
+for name, payload in payloads.items():
+    for codec in codecs:
+        encoded = codec.dumps(payload)
+        encode = timeit.timeit(lambda: codec.dumps(payload), number=NUMBER)
+        decode = timeit.timeit(lambda: codec.loads(encoded), number=NUMBER)
+
+        print(
+            f"{name:<15}{codec.name:<10}{len(encoded):>12}"
+            f"{NUMBER / encode:>12.1f}{NUMBER / decode:>12.1f}"
+        )
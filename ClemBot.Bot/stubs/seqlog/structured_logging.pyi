@@ -120,6 +120,17 @@ class StructuredLogger(logging.Logger):
         extra: tp.Mapping[str, object] | None = ...,
         **kwargs: tp.Any,
     ) -> None: ...
+    def log(
+        self,
+        level: int,
+        msg: object,
+        *args: object,
+        exc_info: _ExcInfoType = ...,
+        stack_info: bool = ...,
+        stacklevel: int = ...,
+        extra: tp.Mapping[str, object] | None = ...,
+        **kwargs: tp.Any,
+    ) -> None: ...
 
 class StructuredRootLogger(logging.RootLogger):
     def __init__(self, level: tp.Any = ...) -> None: ...
@@ -0,0 +1,264 @@
+import asyncio
+from unittest import mock
+
+import aiohttp
+import pytest
+
+from bot.api.api_client import (
+    ApiClient,
+    ConnectionPoolSettings,
+    RequestLogSettings,
+    Result,
+    RetrySettings,
+)
+from bot.errors import ApiCircuitOpenError
+from bot.utils.circuit_breaker import CircuitBreaker
+
+
+class TestApiClient:
+    @pytest.mark.asyncio
+    async def test_request_limits_concurrent_requests(self):
+        client = ApiClient(pool_settings=ConnectionPoolSettings(max_concurrent_requests=2))
+        client.session = mock.Mock()
+
+        async def send_request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return Result(200, None)
+
+        with mock.patch.object(client, "_build_url", return_value="url"), mock.patch.object(
+            client, "_send_request", side_effect=send_request
+        ):
+            await asyncio.gather(*(client._request("GET", "foo", False) for _ in range(5)))
+
+        stats = client.pool_stats()
+
+        assert stats.peak_in_flight == 2
+        assert stats.in_flight == 0
+        assert stats.waiting == 0
+        assert stats.total_requests == 5
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_is_counted_and_releases_slot(self):
+        client = ApiClient(pool_settings=ConnectionPoolSettings(max_concurrent_requests=1))
+        client.session = mock.Mock()
+
+        with mock.patch.object(client, "_build_url", return_value="url"), mock.patch.object(
+            client, "_send_request", side_effect=asyncio.TimeoutError
+        ):
+            with pytest.raises(asyncio.TimeoutError):
+                await client._request("GET", "foo", False)
+
+        stats = client.pool_stats()
+
+        assert stats.timed_out_requests == 1
+        assert stats.in_flight == 0
+        assert not client._request_semaphore.locked()
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_override_is_only_sent_when_given(self):
+        client = ApiClient()
+        client.session = mock.Mock()
+        timeout = aiohttp.ClientTimeout(sock_read=300)
+
+        with mock.patch.object(client, "_build_url", return_value="url"), mock.patch.object(
+            client, "_send_request", return_value=Result(200, None)
+        ) as send:
+            await client._request("PATCH", "foo", False)
+            await client._request("PATCH", "foo", False, timeout=timeout)
+
+        assert "timeout" not in send.call_args_list[0].args[3]
+        assert send.call_args_list[1].args[3]["timeout"] is timeout
+
+    def test_truncate_payload_shortens_large_payloads(self):
+        client = ApiClient(log_settings=RequestLogSettings(max_payload_chars=10))
+
+        assert client._truncate_payload({"a": 1}) == '{"a": 1}'
+        assert client._truncate_payload("x" * 15) == "xxxxxxxxxx... (5 more characters)"
+
+    def test_log_payloads_skips_formatting_when_level_disabled(self):
+        client = ApiClient()
+
+        with mock.patch("bot.api.api_client.log") as log, mock.patch.object(
+            client, "_truncate_payload"
+        ) as truncate:
+            log.isEnabledFor.return_value = False
+            client._log_payloads("GET", "foo", None, {"a": 1})
+
+        truncate.assert_not_called()
+        log.log.assert_not_called()
+
+    def test_log_payloads_skips_unsampled_requests(self):
+        client = ApiClient(log_settings=RequestLogSettings(sample_rate=0))
+
+        with mock.patch("bot.api.api_client.log") as log:
+            log.isEnabledFor.return_value = True
+            client._log_payloads("GET", "foo", None, {"a": 1})
+
+        log.log.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_shares_identical_concurrent_requests(self):
+        client = ApiClient()
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return {"foo": "bar"}
+
+        with mock.patch.object(client, "_request_or_reconnect", side_effect=request) as req:
+            results = await asyncio.gather(*(client.get("foo") for _ in range(5)))
+
+        assert req.call_count == 1
+        assert results == [{"foo": "bar"}] * 5
+        assert client.pool_stats().deduplicated_requests == 4
+        assert len(client._in_flight_gets) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_does_not_share_requests_with_different_params(self):
+        client = ApiClient()
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+
+        with mock.patch.object(client, "_request_or_reconnect", side_effect=request) as req:
+            await asyncio.gather(
+                client.get("foo", params={"a": 1}),
+                client.get("foo", params={"a": 2}),
+                client.get("bar", params={"a": 1}),
+            )
+
+        assert req.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_does_not_share_completed_requests(self):
+        client = ApiClient()
+
+        with mock.patch.object(client, "_request_or_reconnect", return_value=None) as req:
+            await client.get("foo")
+            await client.get("foo")
+
+        assert req.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_raises_shared_exception_to_every_caller(self):
+        client = ApiClient()
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise ConnectionError
+
+        with mock.patch.object(client, "_request_or_reconnect", side_effect=request):
+            results = await asyncio.gather(
+                client.get("foo"), client.get("foo"), return_exceptions=True
+            )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_get_cancelled_caller_does_not_cancel_shared_request(self):
+        client = ApiClient()
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return 1
+
+        with mock.patch.object(client, "_request_or_reconnect", side_effect=request):
+            first = asyncio.create_task(client.get("foo"))
+            second = asyncio.create_task(client.get("foo"))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            assert await second == 1
+
+    @pytest.mark.asyncio
+    async def test_idempotent_request_is_retried_after_transient_failure(self):
+        client = ApiClient(retry_settings=RetrySettings(base_delay=0, max_delay=0))
+        client.connected = True
+
+        with mock.patch.object(
+            client, "_request", side_effect=[asyncio.TimeoutError, Result(200, "foo")]
+        ) as request:
+            assert await client._request_or_reconnect("GET", "foo") == "foo"
+
+        assert request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_request_is_not_retried(self):
+        client = ApiClient(retry_settings=RetrySettings(base_delay=0, max_delay=0))
+        client.connected = True
+
+        with mock.patch.object(client, "_request", side_effect=asyncio.TimeoutError) as request:
+            with pytest.raises(ConnectionError):
+                await client._request_or_reconnect("POST", "foo")
+
+        assert request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_is_not_retried(self):
+        client = ApiClient(retry_settings=RetrySettings(base_delay=0, max_delay=0))
+        client.connected = True
+
+        async def body():
+            yield b"{}"
+
+        with mock.patch.object(client, "_request", side_effect=asyncio.TimeoutError) as request:
+            with pytest.raises(ConnectionError):
+                await client._request_or_reconnect("PUT", "foo", data=body())
+
+        assert request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_response_is_retried(self):
+        client = ApiClient(retry_settings=RetrySettings(base_delay=0, max_delay=0))
+        client.connected = True
+
+        with mock.patch.object(
+            client, "_request", side_effect=[Result(503, None), Result(200, "foo")]
+        ) as request:
+            assert await client._request_or_reconnect("GET", "foo") == "foo"
+
+        assert request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_internal_server_error_is_not_retried_or_counted(self):
+        client = ApiClient(
+            retry_settings=RetrySettings(base_delay=0, max_delay=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+        )
+        client.connected = True
+
+        with mock.patch.object(client, "_request", return_value=Result(500, None)) as request:
+            await client._request_or_reconnect("GET", "foo")
+            await client._request_or_reconnect("GET", "foo")
+
+        assert request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retried_request_counts_one_circuit_failure(self):
+        client = ApiClient(
+            retry_settings=RetrySettings(max_attempts=3, base_delay=0, max_delay=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+        )
+        client.connected = True
+
+        with mock.patch.object(client, "_request", side_effect=asyncio.TimeoutError) as request:
+            with pytest.raises(ConnectionError):
+                await client._request_or_reconnect("GET", "foo")
+
+        assert request.await_count == 3
+        assert client.circuit_breaker.allow_request()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast_without_sending_request(self):
+        client = ApiClient(
+            retry_settings=RetrySettings(max_attempts=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+        )
+        client.connected = True
+
+        with mock.patch.object(client, "_request", side_effect=asyncio.TimeoutError) as request:
+            with pytest.raises(ConnectionError):
+                await client._request_or_reconnect("GET", "foo")
+            with pytest.raises(ApiCircuitOpenError):
+                await client._request_or_reconnect("GET", "foo")
+
+        assert request.await_count == 1
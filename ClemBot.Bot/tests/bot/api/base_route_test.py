@@ -0,0 +1,126 @@
+import typing as t
+from unittest import mock
+
+import pytest
+
+from bot.api.base_route import BaseRoute, cached, invalidates
+
+
+class FooRoute(BaseRoute):
+    def __init__(self):
+        super().__init__(mock.AsyncMock())
+
+    @cached(ttl=60, tags=["foo:{guild_id}"])
+    async def get_foo(self, guild_id: int, name: str, **kwargs: t.Any) -> t.Any:
+        return await self._client.get(f"foo/{guild_id}/{name}", **kwargs)
+
+    @cached(ttl=60, key="{user.id}", tags=["bar"])
+    async def get_bar(self, user: t.Any) -> t.Any:
+        return await self._client.get(f"bar/{user.id}")
+
+    @invalidates("foo:{guild_id}")
+    async def set_foo(self, guild_id: int, name: str, **kwargs: t.Any) -> None:
+        await self._client.post(f"foo/{guild_id}/{name}", **kwargs)
+
+
+class TestBaseRoute:
+    @pytest.mark.asyncio
+    async def test_cached_serves_repeated_calls_from_cache(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+
+        assert await route.get_foo(1, "a") == "foo"
+        assert await route.get_foo(1, name="a") == "foo"
+
+        route._client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_keys_on_arguments_ignoring_request_options(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+
+        await route.get_foo(1, "a")
+        await route.get_foo(1, "a", raise_on_error=True)
+        await route.get_foo(1, "b")
+        await route.get_foo(2, "a")
+
+        assert route._client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_uses_key_format_string(self):
+        route = FooRoute()
+        route._client.get.return_value = "bar"
+
+        await route.get_bar(mock.Mock(id=1))
+        await route.get_bar(mock.Mock(id=1))
+
+        route._client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_does_not_cache_failed_requests(self):
+        route = FooRoute()
+        route._client.get.return_value = None
+
+        await route.get_foo(1, "a")
+        await route.get_foo(1, "a")
+
+        assert route._client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidates_drops_responses_with_matching_tags(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+
+        await route.get_foo(1, "a")
+        await route.get_foo(2, "a")
+        await route.set_foo(1, "a")
+        await route.get_foo(1, "a")
+        await route.get_foo(2, "a")
+
+        assert route._client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidates_drops_responses_when_write_raises(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+        route._client.post.side_effect = Exception
+
+        await route.get_foo(1, "a")
+        with pytest.raises(Exception):
+            await route.set_foo(1, "a")
+        await route.get_foo(1, "a")
+
+        assert route._client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_tags_drops_responses_across_methods(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+
+        await route.get_foo(1, "a")
+        await route.get_bar(mock.Mock(id=1))
+        route.invalidate_cache_tags("bar")
+        await route.get_foo(1, "a")
+        await route.get_bar(mock.Mock(id=1))
+
+        assert route._client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_serves_stale_response_when_api_unavailable(self):
+        route = FooRoute()
+        route._client.get.return_value = "foo"
+
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=0):
+            await route.get_foo(1, "a")
+
+        route._client.get.side_effect = ConnectionError
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=120):
+            assert await route.get_foo(1, "a") == "foo"
+
+    @pytest.mark.asyncio
+    async def test_cached_raises_when_api_unavailable_and_nothing_cached(self):
+        route = FooRoute()
+        route._client.get.side_effect = ConnectionError
+
+        with pytest.raises(ConnectionError):
+            await route.get_foo(1, "a")
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+
+import pytest
+
+from bot.api.csv_stream import encode_csv, stream_csv_body
+
+
+async def _read_body(body) -> bytes:
+    return b"".join([chunk async for chunk in body])
+
+
+class TestEncodeCsv:
+    def test_writes_header_and_rows(self):
+        text = "".join(encode_csv(("UserId", "Name"), [(1, "foo"), (2, "bar")]))
+        assert text == "UserId,Name\n1,foo\n2,bar\n"
+
+    def test_writes_header_for_no_rows(self):
+        assert "".join(encode_csv(("UserId", "Name"), [])) == "UserId,Name\n"
+
+    def test_round_trips_values_needing_quotes(self):
+        rows = [(1, 'a, "quoted"\nname', True), (2, "plain", None)]
+        text = "".join(encode_csv(("Id", "Name", "Admin"), rows))
+
+        assert list(csv.reader(io.StringIO(text))) == [
+            ["Id", "Name", "Admin"],
+            ["1", 'a, "quoted"\nname', "True"],
+            ["2", "plain", ""],
+        ]
+
+    def test_keeps_large_ids_exact(self):
+        text = "".join(encode_csv(("ThreadId", "ParentId"), [(1, 123456789012345678)]))
+        assert text.splitlines()[1] == "1,123456789012345678"
+
+    def test_chunks_rows(self):
+        rows = ((i, f"user{i}") for i in range(5))
+        chunks = list(encode_csv(("UserId", "Name"), rows, chunk_rows=2))
+
+        assert len(chunks) == 3
+        assert chunks[0] == "UserId,Name\n0,user0\n1,user1\n"
+        assert chunks[2] == "4,user4\n"
+
+    def test_consumes_rows_lazily(self):
+        consumed = []
+
+        def rows():
+            for i in range(4):
+                consumed.append(i)
+                yield i, "foo"
+
+        chunks = encode_csv(("UserId", "Name"), rows(), chunk_rows=2)
+        next(chunks)
+
+        assert consumed == [0, 1]
+
+
+class TestStreamCsvBody:
+    @pytest.mark.asyncio
+    async def test_streams_valid_json(self):
+        chunks = encode_csv(("UserId", "Name"), [(1, 'fo"o'), (2, "héllo\\")], chunk_rows=1)
+        body = await _read_body(stream_csv_body({"GuildId": 42}, "UserCsv", chunks))
+
+        assert json.loads(body) == {
+            "GuildId": 42,
+            "UserCsv": 'UserId,Name\n1,"fo""o"\n2,héllo\\\n',
+        }
+
+    @pytest.mark.asyncio
+    async def test_streams_empty_csv(self):
+        body = await _read_body(stream_csv_body({"GuildId": 42}, "UserCsv", []))
+        assert json.loads(body) == {"GuildId": 42, "UserCsv": ""}
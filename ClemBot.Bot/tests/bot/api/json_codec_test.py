@@ -0,0 +1,33 @@
+import json
+from unittest import mock
+
+import pytest
+
+from bot.api import json_codec
+from bot.api.json_codec import ORJSON_CODEC, STDLIB_CODEC
+
+CODECS = [c for c in (STDLIB_CODEC, ORJSON_CODEC) if c is not None]
+
+
+class TestJsonCodec:
+    @pytest.mark.parametrize("codec", CODECS, ids=lambda c: c.name)
+    def test_round_trips_payload(self, codec):
+        payload = {"GuildId": 1, "Users": [{"Id": 2, "Name": "foo"}], "Message": None}
+        assert codec.loads(codec.dumps(payload)) == payload
+
+    @pytest.mark.parametrize("codec", CODECS, ids=lambda c: c.name)
+    def test_dumps_output_is_readable_by_stdlib(self, codec):
+        payload = {"Content": 'héllo "world"', "Ids": [1, 2, 3]}
+        assert json.loads(codec.dumps(payload)) == payload
+
+    @pytest.mark.parametrize("codec", CODECS, ids=lambda c: c.name)
+    def test_dumps_allows_int_keys(self, codec):
+        assert json.loads(codec.dumps({1: "foo"})) == {"1": "foo"}
+
+    @pytest.mark.parametrize("codec", CODECS, ids=lambda c: c.name)
+    def test_loads_accepts_str_and_bytes(self, codec):
+        assert codec.loads('{"a": 1}') == codec.loads(b'{"a": 1}') == {"a": 1}
+
+    def test_default_codec_falls_back_to_stdlib(self):
+        with mock.patch.object(json_codec, "ORJSON_CODEC", None):
+            assert json_codec.get_default_codec() is STDLIB_CODEC
@@ -0,0 +1,38 @@
+from unittest import mock
+
+import pytest
+
+from bot.api.role_route import RoleRoute
+
+
+class TestRoleRoute:
+    @pytest.mark.asyncio
+    async def test_role_writes_only_drop_their_guilds_roles(self):
+        route = RoleRoute(mock.AsyncMock())
+        route._client.get.return_value = [
+            {"id": 1, "name": "foo", "isAssignable": True, "isAutoAssigned": True}
+        ]
+
+        await route.get_guilds_assignable_roles(1)
+        await route.get_guilds_assignable_roles(2)
+        await route.set_assignable(1, False, 1)
+        route._client.get.reset_mock()
+
+        await route.get_guilds_assignable_roles(1)
+        await route.get_guilds_assignable_roles(2)
+
+        route._client.get.assert_awaited_once_with("bot/guilds/1/roles")
+
+    @pytest.mark.asyncio
+    async def test_failed_auto_assigned_roles_fetch_is_not_cached(self):
+        route = RoleRoute(mock.AsyncMock())
+        route._client.get.side_effect = [
+            None,
+            [{"id": 1, "name": "foo", "isAssignable": False, "isAutoAssigned": True}],
+        ]
+
+        assert await route.get_guilds_auto_assigned_roles(1) is None
+        roles = await route.get_guilds_auto_assigned_roles(1)
+
+        assert [r.id for r in roles] == [1]
+        assert route._client.get.await_count == 2
@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from bot.api.tag_route import TagRoute
+from bot.models.tag_models import TagUse
+
+TAG = {
+    "name": "foo",
+    "content": "bar",
+    "guildId": 1,
+    "userId": 2,
+    "creationDate": "2022-01-01T00:00:00",
+    "useCount": 0,
+}
+
+
+class TestTagRoute:
+    @pytest.mark.asyncio
+    async def test_add_tag_uses_drops_cached_tags_of_each_guild(self):
+        route = TagRoute(mock.AsyncMock())
+        route._client.get.return_value = TAG
+
+        await route.get_tag(1, "foo")
+        await route.get_tag(3, "foo")
+        await route.get_tag_content(1, "foo")
+        await route.add_tag_uses(
+            [TagUse(guild_id=1, name="foo", channel_id=4, user_id=5, time=datetime(2022, 1, 1))]
+        )
+        route._client.get.reset_mock()
+
+        await route.get_tag(1, "foo")
+        await route.get_tag(3, "foo")
+        await route.get_tag_content(1, "foo")
+
+        # Only the tag with a stale use count is requested again
+        route._client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_tag_uses_sends_when_each_tag_was_used(self):
+        route = TagRoute(mock.AsyncMock())
+        used = [datetime(2022, 1, 1, 12), datetime(2022, 1, 1, 12, 0, 30)]
+
+        await route.add_tag_uses(
+            [TagUse(guild_id=1, name="foo", channel_id=4, user_id=5, time=t) for t in used]
+        )
+
+        uses = route._client.post.await_args.kwargs["data"]["Uses"]
+        assert [u["Time"] for u in uses] == [
+            "2022-01-01T12:00:00.000000",
+            "2022-01-01T12:00:30.000000",
+        ]
@@ -0,0 +1,30 @@
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture
+def make_named():
+    def make(id, name):
+        # name is a Mock constructor argument so it has to be set after
+        obj = mock.Mock(id=id)
+        obj.name = name
+        return obj
+
+    return make
+
+
+@pytest.fixture
+def make_guild(make_named):
+    def make(members=((1, "foo"), (2, "bar")), channels=((10, "general"),)):
+        guild = mock.Mock(
+            id=100,
+            members=[make_named(*m) for m in members],
+            channels=[make_named(*c) for c in channels],
+            roles=[],
+            threads=[],
+        )
+        guild.name = "guild"
+        return guild
+
+    return make
@@ -1,8 +1,9 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
-from bot.messaging.messenger import Messenger
+from bot.messaging.messenger import DispatchMode, Messenger, OverflowPolicy, QueueDispatcher
 
 
 class TestMessenger:
@@ -621,3 +622,450 @@ class TestMessenger:
         await messenger.close()
 
         assert error_call_state == [1] and foo.call_state == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_publish_concurrent_invokes_listeners_of_all_events(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.async_mock1 = mock.Mock()
+                self.async_mock2 = mock.Mock()
+
+            async def async_1(self, *args, **kwargs):
+                self.async_mock1(*args, **kwargs)
+
+            async def async_2(self, *args, **kwargs):
+                self.async_mock2(*args, **kwargs)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        messenger.subscribe("baz", foo.async_2)
+        await messenger.publish_concurrent(("bar", "baz"), 1)
+
+        foo.async_mock1.assert_called_once_with(1)
+        foo.async_mock2.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_publish_concurrent_runs_listeners_at_the_same_time(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.started = asyncio.Event()
+
+            async def async_1(self):
+                # Would deadlock if async_2 was not already running
+                await asyncio.wait_for(self.started.wait(), timeout=1)
+
+            async def async_2(self):
+                self.started.set()
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        messenger.subscribe("baz", foo.async_2)
+        await messenger.publish_concurrent(("bar", "baz"))
+
+    @pytest.mark.asyncio
+    async def test_publish_concurrent_raises_first_events_exception(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self):
+                await asyncio.sleep(0.01)
+                self.call_state.append(1)
+                raise KeyError()
+
+            async def async_2(self):
+                self.call_state.append(2)
+                raise ValueError()
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        messenger.subscribe("baz", foo.async_2)
+
+        with pytest.raises(KeyError):
+            await messenger.publish_concurrent(("bar", "baz"))
+
+        assert foo.call_state == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_publish_serial_listeners_invoked_in_order(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self):
+                await asyncio.sleep(0.01)
+                self.call_state.append(1)
+
+            async def async_2(self):
+                self.call_state.append(2)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1, DispatchMode.serial)
+        messenger.subscribe("bar", foo.async_2, DispatchMode.serial)
+        await messenger.publish("bar")
+
+        assert foo.call_state == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_publish_concurrent_listener_runs_alongside_serial_listener(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.started = asyncio.Event()
+
+            async def async_1(self):
+                # Would deadlock if async_2 was not already running
+                await asyncio.wait_for(self.started.wait(), timeout=1)
+
+            async def async_2(self):
+                self.started.set()
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        messenger.subscribe("bar", foo.async_2, DispatchMode.concurrent)
+        await messenger.publish("bar")
+
+    @pytest.mark.asyncio
+    async def test_publish_concurrent_listener_exception_is_raised(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.async_mock1 = mock.Mock()
+
+            async def async_1(self):
+                self.async_mock1()
+
+            async def async_2(self):
+                raise KeyError()
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1, DispatchMode.concurrent)
+        messenger.subscribe("bar", foo.async_2, DispatchMode.concurrent)
+
+        with pytest.raises(KeyError):
+            await messenger.publish("bar")
+
+        foo.async_mock1.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_publish_fire_and_forget_listener_does_not_block_publish(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.release = asyncio.Event()
+                self.call_state = []
+
+            async def async_1(self):
+                await self.release.wait()
+                self.call_state.append(1)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1, DispatchMode.fire_and_forget)
+        await messenger.publish("bar")
+
+        assert foo.call_state == []
+
+        foo.release.set()
+        await messenger.close()
+
+        assert foo.call_state == [1]
+
+    @pytest.mark.asyncio
+    async def test_publish_fire_and_forget_listener_invokes_error_callback_on_error(self):
+        messenger = Messenger()
+        error_call_state = []
+
+        async def error_callback(e, *, traceback: str):
+            error_call_state.append(1)
+
+        messenger.error_callback = error_callback
+
+        class Foo:
+            async def async_1(self):
+                raise Exception()
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1, DispatchMode.fire_and_forget)
+        await messenger.publish("bar")
+        await messenger.close()
+
+        assert error_call_state == [1]
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_drop_newest_discards_event_when_full(self):
+        messenger = Messenger(max_queue_size=1, overflow_policy=OverflowPolicy.drop_newest)
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, value):
+                self.call_state.append(value)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        await messenger.publish_to_queue("bar", 1, 1)
+        await messenger.publish_to_queue("bar", 1, 2)
+
+        await messenger.close()
+
+        assert foo.call_state == [1]
+        assert messenger.queue_stats().dropped_events == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_drop_oldest_discards_queued_event_when_full(self):
+        messenger = Messenger(max_queue_size=1, overflow_policy=OverflowPolicy.drop_oldest)
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, value):
+                self.call_state.append(value)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        await messenger.publish_to_queue("bar", 1, 1)
+        await messenger.publish_to_queue("bar", 1, 2)
+
+        await messenger.close()
+
+        assert foo.call_state == [2]
+        assert messenger.queue_stats().dropped_events == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_block_keeps_all_events_when_full(self):
+        messenger = Messenger(max_queue_size=1, overflow_policy=OverflowPolicy.block)
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, value):
+                self.call_state.append(value)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        for i in range(3):
+            await messenger.publish_to_queue("bar", 1, i)
+
+        await messenger.close()
+
+        assert foo.call_state == [0, 1, 2]
+        assert messenger.queue_stats().dropped_events == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_idle_queue_is_reaped(self):
+        messenger = Messenger(idle_timeout=0.01)
+
+        class Foo:
+            def __init__(self):
+                self.mock = mock.Mock()
+
+            async def async_mock(self, *args, **kwargs):
+                self.mock(*args, **kwargs)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_mock)
+        await messenger.publish_to_queue("bar", 1)
+        await asyncio.sleep(0.1)
+
+        assert len(messenger._guild_event_queue) == 0
+        assert len(messenger._queue_dispatch_tasks) == 0
+        assert messenger.queue_stats().reaped_queues == 1
+
+        # A new queue is created the next time the guild publishes
+        await messenger.publish_to_queue("bar", 1)
+        await messenger.close()
+
+        assert foo.mock.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_stats_reports_queue_depths(self):
+        messenger = Messenger()
+
+        await messenger.publish_to_queue("bar", 1)
+        await messenger.publish_to_queue("bar", 1)
+        await messenger.publish_to_queue("bar", 2)
+
+        stats = messenger.queue_stats()
+
+        assert stats.active_queues == 2
+        assert stats.total_depth == 3
+        assert stats.max_depth == 2
+        assert stats.depths == {1: 2, 2: 1}
+
+        await messenger.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_preserves_order_per_guild(self):
+        messenger = Messenger(dispatcher=QueueDispatcher.worker_pool, worker_count=4)
+
+        class Foo:
+            def __init__(self):
+                self.call_state = dict[int, list[int]]()
+
+            async def async_1(self, guild_id, value):
+                await asyncio.sleep(0)
+                self.call_state.setdefault(guild_id, []).append(value)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        for i in range(5):
+            for guild_id in range(3):
+                await messenger.publish_to_queue("bar", guild_id, guild_id, i)
+
+        await messenger.close()
+
+        assert foo.call_state == {g: [0, 1, 2, 3, 4] for g in range(3)}
+        assert len(messenger._guild_event_queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_takes_turns_between_guilds(self):
+        messenger = Messenger(dispatcher=QueueDispatcher.worker_pool, worker_count=1)
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, guild_id):
+                self.call_state.append(guild_id)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        for _ in range(3):
+            await messenger.publish_to_queue("bar", 1, 1)
+        for _ in range(3):
+            await messenger.publish_to_queue("bar", 2, 2)
+
+        await messenger.close()
+
+        assert foo.call_state == [1, 2, 1, 2, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_limits_concurrent_dispatches(self):
+        messenger = Messenger(dispatcher=QueueDispatcher.worker_pool, worker_count=2)
+
+        class Foo:
+            def __init__(self):
+                self.running = 0
+                self.max_running = 0
+
+            async def async_1(self):
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+                await asyncio.sleep(0.01)
+                self.running -= 1
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        for guild_id in range(5):
+            await messenger.publish_to_queue("bar", guild_id)
+
+        await messenger.close()
+
+        assert foo.max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_invokes_error_callback_on_error_and_continues(self):
+        error_callback = mock.AsyncMock()
+        messenger = Messenger(dispatcher=QueueDispatcher.worker_pool, worker_count=1)
+        messenger.error_callback = error_callback
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, value):
+                if value == 0:
+                    raise Exception
+                self.call_state.append(value)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        await messenger.publish_to_queue("bar", 1, 0)
+        await messenger.publish_to_queue("bar", 1, 1)
+
+        await messenger.close()
+
+        assert foo.call_state == [1]
+        error_callback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_coalesces_waiting_events_with_same_key(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, before, after):
+                self.call_state.append((before, after))
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        await messenger.publish_to_queue("bar", 1, "a", "b", coalesce_key=10)
+        await messenger.publish_to_queue("bar", 1, "b", "c", coalesce_key=10)
+        await messenger.publish_to_queue("bar", 1, "c", "d", coalesce_key=10)
+        await messenger.publish_to_queue("bar", 1, "x", "y", coalesce_key=20)
+
+        assert messenger.queue_stats().total_depth == 2
+
+        await messenger.close()
+
+        assert foo.call_state == [("a", "d"), ("x", "y")]
+        assert messenger.queue_stats().coalesced_events == 2
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_does_not_coalesce_without_key(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.mock = mock.Mock()
+
+            async def async_mock(self, *args, **kwargs):
+                self.mock(*args, **kwargs)
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_mock)
+        await messenger.publish_to_queue("bar", 1, "a", "b")
+        await messenger.publish_to_queue("bar", 1, "b", "c")
+
+        await messenger.close()
+
+        assert foo.mock.call_count == 2
+        assert messenger.queue_stats().coalesced_events == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_queue_does_not_coalesce_into_dispatched_event(self):
+        messenger = Messenger()
+
+        class Foo:
+            def __init__(self):
+                self.call_state = []
+
+            async def async_1(self, before, after):
+                self.call_state.append((before, after))
+
+        foo = Foo()
+        messenger.subscribe("bar", foo.async_1)
+        await messenger.publish_to_queue("bar", 1, "a", "b", coalesce_key=10)
+        await asyncio.sleep(0.01)
+        await messenger.publish_to_queue("bar", 1, "b", "c", coalesce_key=10)
+
+        await messenger.close()
+
+        assert foo.call_state == [("a", "b"), ("b", "c")]
+        assert len(messenger._coalescable_events) == 0
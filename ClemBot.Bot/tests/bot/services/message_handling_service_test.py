@@ -0,0 +1,145 @@
+import json
+from datetime import datetime
+from unittest import mock
+
+import aiohttp
+import pytest
+
+import bot.bot_secrets as bot_secrets
+from bot.errors import ApiCircuitOpenError
+from bot.models.message_models import SingleBatchMessage, SingleBatchMessageEdit
+from bot.services.message_handling_service import BATCH_CREATE, BATCH_EDIT, MessageHandlingService
+
+
+def make_message(message_id: int) -> SingleBatchMessage:
+    return SingleBatchMessage(
+        id=message_id, content="hi", guild=1, author=2, channel=3, time=datetime(2022, 1, 1)
+    )
+
+
+def make_edit(message_id: int) -> SingleBatchMessageEdit:
+    return SingleBatchMessageEdit(id=message_id, content="edited", time=datetime(2022, 1, 1))
+
+
+def rejected() -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(mock.Mock(), (), status=400)
+
+
+def unavailable() -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(mock.Mock(), (), status=503)
+
+
+def spilled_ids(path) -> list[list[int]]:
+    with open(path) as f:
+        return [[m["id"] for m in json.loads(line)["messages"]] for line in f]
+
+
+@pytest.fixture
+def spill_file(tmp_path):
+    path = tmp_path / "spill.jsonl"
+    with mock.patch.object(bot_secrets.secrets, "_message_spill_file", str(path)):
+        yield path
+
+
+@pytest.fixture
+def service():
+    bot = mock.Mock()
+    bot.message_route.batch_create_message = mock.AsyncMock()
+    bot.message_route.batch_edit_message = mock.AsyncMock()
+    return MessageHandlingService(bot=bot)
+
+
+class TestMessageSpill:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error", [ConnectionError("down"), ApiCircuitOpenError("open"), unavailable()]
+    )
+    async def test_unreachable_api_spills_batch(self, service, spill_file, error):
+        service.bot.message_route.batch_create_message.side_effect = error
+
+        await service._send_batch(BATCH_CREATE, [make_message(1), make_message(2)])
+
+        assert spilled_ids(spill_file) == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_is_dropped(self, service, spill_file):
+        service.bot.message_route.batch_create_message.side_effect = rejected()
+
+        await service._send_batch(BATCH_CREATE, [make_message(1)])
+
+        assert not spill_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_no_spill_file_drops_batch(self, service, tmp_path):
+        service.bot.message_route.batch_create_message.side_effect = ConnectionError("down")
+
+        with mock.patch.object(bot_secrets.secrets, "_message_spill_file", None):
+            await service._send_batch(BATCH_CREATE, [make_message(1)])
+
+        assert not list(tmp_path.iterdir())
+
+    @pytest.mark.asyncio
+    async def test_successful_send_replays_spill(self, service, spill_file):
+        route = service.bot.message_route
+        route.batch_create_message.side_effect = ConnectionError("down")
+        await service._send_batch(BATCH_CREATE, [make_message(1)])
+        route.batch_edit_message.side_effect = ConnectionError("down")
+        await service._send_batch(BATCH_EDIT, [make_edit(2)])
+
+        route.batch_create_message.side_effect = None
+        route.batch_edit_message.side_effect = None
+        route.batch_create_message.reset_mock()
+        await service._send_batch(BATCH_CREATE, [make_message(3)])
+
+        sent = [c.args[0][0].id for c in route.batch_create_message.await_args_list]
+        assert sent == [3, 1]
+        assert route.batch_edit_message.await_args.args[0][0].id == 2
+        assert not spill_file.exists()
+        assert not (spill_file.parent / "spill.jsonl.replay").exists()
+
+    @pytest.mark.asyncio
+    async def test_replay_stops_when_api_goes_away(self, service, spill_file):
+        route = service.bot.message_route
+        route.batch_create_message.side_effect = ConnectionError("down")
+        for i in range(3):
+            await service._send_batch(BATCH_CREATE, [make_message(i)])
+
+        route.batch_create_message.side_effect = [None, unavailable()]
+        await service.replay_spilled_batches()
+
+        # The replayed batch is removed, the rest are kept for the next replay
+        assert spilled_ids(spill_file.parent / "spill.jsonl.replay") == [[1], [2]]
+
+        route.batch_create_message.side_effect = None
+        route.batch_create_message.reset_mock()
+        await service.replay_spilled_batches()
+
+        sent = [c.args[0][0].id for c in route.batch_create_message.await_args_list]
+        assert sent == [1, 2]
+        assert not (spill_file.parent / "spill.jsonl.replay").exists()
+
+    @pytest.mark.asyncio
+    async def test_replay_drops_poison_batches(self, service, spill_file):
+        route = service.bot.message_route
+        route.batch_create_message.side_effect = ConnectionError("down")
+        for i in range(2):
+            await service._send_batch(BATCH_CREATE, [make_message(i)])
+
+        route.batch_create_message.side_effect = [rejected(), None]
+        await service.replay_spilled_batches()
+
+        assert route.batch_create_message.await_count == 4
+        assert not (spill_file.parent / "spill.jsonl.replay").exists()
+
+    @pytest.mark.asyncio
+    async def test_replay_skips_malformed_lines(self, service, spill_file):
+        service.bot.message_route.batch_create_message.side_effect = ConnectionError("down")
+        await service._send_batch(BATCH_CREATE, [make_message(1)])
+        with open(spill_file, "a") as f:
+            f.write('{"kind": "create", "messa\n')
+
+        service.bot.message_route.batch_create_message.side_effect = None
+        await service.replay_spilled_batches()
+
+        assert service.bot.message_route.batch_create_message.await_args.args[0][0].id == 1
+        assert not (spill_file.parent / "spill.jsonl.replay").exists()
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+
+from bot.consts import Infractions
+from bot.models.moderation_models import Infraction
+from bot.services.moderation_service import ModerationService
+from bot.utils.scheduler import TIMER_LOAD_HORIZON, Scheduler
+
+
+def mute(mute_id: int, expires_in: timedelta, guild_id: int = 1) -> Infraction:
+    now = datetime.utcnow()
+    return Infraction(
+        id=mute_id,
+        guild_id=guild_id,
+        author_id=2,
+        subject_id=3,
+        type=Infractions.mute,
+        reason=None,
+        duration=now + expires_in,
+        time=now,
+        active=1,
+    )
+
+
+@pytest_asyncio.fixture
+async def service():
+    bot = mock.Mock()
+    bot.guilds = [mock.Mock(id=1)]
+    bot.scheduler = Scheduler()
+    bot.messenger.publish = mock.AsyncMock()
+    bot.moderation_route.get_active_timed_infractions = mock.AsyncMock(return_value=[])
+    bot.moderation_route.get_guild_infractions = mock.AsyncMock(return_value=[])
+
+    yield ModerationService(bot=bot)
+
+    await bot.scheduler.close()
+
+
+class TestModerationHorizon:
+    @pytest.mark.asyncio
+    async def test_only_mutes_within_horizon_are_scheduled(self, service):
+        service.bot.moderation_route.get_active_timed_infractions.return_value = [
+            mute(1, timedelta(hours=1)),
+            mute(2, TIMER_LOAD_HORIZON + timedelta(hours=1)),
+            mute(3, timedelta(hours=1), guild_id=99),
+        ]
+
+        await service.load_horizon()
+
+        assert service._scheduled_mutes == {1}
+        assert len(service.bot.scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_reload_while_unmute_is_pending_does_not_reschedule(self, service):
+        service.bot.moderation_route.get_active_timed_infractions.return_value = [
+            mute(1, timedelta(hours=1))
+        ]
+
+        await service.load_horizon()
+        await service.load_horizon()
+
+        assert len(service.bot.scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_mute_is_caught_up(self, service):
+        service.bot.moderation_route.get_active_timed_infractions.return_value = [
+            mute(1, -timedelta(minutes=1))
+        ]
+
+        await service.load_horizon()
+        await asyncio.sleep(0.05)
+
+        service.bot.messenger.publish.assert_awaited_once()
+        assert service._scheduled_mutes == set()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_each_guilds_infractions(self, service):
+        route = service.bot.moderation_route
+        route.get_active_timed_infractions.return_value = None
+        route.get_guild_infractions.return_value = [mute(1, timedelta(hours=1))]
+
+        await service.load_horizon()
+
+        route.get_guild_infractions.assert_awaited_once_with(1)
+        assert service._scheduled_mutes == {1}
+
+    @pytest.mark.asyncio
+    async def test_horizon_is_reloaded_periodically(self, service):
+        with mock.patch(
+            "bot.services.moderation_service.TIMER_LOAD_INTERVAL", timedelta(milliseconds=10)
+        ):
+            await service.load_service()
+            await asyncio.sleep(0.1)
+
+        assert service.bot.moderation_route.get_active_timed_infractions.await_count >= 3
+
+        # Only the next reload is ever pending
+        assert len(service.bot.scheduler) == 1
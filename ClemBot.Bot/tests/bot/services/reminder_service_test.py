@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+
+from bot.models.reminder_models import ReminderReload
+from bot.services.reminder_service import ReminderService
+from bot.utils.scheduler import TIMER_LOAD_HORIZON, Scheduler
+
+
+def reminder(reminder_id: int, due_in: timedelta) -> ReminderReload:
+    return ReminderReload(id=reminder_id, time=datetime.utcnow() + due_in)
+
+
+@pytest_asyncio.fixture
+async def service():
+    bot = mock.Mock()
+    bot.scheduler = Scheduler()
+    bot.reminder_route.fetch_all_reminders = mock.AsyncMock(return_value=[])
+    bot.reminder_route.dispatch_reminder = mock.AsyncMock(side_effect=lambda i, **_: i)
+
+    yield ReminderService(bot=bot)
+
+    await bot.scheduler.close()
+
+
+class TestReminderHorizon:
+    @pytest.mark.asyncio
+    async def test_only_reminders_within_horizon_are_scheduled(self, service):
+        service.bot.reminder_route.fetch_all_reminders.return_value = [
+            reminder(1, timedelta(hours=1)),
+            reminder(2, TIMER_LOAD_HORIZON + timedelta(hours=1)),
+        ]
+
+        await service.load_horizon()
+
+        assert list(service.reminders) == [1]
+        assert len(service.bot.scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_reload_does_not_reschedule_pending_reminder(self, service):
+        service.bot.reminder_route.fetch_all_reminders.return_value = [
+            reminder(1, timedelta(hours=1))
+        ]
+
+        await service.load_horizon()
+        task_id = service.reminders[1]
+        await service.load_horizon()
+
+        assert service.reminders == {1: task_id}
+        assert len(service.bot.scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_reload_while_overdue_reminder_runs_does_not_reschedule(self, service):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def send_reminder(reminder_id):
+            started.set()
+            await finish.wait()
+
+        service.bot.reminder_route.fetch_all_reminders.return_value = [
+            reminder(1, -timedelta(minutes=1))
+        ]
+
+        with mock.patch.object(service, "_reminder_callback", side_effect=send_reminder) as send:
+            await service.load_horizon()
+            await asyncio.wait_for(started.wait(), timeout=1)
+
+            # The api still reports it as pending until the callback dispatches it
+            await service.load_horizon()
+            finish.set()
+            await asyncio.sleep(0.01)
+
+        send.assert_awaited_once_with(1)
+        assert service.reminders == {}
+
+    @pytest.mark.asyncio
+    async def test_deleting_unscheduled_reminder_only_dispatches_it(self, service):
+        service.bot.reminder_route.fetch_all_reminders.return_value = [
+            reminder(1, TIMER_LOAD_HORIZON + timedelta(hours=1))
+        ]
+        await service.load_horizon()
+
+        await service.on_delete_reminder(1)
+
+        service.bot.reminder_route.dispatch_reminder.assert_awaited_once_with(
+            1, raise_on_error=True
+        )
+        assert service.reminders == {}
+
+    @pytest.mark.asyncio
+    async def test_horizon_is_reloaded_periodically(self, service):
+        with mock.patch(
+            "bot.services.reminder_service.TIMER_LOAD_INTERVAL", timedelta(milliseconds=10)
+        ):
+            await service.load_service()
+            await asyncio.sleep(0.1)
+
+        assert service.bot.reminder_route.fetch_all_reminders.await_count >= 3
+
+        # Only the next reload is ever pending
+        assert len(service.bot.scheduler) == 1
@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+
+import bot.bot_secrets as bot_secrets
+from bot.services.startup_service import StartupService
+from bot.utils.guild_state import GuildEntity, fingerprint_guild, take_fingerprints
+
+
+@pytest.fixture
+def fingerprint_file(tmp_path):
+    path = tmp_path / "fingerprints.json"
+    with mock.patch.object(bot_secrets.secrets, "_guild_fingerprint_file", str(path)):
+        yield str(path)
+
+
+@pytest.fixture
+def service():
+    bot = mock.Mock()
+    bot.guild_route.sync_guild_entity = mock.AsyncMock()
+    return StartupService(bot=bot, concurrency=1)
+
+
+class TestStartupService:
+    @pytest.mark.asyncio
+    async def test_saves_fingerprints_of_synced_guilds(self, service, fingerprint_file, make_guild):
+        guild = make_guild()
+        service.bot.guilds = [guild]
+
+        assert await service.sync_guild(guild, None)
+        await service.unload_service()
+
+        assert take_fingerprints(fingerprint_file) == {guild.id: fingerprint_guild(guild)}
+
+    @pytest.mark.asyncio
+    async def test_failed_entity_sync_is_retried_next_startup(
+        self, service, fingerprint_file, make_guild
+    ):
+        guild = make_guild()
+
+        async def sync(guild, entity, **kwargs):
+            if entity == GuildEntity.channels:
+                raise ConnectionError("down")
+
+        service.bot.guild_route.sync_guild_entity.side_effect = sync
+
+        assert not await service.sync_guild(guild, None)
+        await service.unload_service()
+
+        saved = take_fingerprints(fingerprint_file)[guild.id]
+        assert GuildEntity.channels.name not in saved
+        assert saved[GuildEntity.users.name] == fingerprint_guild(guild)[GuildEntity.users.name]
+
+    @pytest.mark.asyncio
+    async def test_changes_made_while_running_are_not_saved(
+        self, service, fingerprint_file, make_guild, make_named
+    ):
+        guild = make_guild()
+        stored = fingerprint_guild(guild)
+
+        assert not await service.sync_guild(guild, stored)
+        service.bot.guild_route.sync_guild_entity.assert_not_awaited()
+
+        # A member joined after startup, the event handler might have failed to send it
+        guild.members.append(make_named(3, "baz"))
+        await service.unload_service()
+
+        assert take_fingerprints(fingerprint_file) == {guild.id: stored}
@@ -0,0 +1,72 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from bot.utils.batcher import WriteBehindBatcher
+
+
+class TestWriteBehindBatcher:
+    @pytest.mark.asyncio
+    async def test_add_flushes_when_batch_is_full(self):
+        callback = mock.AsyncMock()
+        batcher = WriteBehindBatcher[int](callback, max_size=3, flush_interval=60)
+
+        for i in range(4):
+            batcher.add(i)
+        await asyncio.sleep(0)
+
+        callback.assert_awaited_once_with([0, 1, 2])
+        assert len(batcher) == 1
+
+        await batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_add_flushes_after_interval(self):
+        callback = mock.AsyncMock()
+        batcher = WriteBehindBatcher[int](callback, max_size=10, flush_interval=0.01)
+
+        batcher.add(1)
+        batcher.add(2)
+        callback.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+
+        callback.assert_awaited_once_with([1, 2])
+        assert len(batcher) == 0
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_buffered_items(self):
+        callback = mock.AsyncMock()
+        batcher = WriteBehindBatcher[int](callback, max_size=10, flush_interval=60)
+
+        batcher.add(1)
+        await batcher.close()
+
+        callback.assert_awaited_once_with([1])
+        assert batcher._timer is None
+
+    @pytest.mark.asyncio
+    async def test_close_with_no_items_does_not_flush(self):
+        callback = mock.AsyncMock()
+        batcher = WriteBehindBatcher[int](callback)
+
+        await batcher.close()
+
+        callback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_dropped_and_batcher_keeps_working(self):
+        callback = mock.AsyncMock(side_effect=[Exception, None])
+        batcher = WriteBehindBatcher[int](callback, max_size=1)
+
+        batcher.add(1)
+        await batcher.flush()
+        batcher.add(2)
+        await batcher.flush()
+
+        assert callback.await_args_list == [mock.call([1]), mock.call([2])]
+
+    def test_non_positive_max_size_throws_value_error(self):
+        with pytest.raises(ValueError):
+            WriteBehindBatcher[int](mock.AsyncMock(), max_size=0)
@@ -0,0 +1,95 @@
+from unittest import mock
+
+import pytest
+
+from bot.utils.cache import TtlCache
+
+
+class TestTtlCache:
+    def test_get_missing_key_returns_none(self):
+        c = TtlCache[int, str](ttl=10)
+        assert c.get(1) is None
+
+    def test_set_then_get_returns_value(self):
+        c = TtlCache[int, str](ttl=10)
+        c.set(1, "foo")
+        assert c.get(1) == "foo"
+
+    def test_get_caches_falsy_values(self):
+        c = TtlCache[int, list[str]](ttl=10)
+        c.set(1, [])
+        assert c.get(1) == []
+        assert 1 in c
+
+    def test_get_expired_key_returns_none_and_drops_entry(self):
+        c = TtlCache[int, str](ttl=10)
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=0):
+            c.set(1, "foo")
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=10):
+            assert c.get(1) is None
+        assert len(c) == 0
+
+    def test_invalidate_removes_key(self):
+        c = TtlCache[int, str](ttl=10)
+        c.set(1, "foo")
+        c.set(2, "bar")
+        c.invalidate(1)
+        assert c.get(1) is None
+        assert c.get(2) == "bar"
+
+    def test_invalidate_missing_key_does_nothing(self):
+        c = TtlCache[int, str](ttl=10)
+        c.invalidate(1)
+        assert len(c) == 0
+
+    def test_invalidate_where_removes_matching_keys(self):
+        c = TtlCache[tuple[int, int], str](ttl=10)
+        c.set((1, 1), "foo")
+        c.set((1, 2), "bar")
+        c.set((2, 1), "baz")
+        c.invalidate_where(lambda k: k[0] == 1)
+        assert c.get((1, 1)) is None
+        assert c.get((1, 2)) is None
+        assert c.get((2, 1)) == "baz"
+
+    def test_clear_removes_all_keys(self):
+        c = TtlCache[int, str](ttl=10)
+        c.set(1, "foo")
+        c.set(2, "bar")
+        c.clear()
+        assert len(c) == 0
+
+    def test_non_positive_ttl_throws_value_error(self):
+        with pytest.raises(ValueError):
+            TtlCache[int, str](ttl=0)
+
+    def test_set_past_max_size_evicts_least_recently_used_key(self):
+        c = TtlCache[int, str](ttl=10, max_size=2)
+        c.set(1, "foo")
+        c.set(2, "bar")
+        c.get(1)
+        c.set(3, "baz")
+        assert c.get(2) is None
+        assert c.get(1) == "foo"
+        assert c.get(3) == "baz"
+        assert len(c) == 2
+
+    def test_non_positive_max_size_throws_value_error(self):
+        with pytest.raises(ValueError):
+            TtlCache[int, str](ttl=10, max_size=0)
+
+    def test_keep_expired_serves_expired_value_from_get_stale(self):
+        c = TtlCache[int, str](ttl=10, keep_expired=True)
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=0):
+            c.set(1, "foo")
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=10):
+            assert c.get(1) is None
+            assert c.get_stale(1) == "foo"
+
+    def test_get_stale_without_keep_expired_drops_expired_value_on_get(self):
+        c = TtlCache[int, str](ttl=10)
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=0):
+            c.set(1, "foo")
+        with mock.patch("bot.utils.cache.time.monotonic", return_value=10):
+            assert c.get(1) is None
+            assert c.get_stale(1) is None
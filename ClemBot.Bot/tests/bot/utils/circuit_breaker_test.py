@@ -0,0 +1,65 @@
+from unittest import mock
+
+from bot.utils.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class TestCircuitBreaker:
+    def test_new_circuit_is_closed(self):
+        breaker = CircuitBreaker()
+        assert breaker.state is CircuitState.closed
+        assert breaker.allow_request()
+
+    def test_circuit_opens_after_threshold_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state is CircuitState.open
+        assert not breaker.allow_request()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is CircuitState.closed
+
+    def test_half_open_allows_single_trial_request(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=0):
+            breaker.record_failure()
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=10):
+            assert breaker.state is CircuitState.half_open
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+
+    def test_trial_success_closes_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=0):
+            breaker.record_failure()
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=10):
+            breaker.allow_request()
+            breaker.record_success()
+
+        assert breaker.state is CircuitState.closed
+
+    def test_trial_failure_reopens_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=0):
+            breaker.record_failure()
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=10):
+            breaker.allow_request()
+            breaker.record_failure()
+
+        with mock.patch("bot.utils.circuit_breaker.time.monotonic", return_value=15):
+            assert breaker.state is CircuitState.open
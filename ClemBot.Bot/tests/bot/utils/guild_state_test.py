@@ -0,0 +1,56 @@
+from bot.utils.guild_state import (
+    GuildEntity,
+    changed_entities,
+    fingerprint_guild,
+    fingerprint_rows,
+    save_fingerprints,
+    take_fingerprints,
+)
+
+
+class TestFingerprintRows:
+    def test_ignores_row_order(self):
+        assert fingerprint_rows([(1, "foo"), (2, "bar")]) == fingerprint_rows(
+            [(2, "bar"), (1, "foo")]
+        )
+
+    def test_changes_with_rows(self):
+        base = fingerprint_rows([(1, "foo"), (2, "bar")])
+
+        assert fingerprint_rows([(1, "foo")]) != base
+        assert fingerprint_rows([(1, "foo"), (2, "baz")]) != base
+        assert fingerprint_rows([(1, "foo"), (2, "bar"), (2, "bar")]) != base
+
+
+class TestChangedEntities:
+    def test_everything_changed_without_stored_fingerprints(self, make_guild):
+        assert changed_entities(fingerprint_guild(make_guild()), None) == list(GuildEntity)
+
+    def test_nothing_changed_with_same_state(self, make_guild):
+        assert (
+            changed_entities(fingerprint_guild(make_guild()), fingerprint_guild(make_guild())) == []
+        )
+
+    def test_only_changed_entities_are_returned(self, make_guild):
+        stored = fingerprint_guild(make_guild())
+        guild = make_guild(members=((1, "foo"), (3, "baz")))
+
+        assert changed_entities(fingerprint_guild(guild), stored) == [GuildEntity.users]
+
+
+class TestFingerprintStore:
+    def test_round_trips_and_deletes_file(self, tmp_path, make_guild):
+        path = str(tmp_path / "fingerprints.json")
+        fingerprints = {1: fingerprint_guild(make_guild())}
+
+        save_fingerprints(path, fingerprints)
+
+        assert take_fingerprints(path) == fingerprints
+        assert take_fingerprints(path) == {}
+
+    def test_malformed_file_is_discarded(self, tmp_path):
+        path = tmp_path / "fingerprints.json"
+        path.write_text("{not json")
+
+        assert take_fingerprints(str(path)) == {}
+        assert not path.exists()
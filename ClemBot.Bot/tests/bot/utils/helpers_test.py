@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from bot.utils.helpers import gather_bounded
+
+
+class TestGatherBounded:
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_and_keeps_order(self):
+        running = 0
+        peak = 0
+
+        async def work(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (5 - i))
+            running -= 1
+            return i * 2
+
+        assert await gather_bounded(range(5), work, limit=2) == [0, 2, 4, 6, 8]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_raises_first_exception(self):
+        async def work(i):
+            if i == 1:
+                raise ValueError("foo")
+            return i
+
+        with pytest.raises(ValueError):
+            await gather_bounded(range(3), work, limit=2)
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_positive_limit(self):
+        async def work(i):
+            return i
+
+        with pytest.raises(ValueError):
+            await gather_bounded(range(3), work, limit=0)
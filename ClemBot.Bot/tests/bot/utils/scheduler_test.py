@@ -4,7 +4,7 @@ from datetime import datetime
 import pytest
 from discord.ext.commands.errors import BadArgument
 
-from bot.utils.scheduler import Scheduler
+from bot.utils.scheduler import HEAP_COMPACT_THRESHOLD, Scheduler
 
 
 class TestScheduler:
@@ -28,6 +28,8 @@ class TestScheduler:
 
             assert len(s._scheduled_tasks) == 1
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(valid_time_test())
 
     def test_schedule_in_invalid_time_throws_bad_arg(self):
@@ -53,6 +55,8 @@ class TestScheduler:
 
             assert len(s._scheduled_tasks) == 1
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(valid_time_test())
 
     def test_get_task_invalid_task_returns_none(self):
@@ -69,6 +73,8 @@ class TestScheduler:
 
             assert s.get_task(t_id) is not None
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
 
     def test_get_task_schedule_at_returns_valid_task(self):
@@ -81,6 +87,8 @@ class TestScheduler:
 
             assert s.get_task(t_id) is not None
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
 
     def test_cancel_task_schedule_at_removes_task(self):
@@ -95,6 +103,8 @@ class TestScheduler:
 
             assert len(s._scheduled_tasks) == 0
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
 
     def test_cancel_task_schedule_at_invalid_id_throws_key_error(self):
@@ -108,6 +118,8 @@ class TestScheduler:
             with pytest.raises(KeyError):
                 s.cancel(1)
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
 
     def test_cancel_task_schedule_in_removes_task(self):
@@ -122,6 +134,8 @@ class TestScheduler:
 
             assert len(s._scheduled_tasks) == 0
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
 
     def test_cancel_task_schedule_in_invalid_id_throws_key_error(self):
@@ -135,4 +149,221 @@ class TestScheduler:
             with pytest.raises(KeyError):
                 s.cancel(1)
 
+            await s.close()
+
         asyncio.get_event_loop().run_until_complete(get_task_valid_task())
+
+
+class TestHeapScheduler:
+    @pytest.mark.asyncio
+    async def test_callbacks_run_in_due_order(self):
+        s = Scheduler()
+        ran = []
+
+        async def foo(i):
+            ran.append(i)
+
+        s.schedule_in(foo(2), time=0.03)
+        s.schedule_in(foo(1), time=0.01)
+        s.schedule_in(foo(3), time=0.05)
+
+        await asyncio.sleep(0.1)
+
+        assert ran == [1, 2, 3]
+        assert len(s) == 0
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_earlier_timer_wakes_driver(self):
+        s = Scheduler()
+        ran = asyncio.Event()
+
+        async def foo():
+            ran.set()
+
+        s.schedule_in(foo(), time=60)
+        await asyncio.sleep(0)
+        s.schedule_in(foo(), time=0.01)
+
+        await asyncio.wait_for(ran.wait(), timeout=1)
+        assert len(s) == 1
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_timer_does_not_run(self):
+        s = Scheduler()
+        ran = []
+
+        async def foo():
+            ran.append(1)
+
+        t_id = s.schedule_in(foo(), time=0.01)
+        s.cancel(t_id)
+
+        await asyncio.sleep(0.05)
+
+        assert ran == []
+        assert t_id not in s
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_pending_timers_share_one_task(self):
+        s = Scheduler()
+        tasks_before = len(asyncio.all_tasks())
+
+        async def foo():
+            pass
+
+        for _ in range(1000):
+            s.schedule_in(foo(), time=60)
+
+        assert len(asyncio.all_tasks()) == tasks_before + 1
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_timers_are_compacted_out_of_heap(self):
+        s = Scheduler()
+
+        async def foo():
+            pass
+
+        ids = [s.schedule_in(foo(), time=60) for _ in range(3 * HEAP_COMPACT_THRESHOLD)]
+        for t_id in ids[1:]:
+            s.cancel(t_id)
+
+        assert len(s) == 1
+        assert len(s._heap) <= HEAP_COMPACT_THRESHOLD + 2
+        await s.close()
+
+
+class TestCatchUp:
+    @pytest.mark.asyncio
+    async def test_schedule_overdue_returns_before_callbacks_run(self):
+        s = Scheduler()
+        ran = []
+
+        async def foo(i):
+            ran.append(i)
+
+        for i in range(3):
+            s.schedule_overdue(foo(i))
+
+        assert ran == []
+
+        await asyncio.sleep(0.5)
+
+        assert ran == [0, 1, 2]
+        assert len(s) == 0
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_overdue_callbacks_are_bounded(self):
+        s = Scheduler(catch_up_concurrency=2, catch_up_rate=1000)
+        running = 0
+        peak = 0
+
+        async def foo():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(6):
+            s.schedule_overdue(foo())
+
+        await asyncio.sleep(0.2)
+
+        assert peak == 2
+        assert len(s) == 0
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_overdue_callbacks_are_rate_limited(self):
+        s = Scheduler(catch_up_concurrency=5, catch_up_rate=20)
+        ran = []
+
+        async def foo():
+            ran.append(1)
+
+        for _ in range(5):
+            s.schedule_overdue(foo())
+
+        await asyncio.sleep(0.12)
+
+        assert 1 <= len(ran) < 5
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_overdue_callback_does_not_run(self):
+        s = Scheduler()
+        ran = []
+
+        async def foo():
+            ran.append(1)
+
+        s.cancel(s.schedule_overdue(foo()))
+
+        await asyncio.sleep(0.05)
+
+        assert ran == []
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_overdue_callback_does_not_stop_catch_up(self):
+        s = Scheduler(catch_up_concurrency=1, catch_up_rate=1000)
+        ran = []
+
+        async def fail():
+            raise ValueError("foo")
+
+        async def foo():
+            ran.append(1)
+
+        s.schedule_overdue(fail())
+        s.schedule_overdue(foo())
+
+        await asyncio.sleep(0.05)
+
+        assert ran == [1]
+        await s.close()
+
+    @pytest.mark.asyncio
+    async def test_close_leaves_running_overdue_callbacks_to_finish(self):
+        s = Scheduler(catch_up_concurrency=1, catch_up_rate=1000)
+        started = asyncio.Event()
+        ran = []
+
+        async def foo(i):
+            started.set()
+            await asyncio.sleep(0.02)
+            ran.append(i)
+
+        s.schedule_overdue(foo(1))
+        s.schedule_overdue(foo(2))
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+        await s.close()
+        await asyncio.sleep(0.05)
+
+        assert ran == [1]
+        assert not s._catch_up_workers
+
+    @pytest.mark.asyncio
+    async def test_overdue_callback_queued_as_worker_finishes_runs(self):
+        s = Scheduler(catch_up_concurrency=1, catch_up_rate=1000)
+        ran = []
+
+        async def foo(i):
+            ran.append(i)
+
+        s.schedule_overdue(foo(1))
+        worker = next(iter(s._catch_up_workers))
+
+        # Queue another the moment the only worker finishes
+        worker.add_done_callback(lambda _: s.schedule_overdue(foo(2)))
+
+        await asyncio.sleep(0.05)
+
+        assert ran == [1, 2]
+        await s.close()
@@ -0,0 +1,71 @@
+import pytest
+
+from bot.utils.trigrams import (
+    find_best_match,
+    make_search_bank,
+    make_trigrams,
+    query_search_bank,
+    similarity,
+)
+
+ITEMS = [
+    "cpsc-2120",
+    "cpsc-1010",
+    "math-1060",
+    "engl-1030",
+    "cpsc-2121",
+    "smith, john",
+    "smyth, jane",
+    "tag add",
+    "tag delete",
+    "tags",
+]
+
+
+def _brute_force(items, query):
+    query_trgrms = make_trigrams(query)
+    results = sorted(
+        ((item, similarity(query_trgrms, make_trigrams(item))) for item in items),
+        key=lambda r: r[1],
+        reverse=True,
+    )
+    return [r for r in results if r[1] > 0]
+
+
+class TestSearchBank:
+    @pytest.mark.parametrize("query", ["cpsc-2120", "cpsc", "smith", "tag", "xyz", "math-106"])
+    def test_query_matches_brute_force(self, query):
+        bank = make_search_bank(ITEMS)
+        results = [(e.item, e.similarity) for e in query_search_bank(bank, query)]
+
+        assert results == _brute_force(ITEMS, query)
+
+    def test_query_limit_returns_top_results(self):
+        bank = make_search_bank(ITEMS)
+
+        full = query_search_bank(bank, "cpsc-212")
+        limited = query_search_bank(bank, "cpsc-212", limit=2)
+
+        assert [e.item for e in limited] == [e.item for e in full[:2]]
+
+    def test_query_leaves_out_items_without_shared_trigrams(self):
+        bank = make_search_bank(ITEMS)
+        assert query_search_bank(bank, "zzzz") == []
+
+    def test_find_best_match(self):
+        bank = make_search_bank(ITEMS)
+        best = find_best_match(bank, "cpsc-2120")
+
+        assert best.item == "cpsc-2120"
+        assert best.similarity == pytest.approx(1.0)
+
+    def test_find_best_match_without_shared_trigrams(self):
+        bank = make_search_bank(ITEMS)
+        best = find_best_match(bank, "zzzz")
+
+        assert best.item == ITEMS[0]
+        assert best.similarity == 0
+
+    def test_ties_keep_bank_order(self):
+        bank = make_search_bank(["abcx", "abcy", "abcz"])
+        assert [e.item for e in query_search_bank(bank, "abc")] == ["abcx", "abcy", "abcz"]